@@ -5,3 +5,6 @@ class AuthenticationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tosca_api.apps.authentication"
     label = "tosca_authentication"
+
+    def ready(self):
+        from tosca_api.apps.authentication import signals  # noqa: F401
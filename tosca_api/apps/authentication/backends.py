@@ -4,7 +4,11 @@ from django.contrib.auth import get_user_model
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 import logging
-from tosca_api.apps.core.jwt_utils import verify_and_decode_token
+from tosca_api.apps.core.jwt_utils import averify_and_decode_token, verify_and_decode_token
+from tosca_api.apps.core.timing import collect, stage
+from tosca_api.apps.authentication.metrics import report_auth_timings
+from tosca_api.apps.authentication.token_cache import verified_token_cache
+from tosca_api.apps.authentication.user_cache import user_resolution_cache
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -39,34 +43,55 @@ class KeycloakTokenAuthentication(BaseAuthentication):
     DRF authentication backend for Keycloak Bearer tokens.
     Validates JWT tokens and syncs roles to Django user permissions.
     For API token authentication from Mobile/Vue/Postman clients.
+
+    aauthenticate() is the async equivalent for async Django views under
+    ASGI: JWKS fetches use httpx and user resolution uses the async ORM.
+
+    Each call records per-stage timings (token_cache, jwks, verify, user,
+    permissions) and hands them to authentication.metrics.
     """
-    
-    def authenticate(self, request):
+
+    def _get_bearer_token(self, request):
         auth_header = request.headers.get('Authorization')
         if not auth_header or not auth_header.startswith('Bearer '):
             return None
+        return auth_header.split(' ')[1]
+    
+    def authenticate(self, request):
+        token = self._get_bearer_token(request)
+        if token is None:
+            return None
+
+        timings = None
+        try:
+            with collect() as timings:
+                return self._authenticate_credentials(token)
+        finally:
+            report_auth_timings(request, timings)
 
-        token = auth_header.split(' ')[1]
+    async def aauthenticate(self, request):
+        """Async equivalent of authenticate()."""
+        token = self._get_bearer_token(request)
+        if token is None:
+            return None
 
+        timings = None
         try:
-            decoded_token = verify_and_decode_token(token)
+            with collect() as timings:
+                return await self._aauthenticate_credentials(token)
+        finally:
+            report_auth_timings(request, timings)
+
+    def _authenticate_credentials(self, token):
+        try:
+            decoded_token = self._verify_token(token)
             username = decoded_token.get('preferred_username')
             if not username:
                 raise AuthenticationFailed('Token does not contain username')
 
-            # Get or create user
-            user, created = User.objects.get_or_create(
-                username=username,
-                defaults={
-                    'email': decoded_token.get('email', ''),
-                    'first_name': decoded_token.get('given_name', ''),
-                    'last_name': decoded_token.get('family_name', ''),
-                }
-            )
-
-            # Sync roles from token
+            # Resolve user (cached until roles or profile claims change)
             roles = self._extract_roles_from_token(decoded_token)
-            self._apply_permissions(user, roles)
+            user = self._resolve_user(username, decoded_token, roles)
 
             # return decoded token as request.auth for downstream use
             return (user, decoded_token)
@@ -74,6 +99,38 @@ class KeycloakTokenAuthentication(BaseAuthentication):
             raise
         except Exception as e:
             raise AuthenticationFailed(f'Authentication failed: {str(e)}')
+
+    async def _aauthenticate_credentials(self, token):
+        try:
+            decoded_token = await self._averify_token(token)
+            username = decoded_token.get('preferred_username')
+            if not username:
+                raise AuthenticationFailed('Token does not contain username')
+
+            roles = self._extract_roles_from_token(decoded_token)
+            user = await self._aresolve_user(username, decoded_token, roles)
+            return (user, decoded_token)
+        except AuthenticationFailed:
+            raise
+        except Exception as e:
+            raise AuthenticationFailed(f'Authentication failed: {str(e)}')
+
+    def _verify_token(self, token):
+        """Return decoded claims, skipping RS256 verification for cached tokens."""
+        with stage("token_cache"):
+            decoded_token = verified_token_cache.get(token)
+        if decoded_token is None:
+            decoded_token = verify_and_decode_token(token)
+            verified_token_cache.set(token, decoded_token)
+        return decoded_token
+
+    async def _averify_token(self, token):
+        with stage("token_cache"):
+            decoded_token = verified_token_cache.get(token)
+        if decoded_token is None:
+            decoded_token = await averify_and_decode_token(token)
+            verified_token_cache.set(token, decoded_token)
+        return decoded_token
     
     def _extract_roles_from_token(self, decoded_token):
         """Extract roles from decoded JWT token."""
@@ -83,8 +140,78 @@ class KeycloakTokenAuthentication(BaseAuthentication):
             roles.update(realm_access.get("roles", []))
         return roles
     
+    def _profile_from_token(self, decoded_token):
+        """Map profile claims present in the token to User fields."""
+        claim_fields = {'email': 'email', 'given_name': 'first_name', 'family_name': 'last_name'}
+        return {
+            field: decoded_token[claim]
+            for claim, field in claim_fields.items()
+            if decoded_token.get(claim) is not None
+        }
+
+    def _resolve_user(self, username, decoded_token, roles):
+        """
+        Return the User for these claims.
+
+        Served from user_resolution_cache when the role set and profile claims
+        are unchanged; otherwise loads the user and writes only the fields
+        that differ from the token.
+        """
+        profile = self._profile_from_token(decoded_token)
+        with stage("user"):
+            user = user_resolution_cache.get(username, roles, profile)
+            if user is not None:
+                return user
+
+            user, created = User.objects.get_or_create(
+                username=username, defaults=self._user_defaults(profile)
+            )
+        with stage("permissions"):
+            changed = self._sync_user_fields(user, created, profile, roles)
+            if changed:
+                user.save(update_fields=changed)
+
+        user_resolution_cache.set(username, roles, profile, user)
+        return user
+
+    async def _aresolve_user(self, username, decoded_token, roles):
+        """Async equivalent of _resolve_user()."""
+        profile = self._profile_from_token(decoded_token)
+        with stage("user"):
+            user = user_resolution_cache.get(username, roles, profile)
+            if user is not None:
+                return user
+
+            user, created = await User.objects.aget_or_create(
+                username=username, defaults=self._user_defaults(profile)
+            )
+        with stage("permissions"):
+            changed = self._sync_user_fields(user, created, profile, roles)
+            if changed:
+                await user.asave(update_fields=changed)
+
+        user_resolution_cache.set(username, roles, profile, user)
+        return user
+
+    def _user_defaults(self, profile):
+        return {
+            'email': profile.get('email', ''),
+            'first_name': profile.get('first_name', ''),
+            'last_name': profile.get('last_name', ''),
+        }
+
+    def _sync_user_fields(self, user, created, profile, roles):
+        """Apply role flags and profile claims to user; return the changed field names."""
+        changed = self._apply_permissions(user, roles)
+        if not created:
+            for field, value in profile.items():
+                if getattr(user, field) != value:
+                    setattr(user, field, value)
+                    changed.append(field)
+        return changed
+    
     def _apply_permissions(self, user, roles):
-        """Apply roles to Django user permissions."""
+        """Apply roles to Django user permissions; return the changed field names."""
         
         old_staff = user.is_staff
         old_super = user.is_superuser
@@ -98,9 +225,13 @@ class KeycloakTokenAuthentication(BaseAuthentication):
         else:
             user.is_superuser = False
             user.is_staff = False
-        #KeycloakTokenAuth] Updated permissions if changed: is_staff={user.is_staff}, is_superuser={user.is_superuser}")
-        if user.is_staff != old_staff or user.is_superuser != old_super:
-            user.save()
+
+        changed = []
+        if user.is_staff != old_staff:
+            changed.append('is_staff')
+        if user.is_superuser != old_super:
+            changed.append('is_superuser')
+        return changed
 
 
 class KeycloakAdapter(DefaultSocialAccountAdapter):
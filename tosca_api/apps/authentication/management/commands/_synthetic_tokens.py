@@ -0,0 +1,83 @@
+"""
+Helpers for authentication benchmarks.
+
+Generates a local RSA key, seeds the process-wide signing key cache with its
+public half and mints Keycloak-shaped access tokens, so benchmarks exercise
+the real verification code without contacting Keycloak.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import statistics
+import uuid
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.conf import settings
+from jwt.algorithms import RSAAlgorithm
+
+from tosca_api.apps.core.jwt_utils import signing_key_cache
+
+BENCH_KID = "bench-key"
+
+
+class SyntheticTokenFactory:
+    """Mint RS256 tokens trusted by verify_and_decode_token."""
+
+    def __init__(self, kid: str = BENCH_KID):
+        self.kid = kid
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(RSAAlgorithm.to_jwk(self.private_key.public_key()))
+        jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+        self.jwk = jwk
+        self.public_jwk = jwt.PyJWK.from_dict(jwk)
+
+    def install(self) -> None:
+        """Make the local public key the only trusted signing key."""
+        signing_key_cache.set_keys([self.public_jwk])
+
+    def make_token(self, index: int = 0, *, use_azp: bool = False, roles=None, **claims) -> str:
+        now = datetime.datetime.now(datetime.UTC)
+        payload = {
+            "sub": str(uuid.uuid4()),
+            "preferred_username": f"bench-user-{index}",
+            "email": f"bench-user-{index}@example.com",
+            "given_name": "Bench",
+            "family_name": f"User {index}",
+            "iss": settings.KEYCLOAK_ISSUER,
+            "iat": now,
+            "exp": now + datetime.timedelta(minutes=5),
+            "realm_access": {"roles": list(roles or [])},
+        }
+        if use_azp:
+            # tosca-web style token: aud lists other clients, azp names ours
+            payload["aud"] = "account-console"
+            payload["azp"] = settings.ALLOWED_TOKEN_AUDIENCES[0]
+        else:
+            payload["aud"] = settings.ALLOWED_TOKEN_AUDIENCES[0]
+        payload.update(claims)
+        return jwt.encode(payload, self.private_key, algorithm="RS256", headers={"kid": self.kid})
+
+
+def summarize(samples_ms: list[float]) -> dict:
+    """Return mean and p50/p95/p99 of a list of millisecond samples."""
+    if len(samples_ms) < 2:
+        value = samples_ms[0] if samples_ms else 0.0
+        return {"mean": value, "p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples_ms, n=100, method="inclusive")
+    return {
+        "mean": statistics.fmean(samples_ms),
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+    }
+
+
+def format_summary(label: str, samples_ms: list[float]) -> str:
+    s = summarize(samples_ms)
+    return (
+        f"{label:<28} n={len(samples_ms):<6} mean={s['mean']:.3f}ms "
+        f"p50={s['p50']:.3f}ms p95={s['p95']:.3f}ms p99={s['p99']:.3f}ms"
+    )
@@ -0,0 +1,77 @@
+"""
+Benchmark: per-stage timings of KeycloakTokenAuthentication.authenticate.
+
+Replays N synthetic tokens (signed with a locally generated RSA key) through
+the real authentication backend and reports p50/p95/p99 for each stage
+recorded by core/timing.py: token_cache, jwks, verify, user, permissions
+and total. Tokens are cycled over ``--users`` usernames, so the first pass
+creates users and later ones exercise the user-resolution cache.
+
+Needs a database; users created by the run are deleted afterwards unless
+``--keep-users`` is given. Existing accounts with a bench username are
+used as they are and kept.
+
+Usage:
+    python manage.py bench_auth_stages --tokens 1000 --users 50
+"""
+
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from tosca_api.apps.authentication.backends import KeycloakTokenAuthentication
+from tosca_api.apps.authentication.token_cache import verified_token_cache
+from tosca_api.apps.authentication.user_cache import user_resolution_cache
+
+from ._synthetic_tokens import SyntheticTokenFactory, format_summary
+
+STAGE_ORDER = ["token_cache", "jwks", "verify", "user", "permissions", "total"]
+
+
+class Command(BaseCommand):
+    help = "Report p50/p95/p99 per authentication stage for synthetic tokens."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tokens", type=int, default=500, help="Tokens to authenticate.")
+        parser.add_argument(
+            "--users", type=int, default=50, help="Distinct usernames to cycle through."
+        )
+        parser.add_argument(
+            "--keep-users", action="store_true", help="Do not delete bench users afterwards."
+        )
+
+    def handle(self, *args, **options):
+        factory = SyntheticTokenFactory()
+        factory.install()
+        users = max(1, options["users"])
+        tokens = [factory.make_token(i % users) for i in range(options["tokens"])]
+        User = get_user_model()
+        usernames = [f"bench-user-{i}" for i in range(users)]
+        # Accounts that already exist are kept; only users this run creates are deleted.
+        existing = set(User.objects.filter(username__in=usernames).values_list("pk", flat=True))
+
+        verified_token_cache.clear()
+        user_resolution_cache.clear()
+        auth = KeycloakTokenAuthentication()
+        request_factory = RequestFactory()
+
+        samples = defaultdict(list)
+        created = set()
+        try:
+            for token in tokens:
+                request = request_factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+                user, _ = auth.authenticate(request)
+                if user.pk not in existing:
+                    created.add(user.pk)
+                for name, ms in request.auth_timings.items():
+                    samples[name].append(ms)
+        finally:
+            if not options["keep_users"]:
+                User.objects.filter(pk__in=created).delete()
+
+        for name in STAGE_ORDER + sorted(set(samples) - set(STAGE_ORDER)):
+            if samples.get(name):
+                self.stdout.write(format_summary(name, samples[name]))
+        self.stdout.write(f"user cache stats: {user_resolution_cache.stats()}")
@@ -0,0 +1,51 @@
+"""
+Micro-benchmark: token verification cost with a cold vs warm token cache.
+
+Usage:
+    python manage.py bench_token_cache --tokens 200 --repeat 20
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from tosca_api.apps.authentication.backends import KeycloakTokenAuthentication
+from tosca_api.apps.authentication.token_cache import verified_token_cache
+
+from ._synthetic_tokens import SyntheticTokenFactory, format_summary
+
+
+class Command(BaseCommand):
+    help = "Compare cold (RS256 verify) and warm (cache hit) token verification cost."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tokens", type=int, default=200, help="Distinct tokens to verify.")
+        parser.add_argument("--repeat", type=int, default=20, help="Warm lookups per token.")
+
+    def handle(self, *args, **options):
+        factory = SyntheticTokenFactory()
+        factory.install()
+        tokens = [factory.make_token(i) for i in range(options["tokens"])]
+        auth = KeycloakTokenAuthentication()
+
+        verified_token_cache.clear()
+        cold = []
+        for token in tokens:
+            start = time.perf_counter()
+            auth._verify_token(token)
+            cold.append((time.perf_counter() - start) * 1000)
+
+        warm = []
+        for _ in range(options["repeat"]):
+            for token in tokens:
+                start = time.perf_counter()
+                auth._verify_token(token)
+                warm.append((time.perf_counter() - start) * 1000)
+
+        self.stdout.write(format_summary("cold (signature verify)", cold))
+        self.stdout.write(format_summary("warm (token cache hit)", warm))
+        cold_mean = sum(cold) / len(cold)
+        warm_mean = sum(warm) / len(warm)
+        if warm_mean:
+            self.stdout.write(f"speedup: {cold_mean / warm_mean:.1f}x")
+        self.stdout.write(f"cache stats: {verified_token_cache.stats()}")
@@ -0,0 +1,63 @@
+"""
+Benchmark: verify_and_decode_token cost for aud tokens vs azp-fallback tokens.
+
+Tokens issued to tosca-web carry other clients in ``aud`` and name the
+client in ``azp``. Both paths should cost one RS256 signature check, i.e.
+roughly the same as the raw ``jwt.decode`` reference row.
+
+Usage:
+    python manage.py bench_token_verify --tokens 500
+"""
+
+import time
+
+import jwt
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tosca_api.apps.core.jwt_utils import verify_and_decode_token
+
+from ._synthetic_tokens import SyntheticTokenFactory, format_summary
+
+
+class Command(BaseCommand):
+    help = "Measure token verification cost on the aud and azp-fallback paths."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tokens", type=int, default=500, help="Tokens per path.")
+
+    def handle(self, *args, **options):
+        factory = SyntheticTokenFactory()
+        factory.install()
+        count = options["tokens"]
+        aud_tokens = [factory.make_token(i) for i in range(count)]
+        azp_tokens = [factory.make_token(i, use_azp=True) for i in range(count)]
+
+        def timed(fn, tokens):
+            samples = []
+            for token in tokens:
+                start = time.perf_counter()
+                fn(token)
+                samples.append((time.perf_counter() - start) * 1000)
+            return samples
+
+        def single_decode(token):
+            jwt.decode(
+                token,
+                factory.public_jwk.key,
+                algorithms=["RS256"],
+                issuer=settings.KEYCLOAK_ISSUER,
+                options={"verify_aud": False},
+            )
+
+        reference = timed(single_decode, aud_tokens)
+        aud = timed(verify_and_decode_token, aud_tokens)
+        azp = timed(verify_and_decode_token, azp_tokens)
+
+        self.stdout.write(format_summary("one jwt.decode (reference)", reference))
+        self.stdout.write(format_summary("aud path", aud))
+        self.stdout.write(format_summary("azp fallback path", azp))
+        ref_mean = sum(reference) / len(reference)
+        if ref_mean:
+            azp_mean = sum(azp) / len(azp)
+            self.stdout.write(f"azp path / reference: {azp_mean / ref_mean:.2f}x")
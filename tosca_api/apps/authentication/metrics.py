@@ -0,0 +1,60 @@
+"""
+Authentication timing reporting.
+
+KeycloakTokenAuthentication measures each stage of a token authentication
+(see core/timing.py) and calls report_auth_timings() once per request, even
+when authentication fails. The timings are:
+
+- stored on the request as ``auth_timings`` for ServerTimingMiddleware, and
+- passed to the callable named by ``AUTH_TIMING_HOOK`` (dotted path), e.g.
+  to feed a metrics backend. The hook receives ``(request, timings)`` where
+  ``timings`` maps stage name to milliseconds, plus ``total``.
+
+``log_auth_timings`` is a ready-made hook that logs at DEBUG level.
+"""
+
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def _load_hook(path):
+    return import_string(path)
+
+
+def get_auth_timing_hook():
+    path = getattr(settings, "AUTH_TIMING_HOOK", None)
+    if not path:
+        return None
+    return _load_hook(path)
+
+
+def report_auth_timings(request, timings) -> None:
+    if timings is None:
+        return
+    stages = timings.as_dict()
+    # DRF wraps the Django request; attach to the underlying HttpRequest so
+    # middleware sees the timings.
+    getattr(request, "_request", request).auth_timings = stages
+
+    hook = get_auth_timing_hook()
+    if hook is None:
+        return
+    try:
+        hook(request, stages)
+    except Exception:
+        # Metrics must never break authentication.
+        logger.exception("Authentication timing hook failed")
+
+
+def log_auth_timings(request, timings) -> None:
+    """AUTH_TIMING_HOOK that logs stage timings at DEBUG level."""
+    logger.debug("Authentication timings", extra={
+        'path': getattr(request, 'path', None),
+        'timings_ms': {name: round(ms, 3) for name, ms in timings.items()},
+    })
@@ -0,0 +1,49 @@
+"""Expose authentication stage timings to staff via the Server-Timing header."""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from tosca_api.apps.core.timing import format_server_timing
+
+
+class ServerTimingMiddleware:
+    """
+    Add ``Server-Timing: auth-<stage>;dur=<ms>`` entries to responses of
+    token-authenticated staff requests when ``AUTH_SERVER_TIMING`` is enabled.
+
+    Non-staff users never see the header, since it reveals internal timing.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self._add_header(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self._add_header(request, response)
+        return response
+
+    def _add_header(self, request, response):
+        if not getattr(settings, "AUTH_SERVER_TIMING", False):
+            return
+        timings = getattr(request, "auth_timings", None)
+        if not timings:
+            return
+        user = getattr(request, "user", None)
+        if user is None or not user.is_staff:
+            return
+
+        value = format_server_timing(timings, prefix="auth-")
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = f"{existing}, {value}" if existing else value
@@ -3,14 +3,49 @@ Role-based permission classes for API endpoints.
 
 These permissions work with Keycloak roles that are synced to Django
 by KeycloakAdapter in backends.py during login.
+
+IsEditor / IsViewer first look at the realm roles in the verified token
+(``request.auth`` set by KeycloakTokenAuthentication), which needs no
+database access. Session users and users granted access through a Django
+group fall back to group membership, resolved once per request and cached
+across requests (see user_cache.GroupMembershipCache).
 """
 from rest_framework.permissions import BasePermission
 
+from tosca_api.apps.authentication.user_cache import group_membership_cache
+
+
+def token_roles(request) -> frozenset:
+    """Return the lower-cased Keycloak realm roles from ``request.auth``."""
+    claims = request.auth if isinstance(request.auth, dict) else {}
+    realm_access = claims.get("realm_access") or {}
+    if not isinstance(realm_access, dict):
+        return frozenset()
+    return frozenset(str(role).lower() for role in realm_access.get("roles", []))
+
+
+def user_group_names(user) -> frozenset:
+    """Return the user's group names, memoised on the user for this request."""
+    names = getattr(user, "_tosca_group_names", None)
+    if names is None:
+        names = group_membership_cache.get_group_names(user)
+        user._tosca_group_names = names
+    return names
+
+
+def has_role(request, role: str) -> bool:
+    """True if the user holds ``role`` as a Keycloak realm role or a Django group."""
+    if not request.user.is_authenticated:
+        return False
+    if role in token_roles(request):
+        return True
+    return role in user_group_names(request.user)
+
 
 class IsSuperAdmin(BasePermission):
     """
     Allow only users with SUPERADMIN role.
-    
+
     Usage:
         @permission_classes([IsSuperAdmin])
         def admin_only_view(request):
@@ -23,7 +58,7 @@ class IsSuperAdmin(BasePermission):
 class IsAdmin(BasePermission):
     """
     Allow users with SUPERADMIN or ADMIN roles.
-    
+
     Usage:
         @permission_classes([IsAdmin])
         def staff_view(request):
@@ -35,35 +70,25 @@ class IsAdmin(BasePermission):
 
 class IsEditor(BasePermission):
     """
-    Allow users in 'editor' Django group.
-    
-    Note: You need to map Keycloak roles to Django groups in backends.py
-    
+    Allow users with the 'editor' Keycloak realm role or in the 'editor' Django group.
+
     Usage:
         @permission_classes([IsEditor])
         def edit_content(request):
             ...
     """
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated 
-            and request.user.groups.filter(name='editor').exists()
-        )
+        return has_role(request, 'editor')
 
 
 class IsViewer(BasePermission):
     """
-    Allow users in 'viewer' Django group.
-    
-    Note: You need to map Keycloak roles to Django groups in backends.py
-    
+    Allow users with the 'viewer' Keycloak realm role or in the 'viewer' Django group.
+
     Usage:
         @permission_classes([IsViewer])
         def view_content(request):
             ...
     """
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated 
-            and request.user.groups.filter(name='viewer').exists()
-        )
\ No newline at end of file
+        return has_role(request, 'viewer')
@@ -0,0 +1,43 @@
+"""Keep the authentication caches in sync with User and Group writes."""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from tosca_api.apps.authentication.user_cache import (
+    group_membership_cache,
+    user_resolution_cache,
+)
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User, dispatch_uid="invalidate_user_resolution_cache_on_save")
+@receiver(post_delete, sender=User, dispatch_uid="invalidate_user_resolution_cache_on_delete")
+def invalidate_user_resolution_cache(sender, instance, **kwargs):
+    user_resolution_cache.invalidate(instance.get_username())
+    group_membership_cache.invalidate(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid="invalidate_group_cache_on_m2m")
+def invalidate_group_membership_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        # user.groups.add/remove/clear
+        group_membership_cache.invalidate(instance.pk)
+    elif pk_set:
+        # group.user_set.add/remove
+        for user_pk in pk_set:
+            group_membership_cache.invalidate(user_pk)
+    else:
+        # group.user_set.clear(): members are unknown at this point
+        group_membership_cache.clear()
+
+
+@receiver(post_save, sender=Group, dispatch_uid="invalidate_group_cache_on_group_save")
+@receiver(post_delete, sender=Group, dispatch_uid="invalidate_group_cache_on_group_delete")
+def invalidate_group_cache_on_group_change(sender, instance, **kwargs):
+    # Renames and deletes affect every member; these are rare admin actions.
+    group_membership_cache.clear()
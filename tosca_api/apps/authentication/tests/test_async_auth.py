@@ -0,0 +1,152 @@
+"""
+Tests for the async Keycloak authentication path.
+
+A real JWKS document is served over HTTP from a local thread so the async
+fetch (httpx) runs end to end without Keycloak.
+"""
+
+import asyncio
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from asgiref.sync import async_to_sync
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory
+from jwt.algorithms import RSAAlgorithm
+from rest_framework.exceptions import AuthenticationFailed
+
+from tosca_api.apps.authentication.backends import KeycloakTokenAuthentication
+from tosca_api.apps.authentication.token_cache import verified_token_cache
+from tosca_api.apps.authentication.user_cache import user_resolution_cache
+from tosca_api.apps.core.jwt_utils import averify_and_decode_token, signing_key_cache
+
+User = get_user_model()
+
+ISSUER = "https://issuer.example.com/"
+KID = "local-kid"
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def jwks_document():
+    jwk = json.loads(RSAAlgorithm.to_jwk(PRIVATE_KEY.public_key()))
+    jwk.update({"kid": KID, "use": "sig", "alg": "RS256"})
+    return {"keys": [jwk]}
+
+
+def make_token(kid=KID, **overrides):
+    now = datetime.datetime.now(datetime.UTC)
+    payload = {
+        "sub": "async-user",
+        "preferred_username": "asyncuser",
+        "email": "asyncuser@example.com",
+        "iss": ISSUER,
+        "aud": "test-aud",
+        "iat": now,
+        "exp": now + datetime.timedelta(minutes=5),
+    }
+    payload.update(overrides)
+    return jwt.encode(payload, PRIVATE_KEY, algorithm="RS256", headers={"kid": kid})
+
+
+class JWKSHandler(BaseHTTPRequestHandler):
+    requests_served = 0
+    delay = 0.0
+
+    def do_GET(self):
+        type(self).requests_served += 1
+        time.sleep(type(self).delay)
+        body = json.dumps(jwks_document()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def jwks_server(settings):
+    JWKSHandler.requests_served = 0
+    JWKSHandler.delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JWKSHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    settings.KEYCLOAK_JWKS_URL = f"http://127.0.0.1:{server.server_port}/certs"
+    settings.KEYCLOAK_ISSUER = ISSUER
+    settings.ALLOWED_TOKEN_AUDIENCES = ["test-aud"]
+    signing_key_cache.clear()
+    verified_token_cache.clear()
+    user_resolution_cache.clear()
+    yield JWKSHandler
+
+    server.shutdown()
+    server.server_close()
+    signing_key_cache.clear()
+    verified_token_cache.clear()
+    user_resolution_cache.clear()
+
+
+def test_async_verify_fetches_local_jwks(jwks_server):
+    claims = asyncio.run(averify_and_decode_token(make_token()))
+
+    assert claims["preferred_username"] == "asyncuser"
+    assert jwks_server.requests_served == 1
+
+
+def test_async_verify_reuses_cached_keys(jwks_server):
+    async def verify_twice():
+        await averify_and_decode_token(make_token())
+        await averify_and_decode_token(make_token())
+
+    asyncio.run(verify_twice())
+    assert jwks_server.requests_served == 1
+
+
+def test_concurrent_cold_misses_share_one_fetch(jwks_server):
+    jwks_server.delay = 0.1
+
+    async def verify_many():
+        return await asyncio.gather(
+            *(averify_and_decode_token(make_token()) for _ in range(20))
+        )
+
+    results = asyncio.run(verify_many())
+    assert len(results) == 20
+    assert jwks_server.requests_served == 1
+
+
+def test_async_verify_unknown_kid(jwks_server):
+    with pytest.raises(AuthenticationFailed):
+        asyncio.run(averify_and_decode_token(make_token(kid="rotated-away")))
+
+
+def test_async_verify_rejects_wrong_audience(jwks_server):
+    with pytest.raises(AuthenticationFailed):
+        asyncio.run(averify_and_decode_token(make_token(aud="not-allowed")))
+
+
+@pytest.mark.django_db
+def test_aauthenticate_resolves_user(jwks_server):
+    request = AsyncRequestFactory().get(
+        "/", headers={"Authorization": f"Bearer {make_token()}"}
+    )
+
+    user, claims = async_to_sync(KeycloakTokenAuthentication().aauthenticate)(request)
+
+    assert user.username == "asyncuser"
+    assert claims["email"] == "asyncuser@example.com"
+    assert User.objects.filter(username="asyncuser").exists()
+
+
+def test_aauthenticate_without_header_returns_none(jwks_server):
+    request = AsyncRequestFactory().get("/")
+    assert async_to_sync(KeycloakTokenAuthentication().aauthenticate)(request) is None
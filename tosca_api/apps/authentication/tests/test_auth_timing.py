@@ -0,0 +1,164 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework.exceptions import AuthenticationFailed
+
+from tosca_api.apps.authentication.backends import KeycloakTokenAuthentication
+from tosca_api.apps.authentication.management.commands._synthetic_tokens import (
+    SyntheticTokenFactory,
+)
+from tosca_api.apps.authentication.middleware import ServerTimingMiddleware
+from tosca_api.apps.authentication.token_cache import verified_token_cache
+from tosca_api.apps.core.jwt_utils import signing_key_cache
+from tosca_api.apps.core.timing import collect, format_server_timing, stage
+
+User = get_user_model()
+
+recorded = []
+
+
+def recording_hook(request, timings):
+    recorded.append(timings)
+
+
+def failing_hook(request, timings):
+    raise RuntimeError("metrics backend down")
+
+
+@pytest.fixture(scope="module")
+def token_factory():
+    return SyntheticTokenFactory()
+
+
+@pytest.fixture(autouse=True)
+def auth_state(settings, token_factory):
+    settings.KEYCLOAK_TOKEN_CACHE_SIZE = 16
+    settings.AUTH_TIMING_HOOK = None
+    recorded.clear()
+    verified_token_cache.clear()
+    token_factory.install()
+    yield
+    verified_token_cache.clear()
+    signing_key_cache.clear()
+
+
+def bearer_request(token):
+    return RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+def authenticate(request):
+    user = User(username="timed")
+    with patch.object(KeycloakTokenAuthentication, "_resolve_user", return_value=user):
+        return KeycloakTokenAuthentication().authenticate(request)
+
+
+# ============================================================================
+# Timing primitives
+# ============================================================================
+
+def test_stage_outside_collect_is_a_no_op():
+    with stage("jwks"):
+        pass
+
+    with collect() as timings:
+        pass
+    assert timings.as_dict().keys() == {"total"}
+
+
+def test_stage_accumulates_repeated_names():
+    with collect() as timings:
+        with stage("verify"):
+            pass
+        with stage("verify"):
+            pass
+        with stage("user"):
+            pass
+
+    result = timings.as_dict()
+    assert list(result) == ["verify", "user", "total"]
+    assert result["total"] >= result["verify"] + result["user"]
+
+
+def test_format_server_timing():
+    value = format_server_timing({"verify": 1.234, "total": 2.0}, prefix="auth-")
+    assert value == "auth-verify;dur=1.23, auth-total;dur=2.00"
+
+
+# ============================================================================
+# Backend instrumentation and hook
+# ============================================================================
+
+def test_authenticate_records_stages_on_request(token_factory):
+    request = bearer_request(token_factory.make_token())
+    authenticate(request)
+
+    assert {"token_cache", "jwks", "verify", "total"} <= set(request.auth_timings)
+
+
+def test_cached_token_skips_verification_stages(token_factory):
+    token = token_factory.make_token()
+    authenticate(bearer_request(token))
+
+    request = bearer_request(token)
+    authenticate(request)
+    assert "verify" not in request.auth_timings
+    assert "jwks" not in request.auth_timings
+
+
+def test_hook_receives_timings(settings, token_factory):
+    settings.AUTH_TIMING_HOOK = f"{__name__}.recording_hook"
+    authenticate(bearer_request(token_factory.make_token()))
+
+    assert len(recorded) == 1
+    assert "verify" in recorded[0]
+
+
+def test_hook_called_when_authentication_fails(settings, token_factory):
+    settings.AUTH_TIMING_HOOK = f"{__name__}.recording_hook"
+    request = bearer_request(token_factory.make_token(aud="someone-else"))
+
+    with pytest.raises(AuthenticationFailed):
+        authenticate(request)
+    assert "verify" in recorded[0]
+
+
+def test_failing_hook_does_not_break_authentication(settings, token_factory):
+    settings.AUTH_TIMING_HOOK = f"{__name__}.failing_hook"
+    user, _ = authenticate(bearer_request(token_factory.make_token()))
+
+    assert user.username == "timed"
+
+
+# ============================================================================
+# Server-Timing middleware
+# ============================================================================
+
+def run_middleware(user):
+    request = RequestFactory().get("/")
+    request.user = user
+    request.auth_timings = {"verify": 1.5, "total": 2.0}
+    return ServerTimingMiddleware(lambda req: HttpResponse())(request)
+
+
+def test_server_timing_header_for_staff(settings):
+    settings.AUTH_SERVER_TIMING = True
+    response = run_middleware(User(username="staff", is_staff=True))
+
+    assert response["Server-Timing"] == "auth-verify;dur=1.50, auth-total;dur=2.00"
+
+
+def test_no_server_timing_header_for_non_staff(settings):
+    settings.AUTH_SERVER_TIMING = True
+    response = run_middleware(User(username="plain"))
+
+    assert "Server-Timing" not in response
+
+
+def test_no_server_timing_header_when_disabled(settings):
+    settings.AUTH_SERVER_TIMING = False
+    response = run_middleware(User(username="staff", is_staff=True))
+
+    assert "Server-Timing" not in response
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser, Group
+
+from tosca_api.apps.authentication.permissions import IsEditor, IsViewer
+from tosca_api.apps.authentication.user_cache import group_membership_cache
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_group_cache():
+    group_membership_cache.clear()
+    yield
+    group_membership_cache.clear()
+
+
+def make_request(user, roles=None):
+    auth = {"realm_access": {"roles": roles}} if roles is not None else None
+    return SimpleNamespace(user=user, auth=auth)
+
+
+def test_token_role_grants_editor_without_db():
+    # Unsaved user: any group lookup would hit the database and fail.
+    user = User(username="tokeneditor")
+    request = make_request(user, roles=["EDITOR", "offline_access"])
+
+    assert IsEditor().has_permission(request, None) is True
+
+
+def test_anonymous_user_denied():
+    request = make_request(AnonymousUser(), roles=["editor"])
+    assert IsEditor().has_permission(request, None) is False
+
+
+@pytest.mark.django_db
+def test_group_membership_grants_viewer():
+    user = User.objects.create_user(username="groupviewer", password="password")
+    user.groups.add(Group.objects.create(name="viewer"))
+
+    assert IsViewer().has_permission(make_request(user), None) is True
+    assert IsEditor().has_permission(make_request(user), None) is False
+
+
+@pytest.mark.django_db
+def test_group_lookup_is_cached_across_requests(django_assert_num_queries):
+    user = User.objects.create_user(username="cachedviewer", password="password")
+    user.groups.add(Group.objects.create(name="viewer"))
+    IsViewer().has_permission(make_request(User.objects.get(pk=user.pk)), None)
+
+    fresh_user = User.objects.get(pk=user.pk)
+    with django_assert_num_queries(0):
+        assert IsViewer().has_permission(make_request(fresh_user), None) is True
+        assert IsEditor().has_permission(make_request(fresh_user), None) is False
+
+
+@pytest.mark.django_db
+def test_group_change_invalidates_cache():
+    user = User.objects.create_user(username="promoted", password="password")
+    assert IsEditor().has_permission(make_request(User.objects.get(pk=user.pk)), None) is False
+
+    user.groups.add(Group.objects.create(name="editor"))
+    assert IsEditor().has_permission(make_request(User.objects.get(pk=user.pk)), None) is True
+
+
+@pytest.mark.django_db
+def test_reverse_group_change_invalidates_cache():
+    user = User.objects.create_user(username="demoted", password="password")
+    group = Group.objects.create(name="editor")
+    user.groups.add(group)
+    assert IsEditor().has_permission(make_request(User.objects.get(pk=user.pk)), None) is True
+
+    group.user_set.remove(user)
+    assert IsEditor().has_permission(make_request(User.objects.get(pk=user.pk)), None) is False
@@ -0,0 +1,115 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from tosca_api.apps.authentication.backends import KeycloakTokenAuthentication
+from tosca_api.apps.authentication.token_cache import (
+    VerifiedTokenCache,
+    token_digest,
+    verified_token_cache,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def token_cache_settings(settings):
+    settings.KEYCLOAK_TOKEN_CACHE_SIZE = 3
+    settings.KEYCLOAK_TOKEN_CACHE_MAX_TTL = 300
+    verified_token_cache.clear()
+    yield
+    verified_token_cache.clear()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return VerifiedTokenCache(clock=clock)
+
+
+def claims(clock, username="user1", lifetime=60):
+    return {"preferred_username": username, "exp": int(clock.now + lifetime)}
+
+
+def test_cache_key_is_a_digest_not_the_token():
+    token = "header.payload.signature"
+    assert token_digest(token) != token
+    assert len(token_digest(token)) == 64
+
+
+def test_hit_returns_copy_of_claims(cache, clock):
+    cache.set("t1", claims(clock))
+    cached = cache.get("t1")
+    cached["preferred_username"] = "mutated"
+
+    assert cache.get("t1")["preferred_username"] == "user1"
+    assert cache.stats()["hits"] == 2
+
+
+def test_entry_expires_at_token_exp(cache, clock):
+    cache.set("t1", claims(clock, lifetime=60))
+    clock.now += 59
+    assert cache.get("t1") is not None
+
+    clock.now += 1
+    assert cache.get("t1") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_entry_lifetime_capped_by_max_ttl(cache, clock, settings):
+    settings.KEYCLOAK_TOKEN_CACHE_MAX_TTL = 10
+    cache.set("t1", claims(clock, lifetime=3600))
+    clock.now += 11
+    assert cache.get("t1") is None
+
+
+def test_lru_eviction(cache, clock):
+    for token in ("t1", "t2", "t3"):
+        cache.set(token, claims(clock))
+    cache.get("t1")  # t2 becomes least recently used
+    cache.set("t4", claims(clock))
+
+    assert cache.get("t2") is None
+    assert cache.get("t1") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_size_disables_cache(cache, clock, settings):
+    settings.KEYCLOAK_TOKEN_CACHE_SIZE = 0
+    cache.set("t1", claims(clock))
+    assert cache.get("t1") is None
+
+
+def test_token_without_exp_is_not_cached(cache):
+    cache.set("t1", {"preferred_username": "user1"})
+    assert cache.get("t1") is None
+
+
+@pytest.mark.django_db
+def test_authenticate_verifies_signature_once_per_token():
+    decoded = {"preferred_username": "cacheduser", "exp": int(time.time()) + 60}
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION="Bearer same-token")
+    auth = KeycloakTokenAuthentication()
+
+    with patch(
+        "tosca_api.apps.authentication.backends.verify_and_decode_token",
+        return_value=decoded,
+    ) as verify:
+        for _ in range(3):
+            user, auth_claims = auth.authenticate(request)
+            assert user.username == "cacheduser"
+            assert auth_claims["preferred_username"] == "cacheduser"
+
+    assert verify.call_count == 1
@@ -6,7 +6,7 @@ from rest_framework.exceptions import AuthenticationFailed
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives import serialization
 
-from tosca_api.apps.core.jwt_utils import verify_and_decode_token
+from tosca_api.apps.core.jwt_utils import signing_key_cache, verify_and_decode_token
 
 
 # ---- RSA key generation (test-only, real crypto) ----
@@ -62,8 +62,9 @@ def make_token(payload_overrides=None, headers=None):
 
 # ---- PyJWKClient mock ----
 class FakeJWK:
-    def __init__(self, key):
+    def __init__(self, key, key_id=TEST_KID):
         self.key = key
+        self.key_id = key_id
 
 
 class FakeJWKClient:
@@ -73,6 +74,9 @@ class FakeJWKClient:
     def get_signing_key_from_jwt(self, token):
         return FakeJWK(TEST_PUBLIC_KEY)
 
+    def get_signing_keys(self, refresh=False):
+        return [FakeJWK(TEST_PUBLIC_KEY)]
+
 
 # ---- Settings override ----
 @pytest.fixture(autouse=True)
@@ -80,7 +84,9 @@ def override_settings(settings):
     settings.KEYCLOAK_JWKS_URL = "https://fake-jwks/"
     settings.KEYCLOAK_ISSUER = "https://issuer.example.com/"
     settings.ALLOWED_TOKEN_AUDIENCES = ["test-aud", "other-aud"]
+    signing_key_cache.clear()
     yield
+    signing_key_cache.clear()
 
 
 # ---- Tests ----
@@ -119,4 +125,40 @@ def test_azp_fallback():
     token = make_token({"aud": None, "azp": "test-aud"})
     payload = verify_and_decode_token(token)
     assert payload["sub"] == "user1"
-    assert payload["azp"] == "test-aud"
\ No newline at end of file
+    assert payload["azp"] == "test-aud"
+
+@patch("tosca_api.apps.core.jwt_utils.PyJWKClient", FakeJWKClient)
+def test_azp_fallback_with_foreign_audience():
+    token = make_token({"aud": ["account-console"], "azp": "other-aud"})
+    payload = verify_and_decode_token(token)
+    assert payload["azp"] == "other-aud"
+
+
+@patch("tosca_api.apps.core.jwt_utils.PyJWKClient", FakeJWKClient)
+def test_audience_list_with_one_allowed_entry():
+    token = make_token({"aud": ["account-console", "test-aud"]})
+    payload = verify_and_decode_token(token)
+    assert payload["sub"] == "user1"
+
+
+@patch("tosca_api.apps.core.jwt_utils.PyJWKClient", FakeJWKClient)
+def test_azp_not_allowed():
+    token = make_token({"aud": None, "azp": "not-allowed"})
+    with pytest.raises(AuthenticationFailed, match="audience"):
+        verify_and_decode_token(token)
+
+
+@patch("tosca_api.apps.core.jwt_utils.PyJWKClient", FakeJWKClient)
+def test_expired_token_reports_expiry():
+    expired = datetime.datetime.now(datetime.UTC) - datetime.timedelta(minutes=10)
+    token = make_token({"exp": expired})
+    with pytest.raises(AuthenticationFailed, match="expired"):
+        verify_and_decode_token(token)
+
+
+@patch("tosca_api.apps.core.jwt_utils.PyJWKClient", FakeJWKClient)
+def test_azp_fallback_decodes_once():
+    token = make_token({"aud": None, "azp": "test-aud"})
+    with patch("tosca_api.apps.core.jwt_utils.jwt.decode", wraps=jwt.decode) as decode:
+        verify_and_decode_token(token)
+    assert decode.call_count == 1
@@ -0,0 +1,182 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory
+
+from tosca_api.apps.authentication.backends import KeycloakTokenAuthentication
+from tosca_api.apps.authentication.token_cache import verified_token_cache
+from tosca_api.apps.authentication.user_cache import (
+    GroupMembershipCache,
+    UserResolutionCache,
+    user_resolution_cache,
+)
+
+User = get_user_model()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clear_caches(settings):
+    settings.KEYCLOAK_USER_CACHE_SIZE = 16
+    settings.KEYCLOAK_USER_CACHE_TTL = 60
+    # Exercise the user cache on its own: every call re-runs "verification".
+    settings.KEYCLOAK_TOKEN_CACHE_SIZE = 0
+    user_resolution_cache.clear()
+    verified_token_cache.clear()
+    yield
+    user_resolution_cache.clear()
+
+
+def make_claims(roles=(), **overrides):
+    claims = {
+        "preferred_username": "cacheuser",
+        "email": "cacheuser@example.com",
+        "given_name": "Cache",
+        "family_name": "User",
+        "exp": int(time.time()) + 60,
+        "realm_access": {"roles": list(roles)},
+    }
+    claims.update(overrides)
+    return claims
+
+
+def authenticate(claims):
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION="Bearer token")
+    with patch(
+        "tosca_api.apps.authentication.backends.verify_and_decode_token",
+        return_value=claims,
+    ):
+        user, _ = KeycloakTokenAuthentication().authenticate(request)
+    return user
+
+
+# =============================================================================
+# Cache unit tests
+# =============================================================================
+
+
+def test_cache_miss_on_role_change():
+    cache = UserResolutionCache(clock=FakeClock())
+    profile = {"email": "a@example.com"}
+    cache.set("alice", {"ADMIN"}, profile, User(username="alice"))
+
+    assert cache.get("alice", {"ADMIN"}, profile).username == "alice"
+    assert cache.get("alice", {"SUPERADMIN"}, profile) is None
+
+
+def test_cache_miss_on_profile_change():
+    cache = UserResolutionCache(clock=FakeClock())
+    cache.set("alice", set(), {"email": "a@example.com"}, User(username="alice"))
+
+    assert cache.get("alice", set(), {"email": "new@example.com"}) is None
+
+
+def test_cache_entry_expires_after_ttl():
+    clock = FakeClock()
+    cache = UserResolutionCache(clock=clock)
+    cache.set("alice", set(), {}, User(username="alice"))
+
+    clock.now += 61
+    assert cache.get("alice", set(), {}) is None
+
+
+def test_cache_returns_private_copies():
+    cache = UserResolutionCache(clock=FakeClock())
+    cache.set("alice", set(), {}, User(username="alice"))
+
+    first = cache.get("alice", set(), {})
+    first.first_name = "changed"
+    assert cache.get("alice", set(), {}).first_name == ""
+
+
+def group_user(pk, *names):
+    groups = SimpleNamespace(values_list=lambda *fields, flat: list(names))
+    return SimpleNamespace(pk=pk, groups=groups)
+
+
+def test_group_cache_evicts_least_recently_used(settings):
+    settings.KEYCLOAK_USER_CACHE_SIZE = 2
+    cache = GroupMembershipCache(clock=FakeClock())
+    for pk in (1, 2):
+        cache.get_group_names(group_user(pk, "viewer"))
+    # Touch user 1 so user 2 is the oldest
+    assert cache.get_group_names(group_user(1)) == {"viewer"}
+    cache.get_group_names(group_user(3, "editor"))
+
+    assert list(cache._entries) == [1, 3]
+
+
+def test_group_cache_drops_expired_entries():
+    clock = FakeClock()
+    cache = GroupMembershipCache(clock=clock)
+    cache.get_group_names(group_user(1, "viewer"))
+
+    clock.now += 61
+    assert cache.get_group_names(group_user(1, "editor")) == {"editor"}
+    assert len(cache._entries) == 1
+
+
+# =============================================================================
+# Authentication integration
+# =============================================================================
+
+
+@pytest.mark.django_db
+def test_repeat_authentication_needs_no_queries(django_assert_num_queries):
+    authenticate(make_claims())
+
+    with django_assert_num_queries(0):
+        user = authenticate(make_claims())
+    assert user.username == "cacheuser"
+    assert user.email == "cacheuser@example.com"
+
+
+@pytest.mark.django_db
+def test_unchanged_claims_do_not_write(django_assert_num_queries):
+    User.objects.create(
+        username="cacheuser",
+        email="cacheuser@example.com",
+        first_name="Cache",
+        last_name="User",
+    )
+
+    # One SELECT from get_or_create, no UPDATE
+    with django_assert_num_queries(1):
+        authenticate(make_claims())
+
+
+@pytest.mark.django_db
+def test_role_change_is_synced():
+    authenticate(make_claims())
+    user = authenticate(make_claims(roles=["ADMIN"]))
+
+    assert user.is_staff is True
+    assert User.objects.get(username="cacheuser").is_staff is True
+
+
+@pytest.mark.django_db
+def test_profile_change_is_synced():
+    authenticate(make_claims())
+    authenticate(make_claims(email="renamed@example.com"))
+
+    assert User.objects.get(username="cacheuser").email == "renamed@example.com"
+
+
+@pytest.mark.django_db
+def test_user_save_invalidates_cache():
+    authenticate(make_claims())
+    db_user = User.objects.get(username="cacheuser")
+    db_user.is_active = False
+    db_user.save()
+
+    assert authenticate(make_claims()).is_active is False
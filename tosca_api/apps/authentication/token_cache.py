@@ -0,0 +1,91 @@
+"""
+Verified-token cache for KeycloakTokenAuthentication.
+
+SPA clients send the same access token on every request until it expires.
+Once a token has passed signature, issuer and audience checks, its decoded
+claims are kept in a bounded LRU keyed by the SHA-256 digest of the token, so
+repeat requests skip the RS256 verification. Entries expire at the token's
+``exp`` (capped by ``KEYCLOAK_TOKEN_CACHE_MAX_TTL``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+def token_digest(token: str) -> str:
+    """Return the cache key for a raw token; the token itself is never stored."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokenCache:
+    """Thread-safe LRU of decoded token claims with per-entry expiry."""
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def maxsize(self) -> int:
+        return getattr(settings, "KEYCLOAK_TOKEN_CACHE_SIZE", 1024)
+
+    @property
+    def max_ttl(self) -> float:
+        return getattr(settings, "KEYCLOAK_TOKEN_CACHE_MAX_TTL", 300)
+
+    def get(self, token: str) -> dict | None:
+        """Return a copy of the cached claims, or None if absent or expired."""
+        if self.maxsize <= 0:
+            return None
+
+        key = token_digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            expires_at, claims = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return dict(claims)
+
+    def set(self, token: str, claims: dict) -> None:
+        """Cache verified claims until the token expires."""
+        maxsize = self.maxsize
+        exp = claims.get("exp")
+        if maxsize <= 0 or not isinstance(exp, (int, float)):
+            return
+
+        expires_at = min(float(exp), self._clock() + self.max_ttl)
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = dict.fromkeys(self._stats, 0)
+
+
+verified_token_cache = VerifiedTokenCache()
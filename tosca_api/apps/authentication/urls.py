@@ -4,6 +4,7 @@ from tosca_api.apps.authentication.views import (
     KeycloakLogoutView,
     KeycloakRedirectView,
     test_token_auth,
+    test_token_auth_async,
     welcome_view,
 )
 
@@ -16,4 +17,5 @@ urlpatterns = [
     path('accounts/3rdparty/signup/', AutoSignupView.as_view(), name='socialaccount_signup'),
     path('accounts/', include('allauth.urls')),  # Keycloak OIDC (callback + login)
     path('api/v1/auth/test-token/', test_token_auth),
+    path('api/v1/auth/test-token-async/', test_token_auth_async),
 ]
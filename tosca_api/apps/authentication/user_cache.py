@@ -0,0 +1,151 @@
+"""
+User caches for token authentication and permission checks.
+
+UserResolutionCache (used by KeycloakTokenAuthentication) maps
+``preferred_username`` plus the token's role set to a ready ``User``, so
+authenticated requests with unchanged claims need no database round-trip.
+Entries are dropped when the user is saved or deleted (see signals.py) and
+otherwise live for ``KEYCLOAK_USER_CACHE_TTL`` seconds, which bounds how long
+another worker process can serve a user changed elsewhere.
+
+GroupMembershipCache holds each user's Django group names for the
+permission classes, invalidated when group membership changes and bounded
+like the user cache.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class UserResolutionCache:
+    """Thread-safe LRU of resolved users keyed by username and role set."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, frozenset, dict, object]] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def maxsize(self) -> int:
+        return getattr(settings, "KEYCLOAK_USER_CACHE_SIZE", 1024)
+
+    @property
+    def ttl(self) -> float:
+        return getattr(settings, "KEYCLOAK_USER_CACHE_TTL", 60)
+
+    def get(self, username: str, roles, profile: dict):
+        """
+        Return a private copy of the cached user if the role set and profile
+        claims still match what was synced to the database, else None.
+        """
+        if self.maxsize <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            expires_at, cached_roles, cached_profile, user = entry
+            if (
+                self._clock() >= expires_at
+                or cached_roles != frozenset(roles)
+                or cached_profile != profile
+            ):
+                del self._entries[username]
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(username)
+            self._stats["hits"] += 1
+        # Each request gets its own instance so per-request attribute
+        # changes never leak into other threads.
+        return copy.copy(user)
+
+    def set(self, username: str, roles, profile: dict, user) -> None:
+        maxsize = self.maxsize
+        if maxsize <= 0:
+            return
+
+        entry = (self._clock() + self.ttl, frozenset(roles), dict(profile), copy.copy(user))
+        with self._lock:
+            self._entries[username] = entry
+            self._entries.move_to_end(username)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        with self._lock:
+            if self._entries.pop(username, None) is not None:
+                self._stats["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = dict.fromkeys(self._stats, 0)
+
+
+user_resolution_cache = UserResolutionCache()
+
+
+class GroupMembershipCache:
+    """Thread-safe LRU of Django group names per user id."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, tuple[float, frozenset]] = OrderedDict()
+
+    @property
+    def maxsize(self) -> int:
+        # Keyed by the same users as the resolution cache
+        return getattr(settings, "KEYCLOAK_USER_CACHE_SIZE", 1024)
+
+    @property
+    def ttl(self) -> float:
+        return getattr(settings, "KEYCLOAK_GROUP_CACHE_TTL", 60)
+
+    def get_group_names(self, user) -> frozenset:
+        """Return the user's group names, querying at most once per TTL."""
+        maxsize = self.maxsize
+        with self._lock:
+            entry = self._entries.get(user.pk)
+            if entry is not None:
+                if self._clock() < entry[0]:
+                    self._entries.move_to_end(user.pk)
+                    return entry[1]
+                del self._entries[user.pk]
+
+        names = frozenset(user.groups.values_list("name", flat=True))
+        if maxsize <= 0:
+            return names
+
+        with self._lock:
+            self._entries[user.pk] = (self._clock() + self.ttl, names)
+            self._entries.move_to_end(user.pk)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+        return names
+
+    def invalidate(self, user_pk) -> None:
+        with self._lock:
+            self._entries.pop(user_pk, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+group_membership_cache = GroupMembershipCache()
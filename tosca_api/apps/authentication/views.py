@@ -4,11 +4,15 @@ from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.views import View
 from django.contrib.auth import get_user_model
+from django.http import JsonResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 import logging
 
+from tosca_api.apps.authentication.backends import KeycloakTokenAuthentication
+
 logger = logging.getLogger(__name__)
 
 User = get_user_model()
@@ -220,3 +224,34 @@ def test_token_auth(request):
         'is_superuser': request.user.is_superuser,
         'auth_method': str(request.auth.__class__.__name__) if request.auth else 'session'
     })
+
+
+async def test_token_auth_async(request):
+    """Async test endpoint: validates the Bearer token without blocking a worker thread."""
+    authenticator = KeycloakTokenAuthentication()
+    try:
+        result = await authenticator.aauthenticate(request)
+    except AuthenticationFailed as exc:
+        return JsonResponse(
+            {'detail': str(exc.detail)},
+            status=401,
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+    if result is None:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided.'},
+            status=401,
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+
+    user, _ = result
+    # Mirror DRF so middleware (e.g. Server-Timing) sees the token user
+    request.user = user
+    return JsonResponse({
+        'message': 'Token authentication successful!',
+        'user': user.username,
+        'email': user.email,
+        'is_staff': user.is_staff,
+        'is_superuser': user.is_superuser,
+        'auth_method': 'keycloak-async',
+    })
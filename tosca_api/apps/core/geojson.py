@@ -0,0 +1,66 @@
+"""
+GeoJSON features built inside PostGIS.
+
+Serializing map results through GeoFeatureModelSerializer materializes a
+model instance per row, converts the geometry through GEOS and re-encodes
+everything in Python. For read-only map endpoints the database can emit each
+feature as JSON text directly (``ST_AsGeoJSON`` + ``jsonb_build_object``);
+Python then only concatenates strings (see core/streaming.py).
+
+Timestamps are rendered as UTC ISO 8601 with a ``Z`` suffix, matching DRF's
+output with ``TIME_ZONE = "UTC"``. Key order inside a feature follows
+PostgreSQL's jsonb ordering rather than the serializer's field order.
+"""
+
+from __future__ import annotations
+
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.db.models import Func, JSONField, TextField, Value
+from django.db.models.functions import Cast, JSONObject
+
+from .streaming import STREAM_CHUNK_SIZE
+
+
+class UTCTimestamp(Func):
+    """
+    timestamptz as ISO 8601 UTC text, e.g. ``2025-05-01T10:00:00Z``.
+
+    Like DRF, fractional seconds are only written when nonzero
+    (``2025-05-01T10:00:00.250000Z``).
+    """
+
+    template = (
+        "regexp_replace("
+        "to_char(%(expressions)s AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS.US\"Z\"'), "
+        "'\\.000000Z$', 'Z')"
+    )
+    output_field = TextField()
+
+
+def geojson_feature(geo_field: str, properties: dict, precision: int, id_field: str = "id"):
+    """
+    Expression producing one GeoJSON Feature as JSON text.
+
+    ``properties`` maps output names to field names or expressions.
+    ``precision`` is the number of decimal places kept in coordinates.
+    """
+    return Cast(
+        JSONObject(
+            type=Cast(Value("Feature"), TextField()),
+            id=id_field,
+            geometry=Cast(AsGeoJSON(geo_field, precision=precision), JSONField()),
+            properties=JSONObject(**properties),
+        ),
+        TextField(),
+    )
+
+
+def db_features(
+    queryset, geo_field: str, properties: dict, precision: int, chunk_size: int = STREAM_CHUNK_SIZE
+):
+    """Yield each row of ``queryset`` as pre-encoded GeoJSON Feature text."""
+    return (
+        queryset.annotate(geojson_feature=geojson_feature(geo_field, properties, precision))
+        .values_list("geojson_feature", flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
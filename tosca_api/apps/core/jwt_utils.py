@@ -1,56 +1,320 @@
+import asyncio
+import threading
+import time
+
+import httpx
 import jwt
 from jwt import PyJWKClient
 from django.conf import settings
 from rest_framework.exceptions import AuthenticationFailed
-from jwt import InvalidAudienceError, ExpiredSignatureError, InvalidIssuerError
-from jwt.exceptions import MissingRequiredClaimError
+from jwt import ExpiredSignatureError, InvalidIssuerError
+from jwt.exceptions import PyJWKClientError
+from tosca_api.apps.core.timing import stage
 import logging
 
 logger = logging.getLogger(__name__)
 
-def verify_and_decode_token(token: str):
-    try:
-        jwks_client = PyJWKClient(settings.KEYCLOAK_JWKS_URL)
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
 
+class SigningKeyCache:
+    """
+    Process-wide, thread-safe cache of Keycloak signing keys keyed by ``kid``.
+
+    - Fresh keys (younger than ``KEYCLOAK_JWKS_CACHE_TTL``) are served from memory.
+    - Stale keys are still served, while a single background thread refreshes
+      the key set (stale-while-revalidate), so request threads never wait on
+      the JWKS endpoint for a key they already know.
+    - An unknown ``kid`` (key rotation) forces a synchronous refresh, throttled
+      by ``KEYCLOAK_JWKS_MIN_REFRESH_INTERVAL`` so forged ``kid`` values cannot
+      hammer Keycloak.
+
+    The ``a``-prefixed methods are the async equivalents for ASGI code: an
+    unknown ``kid`` is fetched with httpx on the event loop, and concurrent
+    misses on the same loop await one shared fetch.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._keys = {}
+        self._fetched_at = None
+        self._last_refresh_attempt = None
+        self._refreshing = False
+        self._inflight = None
+        self._stats = {"hits": 0, "misses": 0, "refreshes": 0, "refresh_failures": 0}
+
+    @property
+    def ttl(self) -> float:
+        return getattr(settings, "KEYCLOAK_JWKS_CACHE_TTL", 300)
+
+    @property
+    def min_refresh_interval(self) -> float:
+        return getattr(settings, "KEYCLOAK_JWKS_MIN_REFRESH_INTERVAL", 10)
+
+    def get_signing_key_from_jwt(self, token: str):
+        """Return the signing key matching the ``kid`` header of ``token``."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        if not kid:
+            raise PyJWKClientError("Token header does not contain a key id (kid)")
+        return self.get_signing_key(kid)
+
+    async def aget_signing_key_from_jwt(self, token: str):
+        kid = jwt.get_unverified_header(token).get("kid")
+        if not kid:
+            raise PyJWKClientError("Token header does not contain a key id (kid)")
+        return await self.aget_signing_key(kid)
+
+    def get_signing_key(self, kid: str):
+        key = self._lookup(kid)
+        if key is not None:
+            return key
+
+        # Unknown kid: new key after rotation or a cold cache. Refresh inline.
+        self.refresh(force=False)
+        return self._require(kid)
+
+    async def aget_signing_key(self, kid: str):
+        key = self._lookup(kid)
+        if key is not None:
+            return key
+
+        await self.arefresh(force=False)
+        return self._require(kid)
+
+    def _lookup(self, kid: str):
+        """Return a cached key, scheduling a background refresh if it is stale."""
+        with self._lock:
+            key = self._keys.get(kid)
+            if key is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._stats["hits"] += 1
+            if self._is_stale() and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(
+                    target=self._background_refresh,
+                    name="jwks-refresh",
+                    daemon=True,
+                ).start()
+            return key
+
+    def _require(self, kid: str):
+        with self._lock:
+            key = self._keys.get(kid)
+        if key is None:
+            raise PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    def refresh(self, force: bool = True) -> None:
+        """
+        Fetch the key set from Keycloak and replace the cached keys.
+
+        Concurrent callers are coalesced onto one fetch. Unless ``force`` is
+        set, a refresh is skipped if one was attempted within the minimum
+        refresh interval.
+        """
+        with self._refresh_lock:
+            if not self._claim_refresh(force):
+                return
+
+            try:
+                client = PyJWKClient(
+                    settings.KEYCLOAK_JWKS_URL,
+                    cache_jwk_set=False,
+                    timeout=getattr(settings, "KEYCLOAK_JWKS_TIMEOUT", 5),
+                )
+                signing_keys = client.get_signing_keys(refresh=True)
+            except Exception:
+                self._record_failure()
+                raise
+
+            self._store(signing_keys)
+
+    async def arefresh(self, force: bool = True) -> None:
+        """Async refresh; concurrent callers on one event loop share the fetch."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._inflight
+            if inflight is not None and inflight[0] is loop and not inflight[1].done():
+                task = inflight[1]
+            else:
+                task = None
+
+        if task is None:
+            if not self._claim_refresh(force):
+                return
+            task = loop.create_task(self._afetch_and_store())
+            with self._lock:
+                self._inflight = (loop, task)
+
+        await asyncio.shield(task)
+
+    async def _afetch_and_store(self) -> None:
         try:
-            decoded = jwt.decode(
-                token,
-                signing_key.key,
-                algorithms=["RS256"],
-                audience=settings.ALLOWED_TOKEN_AUDIENCES,
-                issuer=settings.KEYCLOAK_ISSUER,
-            )
-
-        except (InvalidAudienceError, MissingRequiredClaimError):
-            # aud invalid OR missing → try azp fallback
-            unverified = jwt.decode(token, options={"verify_signature": False})
-            azp = unverified.get("azp")
-
-            if not azp or azp not in settings.ALLOWED_TOKEN_AUDIENCES:
-                raise AuthenticationFailed("Token audience (aud/azp) is invalid")
-
-            # IMPORTANT:
-            # aud yokken PyJWT audience doğrulaması YAPAMAZ
-            decoded = jwt.decode(
-                token,
-                signing_key.key,
-                algorithms=["RS256"],
-                issuer=settings.KEYCLOAK_ISSUER,
-                options={"verify_aud": False},
-            )
-        except ExpiredSignatureError:
-                raise AuthenticationFailed("Token has expired")
-
-        except InvalidIssuerError:
-            raise AuthenticationFailed("Token issuer (iss) is invalid")
+            signing_keys = await afetch_signing_keys()
+        except Exception:
+            self._record_failure()
+            raise
+        self._store(signing_keys)
+
+    def _claim_refresh(self, force: bool) -> bool:
+        """Record a refresh attempt unless one happened within the minimum interval."""
+        with self._lock:
+            now = self._clock()
+            if (
+                not force
+                and self._last_refresh_attempt is not None
+                and now - self._last_refresh_attempt < self.min_refresh_interval
+            ):
+                return False
+            self._last_refresh_attempt = now
+            return True
+
+    def _store(self, signing_keys) -> None:
+        with self._lock:
+            self._keys = {key.key_id: key for key in signing_keys}
+            self._fetched_at = self._clock()
+            self._stats["refreshes"] += 1
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._stats["refresh_failures"] += 1
 
+    def set_keys(self, signing_keys) -> None:
+        """Seed the cache with already-fetched keys (benchmarks, warm-up)."""
+        with self._lock:
+            self._keys = {key.key_id: key for key in signing_keys}
+            self._fetched_at = self._clock()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh(force=False)
         except Exception as exc:
-            logger.warning("JWT verification failed: %s", exc)
-            raise AuthenticationFailed("Invalid token")
+            # Keep serving the stale keys; the next stale hit retries.
+            logger.warning("JWKS background refresh failed", extra={"error": str(exc)})
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _is_stale(self) -> bool:
+        return self._fetched_at is None or self._clock() - self._fetched_at >= self.ttl
 
-        return decoded
+    def stats(self) -> dict:
+        """Return a snapshot of the hit/miss/refresh counters."""
+        with self._lock:
+            return {**self._stats, "keys": len(self._keys)}
 
+    def clear(self) -> None:
+        """Drop all cached keys and counters."""
+        with self._refresh_lock, self._lock:
+            self._keys = {}
+            self._fetched_at = None
+            self._last_refresh_attempt = None
+            self._inflight = None
+            self._stats = dict.fromkeys(self._stats, 0)
+
+
+async def afetch_signing_keys():
+    """Fetch the JWKS document without blocking the event loop."""
+    async with httpx.AsyncClient(
+        timeout=getattr(settings, "KEYCLOAK_JWKS_TIMEOUT", 5),
+        follow_redirects=False,
+    ) as client:
+        response = await client.get(settings.KEYCLOAK_JWKS_URL)
+        response.raise_for_status()
+        jwk_set = jwt.PyJWKSet.from_dict(response.json())
+
+    signing_keys = [
+        key for key in jwk_set.keys if key.public_key_use in ("sig", None) and key.key_id
+    ]
+    if not signing_keys:
+        raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
+    return signing_keys
+
+
+signing_key_cache = SigningKeyCache()
+
+
+def verify_audience(claims: dict) -> None:
+    """
+    Apply the aud/azp policy to already-verified claims.
+
+    The token is accepted if any ``aud`` entry is an allowed client. Keycloak
+    access tokens issued to public clients (e.g. tosca-web) often carry other
+    clients in ``aud``, so a missing or non-matching ``aud`` falls back to the
+    authorized party (``azp``).
+    """
+    allowed = settings.ALLOWED_TOKEN_AUDIENCES
+    aud = claims.get("aud")
+    if isinstance(aud, str):
+        audiences = [aud]
+    elif isinstance(aud, (list, tuple)):
+        audiences = aud
+    else:
+        audiences = []
+
+    if any(audience in allowed for audience in audiences):
+        return
+
+    azp = claims.get("azp")
+    if azp and azp in allowed:
+        return
+
+    raise AuthenticationFailed("Token audience (aud/azp) is invalid")
+
+
+def verify_and_decode_token(token: str):
+    """
+    Verify a Keycloak RS256 token and return its claims.
+
+    The signature, expiry and issuer are checked in a single ``jwt.decode``;
+    the audience policy then runs on the decoded claims (see verify_audience).
+    Key lookup and verification are recorded as the ``jwks`` and ``verify``
+    timing stages (see core/timing.py).
+    """
+    try:
+        with stage("jwks"):
+            signing_key = signing_key_cache.get_signing_key_from_jwt(token)
+    except Exception as exc:
+        logger.error("JWT verification error: %s", exc)
+        raise AuthenticationFailed("Invalid token")
+
+    with stage("verify"):
+        return _decode_with_key(token, signing_key)
+
+
+async def averify_and_decode_token(token: str):
+    """Async variant of verify_and_decode_token for ASGI code paths."""
+    try:
+        with stage("jwks"):
+            signing_key = await signing_key_cache.aget_signing_key_from_jwt(token)
     except Exception as exc:
         logger.error("JWT verification error: %s", exc)
-        raise AuthenticationFailed("Invalid token")
\ No newline at end of file
+        raise AuthenticationFailed("Invalid token")
+
+    with stage("verify"):
+        return _decode_with_key(token, signing_key)
+
+
+def _decode_with_key(token: str, signing_key) -> dict:
+    try:
+        decoded = jwt.decode(
+            token,
+            signing_key.key,
+            algorithms=["RS256"],
+            issuer=settings.KEYCLOAK_ISSUER,
+            options={"verify_aud": False},
+        )
+    except ExpiredSignatureError:
+        raise AuthenticationFailed("Token has expired")
+
+    except InvalidIssuerError:
+        raise AuthenticationFailed("Token issuer (iss) is invalid")
+
+    except Exception as exc:
+        logger.warning("JWT verification failed: %s", exc)
+        raise AuthenticationFailed("Invalid token")
+
+    verify_audience(decoded)
+    return decoded
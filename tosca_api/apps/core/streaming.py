@@ -0,0 +1,74 @@
+"""
+Streaming JSON responses for large result sets.
+
+Map endpoints can return tens of thousands of features. Instead of building
+the whole FeatureCollection in memory, the queryset is read with
+``.iterator()`` (a server-side cursor on PostgreSQL) and the collection is
+written incrementally, so memory stays flat and the first bytes leave as soon
+as the first rows arrive.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+STREAM_CHUNK_SIZE = 500
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def iter_feature_collection(
+    features: Iterable, chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Yield a GeoJSON FeatureCollection as text fragments.
+
+    ``features`` may yield dicts (encoded here) or pre-encoded JSON strings.
+    Features are joined into fragments of ``chunk_size`` to avoid one write
+    per row.
+    """
+    yield '{"type":"FeatureCollection","features":['
+    buffer = []
+    first = True
+    for feature in features:
+        if not isinstance(feature, str):
+            feature = _encoder.encode(feature)
+        buffer.append(feature)
+        if len(buffer) >= chunk_size:
+            yield ("" if first else ",") + ",".join(buffer)
+            first = False
+            buffer = []
+    if buffer:
+        yield ("" if first else ",") + ",".join(buffer)
+    yield "]}"
+
+
+def serialize_features(
+    queryset, serializer_class, context=None, chunk_size: int = STREAM_CHUNK_SIZE
+):
+    """Yield one serialized feature per row, reading the queryset in chunks."""
+    # A single serializer instance: fields are built once, not per row.
+    serializer = serializer_class(context=context or {})
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(instance)
+
+
+def streaming_feature_collection(features: Iterable, **kwargs) -> StreamingHttpResponse:
+    """Stream already produced features (dicts or JSON text) as a FeatureCollection."""
+    return StreamingHttpResponse(
+        iter_feature_collection(features),
+        content_type="application/json",
+        **kwargs,
+    )
+
+
+def feature_collection_response(
+    queryset, serializer_class, context=None, **kwargs
+) -> StreamingHttpResponse:
+    """Stream ``queryset`` as a GeoJSON FeatureCollection via ``serializer_class``."""
+    features = serialize_features(queryset, serializer_class, context=context)
+    return streaming_feature_collection(features, **kwargs)
+
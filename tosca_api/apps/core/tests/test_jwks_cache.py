@@ -0,0 +1,136 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from jwt.exceptions import PyJWKClientConnectionError, PyJWKClientError
+
+from tosca_api.apps.core.jwt_utils import SigningKeyCache
+
+
+class FakeJWK:
+    def __init__(self, key_id):
+        self.key = f"public-key-{key_id}"
+        self.key_id = key_id
+
+
+class FakeJWKSClient:
+    """Stand-in for PyJWKClient that serves a mutable key set and counts fetches."""
+
+    kids = ["kid-1"]
+    fetches = 0
+    fail = False
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_signing_keys(self, refresh=False):
+        type(self).fetches += 1
+        if type(self).fail:
+            raise PyJWKClientConnectionError("Keycloak unreachable")
+        return [FakeJWK(kid) for kid in type(self).kids]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def jwks_settings(settings):
+    settings.KEYCLOAK_JWKS_URL = "https://fake-jwks/"
+    settings.KEYCLOAK_JWKS_CACHE_TTL = 300
+    settings.KEYCLOAK_JWKS_MIN_REFRESH_INTERVAL = 10
+    FakeJWKSClient.kids = ["kid-1"]
+    FakeJWKSClient.fetches = 0
+    FakeJWKSClient.fail = False
+    with patch("tosca_api.apps.core.jwt_utils.PyJWKClient", FakeJWKSClient):
+        yield
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return SigningKeyCache(clock=clock)
+
+
+def wait_for_refresh(cache, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_known_kid_is_served_from_memory(cache):
+    cache.get_signing_key("kid-1")
+    for _ in range(10):
+        assert cache.get_signing_key("kid-1").key == "public-key-kid-1"
+
+    assert FakeJWKSClient.fetches == 1
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 10
+    assert stats["refreshes"] == 1
+
+
+def test_unknown_kid_forces_refresh(cache, clock):
+    cache.get_signing_key("kid-1")
+    FakeJWKSClient.kids = ["kid-1", "kid-2"]
+    clock.now += 11
+
+    assert cache.get_signing_key("kid-2").key_id == "kid-2"
+    assert FakeJWKSClient.fetches == 2
+
+
+def test_unknown_kid_refresh_is_throttled(cache, clock):
+    cache.get_signing_key("kid-1")
+
+    with pytest.raises(PyJWKClientError):
+        cache.get_signing_key("forged-kid")
+    assert FakeJWKSClient.fetches == 1
+
+    clock.now += 11
+    with pytest.raises(PyJWKClientError):
+        cache.get_signing_key("forged-kid")
+    assert FakeJWKSClient.fetches == 2
+
+
+def test_stale_key_is_served_while_refreshing_in_background(cache, clock):
+    cache.get_signing_key("kid-1")
+    clock.now += 301
+
+    assert cache.get_signing_key("kid-1").key_id == "kid-1"
+    wait_for_refresh(cache)
+
+    assert FakeJWKSClient.fetches == 2
+    assert cache.stats()["refreshes"] == 2
+
+
+def test_stale_key_survives_failed_refresh(cache, clock):
+    cache.get_signing_key("kid-1")
+    FakeJWKSClient.fail = True
+    clock.now += 301
+
+    assert cache.get_signing_key("kid-1").key_id == "kid-1"
+    wait_for_refresh(cache)
+
+    assert cache.get_signing_key("kid-1").key_id == "kid-1"
+    assert cache.stats()["refresh_failures"] >= 1
+
+
+def test_clear_resets_keys_and_counters(cache):
+    cache.get_signing_key("kid-1")
+    cache.clear()
+
+    assert cache.stats() == {
+        "hits": 0,
+        "misses": 0,
+        "refreshes": 0,
+        "refresh_failures": 0,
+        "keys": 0,
+    }
@@ -0,0 +1,47 @@
+import json
+import uuid
+
+import pytest
+
+from tosca_api.apps.core.streaming import iter_feature_collection
+
+
+def feature(i):
+    return {"type": "Feature", "id": uuid.UUID(int=i), "geometry": None, "properties": {"n": i}}
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 7])
+def test_feature_collection_is_valid_json(count):
+    body = "".join(iter_feature_collection((feature(i) for i in range(count)), chunk_size=3))
+    data = json.loads(body)
+
+    assert data["type"] == "FeatureCollection"
+    assert [f["properties"]["n"] for f in data["features"]] == list(range(count))
+    if count:
+        assert data["features"][0]["id"] == str(uuid.UUID(int=0))
+
+
+def test_features_are_batched_into_chunks():
+    chunks = list(iter_feature_collection((feature(i) for i in range(7)), chunk_size=3))
+
+    # header, 3 + 3 + 1 features, footer
+    assert len(chunks) == 5
+
+
+def test_pre_encoded_features_pass_through():
+    body = "".join(iter_feature_collection(['{"type":"Feature"}', '{"type":"Feature"}']))
+    assert json.loads(body)["features"] == [{"type": "Feature"}, {"type": "Feature"}]
+
+
+def test_rows_are_consumed_lazily():
+    consumed = []
+
+    def rows():
+        for i in range(10):
+            consumed.append(i)
+            yield feature(i)
+
+    stream = iter_feature_collection(rows(), chunk_size=2)
+    next(stream)  # header
+    next(stream)  # first chunk
+    assert consumed == [0, 1]
@@ -0,0 +1,67 @@
+"""
+Lightweight per-request stage timings.
+
+Code paths wrap expensive steps in ``stage("name")``; the durations are
+recorded only while a ``collect()`` block is active in the current context
+(thread or asyncio task), so instrumented helpers cost a context-variable
+lookup when nobody is measuring.
+
+    with collect() as timings:
+        with stage("jwks"):
+            ...
+    timings.as_dict()  # {"jwks": 0.42, "total": 0.45}
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current: ContextVar[StageTimings | None] = ContextVar("tosca_stage_timings", default=None)
+
+
+class StageTimings:
+    """Accumulated milliseconds per stage name, in first-seen order."""
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self.total = 0.0
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + elapsed_ms
+
+    def as_dict(self) -> dict[str, float]:
+        return {**self.stages, "total": self.total}
+
+
+@contextmanager
+def collect():
+    """Record stages entered inside the block; ``total`` covers the whole block."""
+    timings = StageTimings()
+    token = _current.set(timings)
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings.total = (time.perf_counter() - start) * 1000
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    """Time the block as ``name`` if a collector is active."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, (time.perf_counter() - start) * 1000)
+
+
+def format_server_timing(timings: dict[str, float], prefix: str = "") -> str:
+    """Render timings as a ``Server-Timing`` header value."""
+    return ", ".join(f"{prefix}{name};dur={ms:.2f}" for name, ms in timings.items())
@@ -5,3 +5,6 @@ class EventsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tosca_api.apps.events"
     verbose_name = "Calendar Events"
+
+    def ready(self):
+        from tosca_api.apps.events import signals  # noqa: F401
@@ -0,0 +1,179 @@
+"""
+Response caches for the events endpoints.
+
+Both caches are CampaignResponseCache instances: thread-safe LRUs whose
+entries are tagged with the request's ``campaign_id`` filter and dropped
+when an event of that campaign is saved or deleted (see signals.py);
+entries without a campaign filter are dropped on any event change. The TTL
+bounds staleness from writes in other worker processes and bulk updates
+that bypass signals.
+
+- ``within_result_cache`` keeps rendered /events/within/ FeatureCollections
+  keyed by a digest of the normalized request body (geometry plus filters)
+  and the ``bucketed_now`` bucket, so dashboards re-posting the same district
+  polygons skip GeoJSON parsing, GEOS and the spatial query, and events that
+  have started drop out of upcoming-only results with the next bucket.
+- ``upcoming_page_cache`` keeps serialized first pages of the default
+  upcoming-events list per campaign. "Now" is floored to
+  ``EVENTS_UPCOMING_BUCKET_SECONDS`` (see ``bucketed_now``) so all requests
+  within a bucket share one query and one entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def bucketed_now() -> datetime:
+    """``timezone.now()`` floored to ``EVENTS_UPCOMING_BUCKET_SECONDS`` (0 = exact)."""
+    now = timezone.now()
+    bucket = getattr(settings, "EVENTS_UPCOMING_BUCKET_SECONDS", 60)
+    if bucket <= 0:
+        return now
+    return datetime.fromtimestamp(int(now.timestamp()) // bucket * bucket, tz=UTC)
+
+
+def _normalize(value):
+    """Canonical form of decoded JSON: numbers as floats, containers recursed."""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return str(value)
+
+
+def request_digest(data) -> str:
+    """
+    SHA-256 of a request body independent of key order and number spelling,
+    so ``10`` and ``10.0`` or reordered members hit the same entry.
+    """
+    if hasattr(data, "dict"):
+        # QueryDict from form-encoded bodies
+        data = data.dict()
+    canonical = json.dumps(_normalize(data), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class CampaignResponseCache:
+    """
+    Thread-safe LRU of responses tagged by campaign.
+
+    Size, TTL and maximum body size come from the ``<prefix>_SIZE``,
+    ``<prefix>_TTL`` and ``<prefix>_MAX_BYTES`` settings.
+    """
+
+    def __init__(self, settings_prefix: str, clock=time.monotonic):
+        self._prefix = settings_prefix
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[object, tuple[float, str | None, object]] = OrderedDict()
+        # Bumped on every invalidation; a response rendered across one is not stored.
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def maxsize(self) -> int:
+        return getattr(settings, f"{self._prefix}_SIZE", 256)
+
+    @property
+    def ttl(self) -> float:
+        return getattr(settings, f"{self._prefix}_TTL", 60)
+
+    @property
+    def max_bytes(self) -> int:
+        return getattr(settings, f"{self._prefix}_MAX_BYTES", 5_000_000)
+
+    @property
+    def generation(self) -> int:
+        """Pass to ``set`` to skip storing a value computed across an invalidation."""
+        with self._lock:
+            return self._generation
+
+    def get(self, key):
+        if self.maxsize <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._clock() >= entry[0]:
+                if entry is not None:
+                    del self._entries[key]
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[2]
+
+    def set(self, key, campaign_id, value, generation: int | None = None) -> None:
+        """Store ``value``; skipped if an invalidation happened since ``generation``."""
+        maxsize = self.maxsize
+        if maxsize <= 0:
+            return
+
+        tag = str(campaign_id) if campaign_id else None
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl, tag, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def tee(self, key: str, campaign_id, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Pass a streamed response body through, storing it once complete.
+
+        Bodies above ``<prefix>_MAX_BYTES`` stream normally but are not kept.
+        """
+        # Read before the first chunk, i.e. before the query runs.
+        generation = self.generation
+        max_bytes = self.max_bytes
+        parts: list[bytes] | None = [] if self.maxsize > 0 else None
+        size = 0
+        for chunk in chunks:
+            if parts is not None:
+                size += len(chunk)
+                if size > max_bytes:
+                    parts = None
+                else:
+                    parts.append(chunk)
+            yield chunk
+        if parts is not None:
+            self.set(key, campaign_id, b"".join(parts), generation)
+
+    def invalidate_campaign(self, campaign_id) -> None:
+        """Drop entries for ``campaign_id`` and all entries without a campaign filter."""
+        tag = str(campaign_id)
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, entry in self._entries.items() if entry[1] in (tag, None)]
+            for key in stale:
+                del self._entries[key]
+            self._stats["invalidations"] += len(stale)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._stats = dict.fromkeys(self._stats, 0)
+
+
+within_result_cache = CampaignResponseCache("EVENTS_WITHIN_CACHE")
+upcoming_page_cache = CampaignResponseCache("EVENTS_UPCOMING_CACHE")
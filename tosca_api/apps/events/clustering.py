@@ -0,0 +1,58 @@
+"""
+Grid clustering of events for low zoom map views.
+
+Events are snapped to a grid whose cell size follows the zoom level (about
+``EVENTS_CLUSTER_CELL_PX`` screen pixels per cell on 256 px tiles) and grouped
+in PostGIS, so the database returns one row per occupied cell instead of one
+per event. Each cluster becomes a GeoJSON Point feature at the centroid of
+its events with ``count`` and ``extent`` ([min_lon, min_lat, max_lon, max_lat])
+properties.
+"""
+
+from django.conf import settings
+from django.contrib.gis.db.models import Collect, Extent
+from django.contrib.gis.db.models.functions import Centroid, SnapToGrid
+from django.db.models import Count
+
+TILE_SIZE_PX = 256
+
+
+def cluster_cell_size(zoom: int) -> float:
+    """Grid cell size in degrees for ``zoom``."""
+    cell_px = getattr(settings, "EVENTS_CLUSTER_CELL_PX", 64)
+    return 360 / 2**zoom * cell_px / TILE_SIZE_PX
+
+
+def should_cluster(zoom) -> bool:
+    """True if ``zoom`` is below the level at which individual events are shown."""
+    return zoom is not None and zoom < getattr(settings, "EVENTS_CLUSTER_MAX_ZOOM", 14)
+
+
+def cluster_events(queryset, zoom: int):
+    """Yield one GeoJSON cluster feature per occupied grid cell."""
+    precision = getattr(settings, "EVENTS_GEOJSON_PRECISION", 6)
+    clusters = (
+        queryset.order_by()
+        .filter(location__isnull=False)
+        .annotate(cell=SnapToGrid("location", cluster_cell_size(zoom)))
+        .values("cell")
+        .annotate(
+            count=Count("id"),
+            center=Centroid(Collect("location")),
+            extent=Extent("location"),
+        )
+        .values_list("count", "center", "extent")
+    )
+    for count, center, extent in clusters.iterator():
+        yield {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [round(center.x, precision), round(center.y, precision)],
+            },
+            "properties": {
+                "cluster": True,
+                "count": count,
+                "extent": [round(value, precision) for value in extent],
+            },
+        }
@@ -0,0 +1,29 @@
+"""
+Database-side GeoJSON for the event map endpoints.
+
+Produces the same features as CalendarEventGeoSerializer, but each feature
+is built by PostGIS as JSON text (see core/geojson.py). Coordinates are
+rounded to ``EVENTS_GEOJSON_PRECISION`` decimal places.
+"""
+
+from django.conf import settings
+
+from tosca_api.apps.core.geojson import UTCTimestamp, db_features
+
+# Keep in sync with CalendarEventGeoSerializer.Meta.fields
+EVENT_FEATURE_PROPERTIES = {
+    "title": "title",
+    "description": "description",
+    "campaign": "campaign_id",
+    "start_datetime": UTCTimestamp("start_datetime"),
+    "end_datetime": UTCTimestamp("end_datetime"),
+    "status": "status",
+    "visibility": "visibility",
+}
+
+
+def event_features(queryset, precision: int | None = None):
+    """Yield GeoJSON Feature text for each event in ``queryset``."""
+    if precision is None:
+        precision = getattr(settings, "EVENTS_GEOJSON_PRECISION", 6)
+    return db_features(queryset, "location", EVENT_FEATURE_PROPERTIES, precision)
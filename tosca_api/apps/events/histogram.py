@@ -0,0 +1,47 @@
+"""
+Event counts per day, week or month for calendar widgets.
+
+One query: the filtered CalendarEvent queryset is used as a subquery,
+grouped by ``date_trunc`` of ``start_datetime`` in the requested time zone,
+and joined onto a ``generate_series`` of all buckets in the range so empty
+days come back as zero instead of being missing. Buckets are wall-clock
+periods in that zone (weeks start on Monday), so DST transitions produce
+23/25-hour days rather than shifted boundaries.
+"""
+
+from django.db import connection
+
+HISTOGRAM_BUCKETS = ("day", "week", "month")
+
+HISTOGRAM_SQL = """
+WITH counts AS (
+    SELECT date_trunc(%s, e.start_datetime AT TIME ZONE %s) AS bucket, count(*) AS count
+    FROM ({events}) AS e
+    GROUP BY 1
+)
+SELECT series.bucket AT TIME ZONE %s, coalesce(counts.count, 0)
+FROM generate_series(
+    date_trunc(%s, %s::timestamptz AT TIME ZONE %s),
+    %s::timestamptz AT TIME ZONE %s - interval '1 microsecond',
+    %s::interval
+) AS series(bucket)
+LEFT JOIN counts USING (bucket)
+ORDER BY series.bucket
+"""
+
+
+def event_histogram(queryset, bucket: str, tz: str, start, end) -> list[tuple]:
+    """
+    Return ``(bucket_start, count)`` for every ``bucket`` from the one
+    containing ``start`` up to ``end`` (exclusive), counting events of
+    ``queryset`` by ``start_datetime``. ``bucket_start`` is timezone-aware.
+    """
+    events = queryset.order_by().values("start_datetime")
+    events_sql, events_params = events.query.sql_with_params()
+
+    sql = HISTOGRAM_SQL.format(events=events_sql)
+    params = [bucket, tz, *events_params, tz, bucket, start, tz, end, tz, f"1 {bucket}"]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
@@ -0,0 +1,117 @@
+"""
+Benchmark: event map GeoJSON built by DRF vs by PostGIS.
+
+Seeds N published events with random locations inside one transaction,
+renders the same FeatureCollection three ways and rolls everything back:
+
+- serializer (many=True): the original in-memory CalendarEventGeoSerializer path
+- serializer (streamed): core.streaming with one serializer per row
+- database (streamed): events/geojson.py, features built by ST_AsGeoJSON
+
+Each row reports wall time to produce the full body, body size and peak
+Python memory (tracemalloc).
+
+Usage:
+    python manage.py bench_event_geojson --events 10000 100000
+"""
+
+import random
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.core.streaming import (
+    feature_collection_response,
+    streaming_feature_collection,
+)
+from tosca_api.apps.events.geojson import event_features
+from tosca_api.apps.events.models import CalendarEvent
+from tosca_api.apps.events.serializers import CalendarEventGeoSerializer
+
+# Hamburg
+BBOX = (9.7, 53.4, 10.3, 53.7)
+
+
+class Command(BaseCommand):
+    help = "Compare serializer and PostGIS GeoJSON generation for the event map endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, nargs="+", default=[10_000, 100_000])
+        parser.add_argument("--precision", type=int, default=6)
+
+    def handle(self, *args, **options):
+        for count in options["events"]:
+            with transaction.atomic():
+                self._seed(count)
+                queryset = CalendarEvent.objects.filter(
+                    status=CalendarEvent.Status.PUBLISHED, location__isnull=False
+                )
+                self.stdout.write(f"--- {count} events ---")
+                self._measure(
+                    "serializer (many=True)",
+                    lambda queryset=queryset: self._in_memory(queryset),
+                )
+                self._measure(
+                    "serializer (streamed)",
+                    lambda queryset=queryset: self._consume(
+                        feature_collection_response(queryset, CalendarEventGeoSerializer)
+                    ),
+                )
+                self._measure(
+                    "database (streamed)",
+                    lambda queryset=queryset: self._consume(
+                        streaming_feature_collection(event_features(queryset, options["precision"]))
+                    ),
+                )
+                transaction.set_rollback(True)
+
+    def _seed(self, count):
+        user = get_user_model().objects.create_user(username=f"bench-geojson-{count}")
+        campaign = Campaign.objects.create(title="GeoJSON benchmark", created_by=user)
+        start = timezone.now() + timedelta(days=1)
+        rng = random.Random(count)
+        min_lon, min_lat, max_lon, max_lat = BBOX
+        CalendarEvent.objects.bulk_create(
+            (
+                CalendarEvent(
+                    campaign=campaign,
+                    title=f"Bench event {i}",
+                    description="Benchmark event",
+                    start_datetime=start + timedelta(minutes=i),
+                    end_datetime=start + timedelta(minutes=i + 60),
+                    location=Point(
+                        rng.uniform(min_lon, max_lon), rng.uniform(min_lat, max_lat), srid=4326
+                    ),
+                    organizer=user,
+                    status=CalendarEvent.Status.PUBLISHED,
+                )
+                for i in range(count)
+            ),
+            batch_size=5000,
+        )
+
+    def _in_memory(self, queryset):
+        return len(JSONRenderer().render(CalendarEventGeoSerializer(queryset, many=True).data))
+
+    def _consume(self, response):
+        return sum(len(chunk) for chunk in response.streaming_content)
+
+    def _measure(self, label, fn):
+        tracemalloc.start()
+        start = time.perf_counter()
+        size = fn()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(
+            f"{label:<24} {elapsed * 1000:>10.1f}ms {size / 1024:>10.1f}KiB "
+            f"peak={peak / 1024 / 1024:.1f}MiB"
+        )
@@ -0,0 +1,152 @@
+"""
+Benchmark: /events/within/ matching for large polygons.
+
+Seeds N published events around Hamburg inside one transaction, then for
+each boundary compares plain ``location__within`` with the ST_Subdivide path
+from events/within.py (and optionally a simplified polygon). Id sets of the
+exact paths are checked for equality; everything is rolled back afterwards.
+
+Boundaries are synthetic jagged polygons with administrative-boundary
+vertex counts by default; pass ``--geojson`` to use real boundaries (a
+GeoJSON Polygon/MultiPolygon, Feature or FeatureCollection in EPSG:4326).
+
+Usage:
+    python manage.py bench_events_within --events 50000 --vertices 5000 20000 80000
+    python manage.py bench_events_within --geojson hamburg_bezirke.geojson
+"""
+
+import json
+import math
+import random
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import GEOSGeometry, Point, Polygon
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.events.models import CalendarEvent
+from tosca_api.apps.events.within import filter_within
+
+CENTER = (10.0, 53.55)
+
+
+class Command(BaseCommand):
+    help = "Compare location__within and ST_Subdivide matching for large polygons."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=50_000)
+        parser.add_argument("--vertices", type=int, nargs="+", default=[5_000, 20_000, 80_000])
+        parser.add_argument(
+            "--geojson", type=Path, help="File with real boundaries to use instead."
+        )
+        parser.add_argument("--subdivide", type=int, default=256, help="Max vertices per piece.")
+        parser.add_argument(
+            "--simplify", type=float, default=0.0001, help="Tolerance in degrees (0 = skip)."
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        boundaries = (
+            self._load_geojson(options["geojson"])
+            if options["geojson"]
+            else [(f"synthetic {n} vertices", self._jagged(n)) for n in options["vertices"]]
+        )
+
+        with transaction.atomic():
+            self._seed(options["events"])
+            base = CalendarEvent.objects.filter(status=CalendarEvent.Status.PUBLISHED)
+            for label, geometry in boundaries:
+                self.stdout.write(f"--- {label} ({geometry.num_coords} vertices) ---")
+                plain = self._time(
+                    "location__within",
+                    lambda geometry=geometry: base.filter(location__within=geometry),
+                    options["repeat"],
+                )
+                with override_settings(EVENTS_WITHIN_SUBDIVIDE_VERTICES=options["subdivide"]):
+                    subdivided = self._time(
+                        f"ST_Subdivide({options['subdivide']})",
+                        lambda geometry=geometry: filter_within(base, geometry),
+                        options["repeat"],
+                    )
+                if plain != subdivided:
+                    raise CommandError("Subdivided result differs from location__within")
+                self.stdout.write(f"identical results: {len(plain)} events")
+
+                if options["simplify"]:
+                    simplified = geometry.simplify(options["simplify"], preserve_topology=True)
+                    simplified.srid = geometry.srid
+                    approx = self._time(
+                        f"simplified ({simplified.num_coords} vertices)",
+                        lambda simplified=simplified: base.filter(location__within=simplified),
+                        options["repeat"],
+                    )
+                    self.stdout.write(f"simplified differs by {len(approx ^ plain)} events")
+            transaction.set_rollback(True)
+
+    def _seed(self, count):
+        user = get_user_model().objects.create_user(username="bench-within")
+        campaign = Campaign.objects.create(title="Within benchmark", created_by=user)
+        start = timezone.now() + timedelta(days=1)
+        rng = random.Random(count)
+        CalendarEvent.objects.bulk_create(
+            (
+                CalendarEvent(
+                    campaign=campaign,
+                    title=f"Bench event {i}",
+                    start_datetime=start,
+                    end_datetime=start + timedelta(hours=1),
+                    location=Point(
+                        CENTER[0] + rng.uniform(-0.3, 0.3),
+                        CENTER[1] + rng.uniform(-0.2, 0.2),
+                        srid=4326,
+                    ),
+                    organizer=user,
+                    status=CalendarEvent.Status.PUBLISHED,
+                )
+                for i in range(count)
+            ),
+            batch_size=5000,
+        )
+
+    def _jagged(self, vertices):
+        rng = random.Random(vertices)
+        ring = []
+        for i in range(vertices):
+            angle = 2 * math.pi * i / vertices
+            r = 0.15 * (1 + 0.2 * math.sin(angle * 7) + 0.05 * rng.uniform(-1, 1))
+            ring.append((CENTER[0] + r * math.cos(angle) * 1.6, CENTER[1] + r * math.sin(angle)))
+        ring.append(ring[0])
+        return Polygon(ring, srid=4326)
+
+    def _load_geojson(self, path):
+        data = json.loads(path.read_text())
+        features = data.get("features") or [data]
+        boundaries = []
+        for index, feature in enumerate(features):
+            geometry = feature.get("geometry", feature)
+            if geometry.get("type") not in ("Polygon", "MultiPolygon"):
+                continue
+            name = (feature.get("properties") or {}).get("name", f"{path.name} #{index}")
+            geom = GEOSGeometry(json.dumps(geometry))
+            geom.srid = 4326
+            boundaries.append((name, geom))
+        if not boundaries:
+            raise CommandError(f"No Polygon/MultiPolygon found in {path}")
+        return boundaries
+
+    def _time(self, label, make_queryset, repeat):
+        samples = []
+        result = set()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = set(make_queryset().values_list("id", flat=True))
+            samples.append((time.perf_counter() - start) * 1000)
+        mean = sum(samples) / len(samples)
+        self.stdout.write(f"{label:<32} best={min(samples):.1f}ms mean={mean:.1f}ms")
+        return result
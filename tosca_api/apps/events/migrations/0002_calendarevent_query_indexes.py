@@ -0,0 +1,41 @@
+# Generated by Django 5.1.14 on 2026-10-16 22:40
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0001_initial'),
+        ('events', '0001_initial'),
+        ('geocontext', '0001_initial'),
+        ('layerrefs', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='calendarevent',
+            name='location',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, null=True, spatial_index=False, srid=4326),
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['status', 'campaign', 'start_datetime'], name='event_status_camp_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['campaign', 'start_datetime'], name='event_pub_campaign_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['start_datetime'], name='event_pub_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['location'], name='event_location_gist'),
+        ),
+    ]
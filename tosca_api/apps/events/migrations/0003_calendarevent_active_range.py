@@ -0,0 +1,29 @@
+# Generated by Django 5.1.14 on 2026-10-16 22:41
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0001_initial'),
+        ('events', '0002_calendarevent_query_indexes'),
+        ('geocontext', '0001_initial'),
+        ('layerrefs', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendarevent',
+            name='active_range',
+            field=models.GeneratedField(db_persist=True, expression=models.Func(models.F('start_datetime'), models.F('end_datetime'), models.Value('[]'), function='tstzrange', output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()), output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['active_range'], name='event_active_range_gist'),
+        ),
+    ]
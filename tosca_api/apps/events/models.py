@@ -13,6 +13,8 @@ import uuid
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.indexes import GistIndex
 from django.core.exceptions import ValidationError
 from django.db import models
 
@@ -32,6 +34,7 @@ class CalendarEvent(TimeStampedModel):
         context: 1:1 link to rich content block (optional)
         start_datetime: When the event starts
         end_datetime: When the event ends
+        active_range: Generated tstzrange [start_datetime, end_datetime]
         location: Optional point location (SRID 4326)
         organizer: User who created/organizes the event
         layers: M2M link to map layers
@@ -70,8 +73,23 @@ class CalendarEvent(TimeStampedModel):
     start_datetime = models.DateTimeField()
     end_datetime = models.DateTimeField()
 
-    # Spatial location (optional) - WGS84
-    location = gis_models.PointField(srid=4326, blank=True, null=True)
+    # [start_datetime, end_datetime] maintained by PostgreSQL; GiST-indexed
+    # for time-window overlap (active_during) queries.
+    active_range = models.GeneratedField(
+        expression=models.Func(
+            models.F("start_datetime"),
+            models.F("end_datetime"),
+            models.Value("[]"),
+            function="tstzrange",
+            output_field=DateTimeRangeField(),
+        ),
+        output_field=DateTimeRangeField(),
+        db_persist=True,
+    )
+
+    # Spatial location (optional) - WGS84. Indexed by the explicit GiST
+    # index in Meta.indexes rather than the implicit spatial_index.
+    location = gis_models.PointField(srid=4326, blank=True, null=True, spatial_index=False)
 
     organizer = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -121,6 +139,27 @@ class CalendarEvent(TimeStampedModel):
             models.Index(fields=["campaign"]),
             models.Index(fields=["start_datetime", "end_datetime"]),
             models.Index(fields=["status"]),
+            # List/map access paths: status + campaign filter, start_datetime
+            # range and ordering. The partial indexes cover the default
+            # published-only queries with and without campaign_id.
+            models.Index(
+                fields=["status", "campaign", "start_datetime"],
+                name="event_status_camp_start_idx",
+            ),
+            models.Index(
+                fields=["campaign", "start_datetime"],
+                condition=models.Q(status="published"),
+                name="event_pub_campaign_start_idx",
+            ),
+            models.Index(
+                fields=["start_datetime"],
+                condition=models.Q(status="published"),
+                name="event_pub_start_idx",
+            ),
+            # bbox (location__within), /within/ and vector tiles
+            GistIndex(fields=["location"], name="event_location_gist"),
+            # active_during (active_range && tstzrange)
+            GistIndex(fields=["active_range"], name="event_active_range_gist"),
         ]
         constraints = [
             # Ensure end_datetime >= start_datetime
@@ -133,6 +172,13 @@ class CalendarEvent(TimeStampedModel):
     def __str__(self) -> str:
         return f"{self.title} ({self.start_datetime.date()})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored campaign, so a move also invalidates the old one's caches (signals.py)
+        instance._loaded_campaign_id = instance.__dict__.get("campaign_id")
+        return instance
+
     def clean(self) -> None:
         """Validate the event."""
         errors = {}
@@ -1,10 +1,17 @@
-from django.contrib.gis.geos import GEOSGeometry, Polygon
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.contrib.gis.geos import GEOSGeometry, Point, Polygon
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework import serializers
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
 
 from tosca_api.apps.geocontext.models import GeoContext
 
+from .histogram import HISTOGRAM_BUCKETS
 from .models import CalendarEvent, EventLayer
 
 
@@ -118,6 +125,19 @@ class CalendarEventGeoSerializer(GeoFeatureModelSerializer):
         read_only_fields = fields
 
 
+class CalendarEventNearestSerializer(CalendarEventGeoSerializer):
+    """GeoJSON serializer for /events/nearest/, adding distance in meters."""
+
+    distance = serializers.SerializerMethodField()
+
+    class Meta(CalendarEventGeoSerializer.Meta):
+        fields = CalendarEventGeoSerializer.Meta.fields + ["distance"]
+        read_only_fields = fields
+
+    def get_distance(self, obj) -> float:
+        return round(obj.distance.m, 1)
+
+
 class CalendarEventWriteSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating events."""
 
@@ -155,10 +175,108 @@ class CalendarEventWriteSerializer(serializers.ModelSerializer):
 # =============================================================================
 
 
+class DateTimeWindowField(serializers.CharField):
+    """Parses ``start,end`` (ISO 8601 datetimes) into an inclusive tstzrange."""
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        parts = [part.strip() for part in value.split(",")]
+        if len(parts) != 2:
+            raise serializers.ValidationError(
+                "Invalid time window. Expected: start,end (ISO 8601 datetimes)."
+            )
+        parse = serializers.DateTimeField().to_internal_value
+        start, end = parse(parts[0]), parse(parts[1])
+        if start > end:
+            raise serializers.ValidationError("Time window start must not be after its end.")
+        return DateTimeTZRange(start, end, "[]")
+
+
+class ActiveDuringSerializer(serializers.Serializer):
+    """Validates the ``active_during=start,end`` query parameter."""
+
+    active_during = DateTimeWindowField(required=False)
+
+
+class NearestQuerySerializer(serializers.Serializer):
+    """Validates lon/lat/limit query parameters for /events/nearest/."""
+
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    def validate(self, attrs):
+        attrs["point"] = Point(attrs["lon"], attrs["lat"], srid=4326)
+        return attrs
+
+
+class HistogramQuerySerializer(serializers.Serializer):
+    """
+    Validates /events/histogram/ query parameters.
+
+    ``from`` (inclusive) and ``to`` (exclusive) accept ISO 8601 dates or
+    datetimes; values without an offset are read in ``tz`` (IANA name,
+    default TIME_ZONE).
+    """
+
+    # Approximate bucket lengths, only used to bound the number of buckets
+    BUCKET_DAYS = {"day": 1, "week": 7, "month": 28}
+
+    bucket = serializers.ChoiceField(choices=HISTOGRAM_BUCKETS, default="day")
+    tz = serializers.CharField(required=False)
+    campaign_id = serializers.UUIDField(required=False)
+
+    def get_fields(self):
+        # "from" is a keyword, so these cannot be declared as attributes
+        fields = super().get_fields()
+        fields["from"] = serializers.CharField()
+        fields["to"] = serializers.CharField()
+        return fields
+
+    def validate_tz(self, value):
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise serializers.ValidationError(f"Unknown time zone: {value}")
+        return value
+
+    def validate(self, attrs):
+        attrs["tz"] = attrs.get("tz") or settings.TIME_ZONE
+        tz = ZoneInfo(attrs["tz"])
+        start = self._parse_bound(attrs["from"], tz, "from")
+        end = self._parse_bound(attrs["to"], tz, "to")
+        if end <= start:
+            raise serializers.ValidationError({"to": "Must be after 'from'."})
+
+        max_buckets = getattr(settings, "EVENTS_HISTOGRAM_MAX_BUCKETS", 1000)
+        if (end - start) / timedelta(days=self.BUCKET_DAYS[attrs["bucket"]]) > max_buckets:
+            raise serializers.ValidationError(
+                f"Range too large; at most {max_buckets} {attrs['bucket']} buckets."
+            )
+        attrs["from"], attrs["to"] = start, end
+        return attrs
+
+    @staticmethod
+    def _parse_bound(value, tz, name):
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                day = parse_date(value)
+                parsed = datetime.combine(day, time.min) if day else None
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise serializers.ValidationError({name: "Expected an ISO 8601 date or datetime."})
+        if timezone.is_naive(parsed):
+            parsed = parsed.replace(tzinfo=tz)
+        return parsed
+
+
 class BBoxSerializer(serializers.Serializer):
-    """Validates and parses bbox query parameter."""
+    """Validates and parses bbox (and optional map zoom) query parameters."""
 
     bbox = serializers.CharField(required=False, allow_blank=True)
+    zoom = serializers.IntegerField(required=False, min_value=0, max_value=24)
 
     def validate_bbox(self, value):
         """Parse bbox string into Polygon geometry."""
@@ -200,6 +318,9 @@ class GeometryFilterSerializer(serializers.Serializer):
     include_past = serializers.BooleanField(default=False)
     start_after = serializers.DateTimeField(required=False)
     start_before = serializers.DateTimeField(required=False)
+    active_during = DateTimeWindowField(required=False)
+    # Opt-in: trades exactness near the boundary for a cheaper query
+    simplify_tolerance = serializers.FloatField(required=False, min_value=0, max_value=0.01)
     status = serializers.ChoiceField(
         choices=CalendarEvent.Status.choices,
         default=CalendarEvent.Status.PUBLISHED,
@@ -219,11 +340,29 @@ class GeometryFilterSerializer(serializers.Serializer):
                     f"Geometry must be Polygon or MultiPolygon, got {geom.geom_type}"
                 )
 
+            # Bound the cost of the spatial query
+            max_vertices = getattr(settings, "EVENTS_WITHIN_MAX_VERTICES", 100_000)
+            if geom.num_coords > max_vertices:
+                raise serializers.ValidationError(
+                    f"Geometry has {geom.num_coords} vertices; the maximum is {max_vertices}."
+                )
+
             # Ensure SRID is set
             if geom.srid is None:
                 geom.srid = 4326
 
             return geom
 
+        except serializers.ValidationError:
+            raise
         except Exception as e:
             raise serializers.ValidationError(f"Invalid GeoJSON geometry: {e}")
+
+    def validate(self, attrs):
+        """Apply the optional topology-preserving simplification."""
+        tolerance = attrs.get("simplify_tolerance")
+        if tolerance:
+            geom = attrs["geometry"].simplify(tolerance, preserve_topology=True)
+            geom.srid = attrs["geometry"].srid
+            attrs["geometry"] = geom
+        return attrs
@@ -0,0 +1,25 @@
+"""Keep the events response caches in sync with CalendarEvent writes."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tosca_api.apps.events.cache import upcoming_page_cache, within_result_cache
+from tosca_api.apps.events.models import CalendarEvent
+
+
+def invalidate_campaigns(*campaign_ids) -> None:
+    for campaign_id in {c for c in campaign_ids if c is not None}:
+        within_result_cache.invalidate_campaign(campaign_id)
+        upcoming_page_cache.invalidate_campaign(campaign_id)
+
+
+@receiver(post_save, sender=CalendarEvent, dispatch_uid="invalidate_event_caches_on_save")
+@receiver(post_delete, sender=CalendarEvent, dispatch_uid="invalidate_event_caches_on_delete")
+def invalidate_event_caches(sender, instance, **kwargs):
+    # An event moved to another campaign must also invalidate the old one.
+    campaign_ids = (instance.campaign_id, getattr(instance, "_loaded_campaign_id", None))
+    instance._loaded_campaign_id = instance.campaign_id
+    invalidate_campaigns(*campaign_ids)
+    # Again after commit: a request may have cached the pre-commit state meanwhile.
+    transaction.on_commit(lambda: invalidate_campaigns(*campaign_ids))
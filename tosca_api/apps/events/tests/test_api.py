@@ -1,4 +1,5 @@
-from datetime import timedelta
+import json
+from datetime import datetime, timedelta
 
 import pytest
 from django.contrib.auth import get_user_model
@@ -7,11 +8,27 @@ from django.utils import timezone
 from rest_framework.test import APIClient
 
 from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.events.cache import upcoming_page_cache, within_result_cache
 from tosca_api.apps.events.models import CalendarEvent
 
 User = get_user_model()
 
 
+def streamed_json(response):
+    """Decode a StreamingHttpResponse body (map endpoints stream GeoJSON)."""
+    return json.loads(b"".join(response.streaming_content))
+
+
+@pytest.fixture(autouse=True)
+def clear_response_caches():
+    # Rolled-back test data does not fire signals
+    within_result_cache.clear()
+    upcoming_page_cache.clear()
+    yield
+    within_result_cache.clear()
+    upcoming_page_cache.clear()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -194,13 +211,15 @@ def test_events_bbox_returns_geojson(api_client, user, future_event):
     api_client.force_authenticate(user=user)
     response = api_client.get("/api/v1/events/?bbox=9.0,53.0,11.0,54.0")
     assert response.status_code == 200
+    assert response.streaming
+    data = streamed_json(response)
 
     # GeoJSON FeatureCollection structure
-    assert response.data["type"] == "FeatureCollection"
-    assert "features" in response.data
-    assert len(response.data["features"]) >= 1
+    assert data["type"] == "FeatureCollection"
+    assert "features" in data
+    assert len(data["features"]) >= 1
 
-    feature = response.data["features"][0]
+    feature = data["features"][0]
     assert feature["type"] == "Feature"
     assert "geometry" in feature
     assert "properties" in feature
@@ -216,7 +235,7 @@ def test_events_bbox_excludes_events_without_location(
     response = api_client.get("/api/v1/events/?bbox=9.0,53.0,11.0,54.0")
     assert response.status_code == 200
 
-    titles = [f["properties"]["title"] for f in response.data["features"]]
+    titles = [f["properties"]["title"] for f in streamed_json(response)["features"]]
     assert "Future Event" in titles
     assert "No Location Event" not in titles
 
@@ -251,7 +270,7 @@ def test_events_bbox_excludes_events_outside_bbox(api_client, user, campaign):
     response = api_client.get("/api/v1/events/?bbox=9.5,53.0,10.5,54.0")
     assert response.status_code == 200
 
-    titles = [f["properties"]["title"] for f in response.data["features"]]
+    titles = [f["properties"]["title"] for f in streamed_json(response)["features"]]
     assert "Hamburg Event" in titles
     assert "Berlin Event" not in titles
 
@@ -308,9 +327,10 @@ def test_events_within_polygon(api_client, user, campaign):
         format="json",
     )
     assert response.status_code == 200
-    assert response.data["type"] == "FeatureCollection"
+    data = streamed_json(response)
+    assert data["type"] == "FeatureCollection"
 
-    titles = [f["properties"]["title"] for f in response.data["features"]]
+    titles = [f["properties"]["title"] for f in data["features"]]
     assert "Inside Event" in titles
     assert "Outside Event" not in titles
 
@@ -363,6 +383,239 @@ def test_events_retrieve_detail(api_client, user, future_event):
     assert "context" in response.data
 
 
+# =============================================================================
+# Time Window Tests (active_during)
+# =============================================================================
+
+
+@pytest.fixture
+def day_events(user, campaign):
+    """Three published events on one future day: 10-12, 13-15, 16-20 UTC."""
+    day = (timezone.now() + timedelta(days=7)).replace(hour=0, minute=0, second=0, microsecond=0)
+    for title, start, end in [("Morning", 10, 12), ("Afternoon", 13, 15), ("Evening", 16, 20)]:
+        CalendarEvent.objects.create(
+            campaign=campaign,
+            title=title,
+            start_datetime=day + timedelta(hours=start),
+            end_datetime=day + timedelta(hours=end),
+            location=Point(10.0, 53.5, srid=4326),
+            organizer=user,
+            status=CalendarEvent.Status.PUBLISHED,
+        )
+    return day
+
+
+def window(day, start_hour, end_hour):
+    fmt = "%Y-%m-%dT%H:%M:%SZ"
+    return (
+        f"{(day + timedelta(hours=start_hour)).strftime(fmt)},"
+        f"{(day + timedelta(hours=end_hour)).strftime(fmt)}"
+    )
+
+
+@pytest.mark.django_db
+def test_events_list_active_during(api_client, user, day_events):
+    """Test that active_during returns events overlapping the window."""
+    api_client.force_authenticate(user=user)
+    response = api_client.get("/api/v1/events/", {"active_during": window(day_events, 14, 18)})
+    assert response.status_code == 200
+
+    titles = [e["title"] for e in response.data["results"]]
+    assert titles == ["Afternoon", "Evening"]
+
+
+@pytest.mark.django_db
+def test_events_active_during_includes_running_events(api_client, user, campaign):
+    """An event that started before now but is still running overlaps a window around now."""
+    now = timezone.now()
+    CalendarEvent.objects.create(
+        campaign=campaign,
+        title="Running Event",
+        start_datetime=now - timedelta(hours=1),
+        end_datetime=now + timedelta(hours=1),
+        organizer=user,
+        status=CalendarEvent.Status.PUBLISHED,
+    )
+    api_client.force_authenticate(user=user)
+    response = api_client.get("/api/v1/events/", {"active_during": window(now, 0, 0)})
+
+    titles = [e["title"] for e in response.data["results"]]
+    assert titles == ["Running Event"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "value", ["2025-01-01T10:00:00Z", "2025-01-02T10:00:00Z,2025-01-01T10:00:00Z", "a,b"]
+)
+def test_events_active_during_invalid(api_client, user, value):
+    """Test that malformed or reversed windows return 400."""
+    api_client.force_authenticate(user=user)
+    response = api_client.get("/api/v1/events/", {"active_during": value})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_events_within_active_during(api_client, user, day_events):
+    """Test that /within/ accepts active_during."""
+    api_client.force_authenticate(user=user)
+    response = api_client.post(
+        "/api/v1/events/within/",
+        {
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [[9.0, 53.0], [11.0, 53.0], [11.0, 54.0], [9.0, 54.0], [9.0, 53.0]]
+                ],
+            },
+            "active_during": window(day_events, 11, 13),
+        },
+        format="json",
+    )
+    assert response.status_code == 200
+
+    titles = [f["properties"]["title"] for f in streamed_json(response)["features"]]
+    assert titles == ["Morning", "Afternoon"]
+
+
+# =============================================================================
+# Nearest Events Tests
+# =============================================================================
+
+
+@pytest.fixture
+def spread_events(user, campaign):
+    """Published events at increasing distance east of (10.0, 53.5)."""
+    start = timezone.now() + timedelta(days=1)
+    for title, lon in [("Far", 10.2), ("Near", 10.001), ("Middle", 10.05)]:
+        CalendarEvent.objects.create(
+            campaign=campaign,
+            title=title,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+            location=Point(lon, 53.5, srid=4326),
+            organizer=user,
+            status=CalendarEvent.Status.PUBLISHED,
+        )
+
+
+@pytest.mark.django_db
+def test_events_nearest_orders_by_distance(api_client, user, spread_events):
+    """Test that nearest returns events closest first with distance in meters."""
+    api_client.force_authenticate(user=user)
+    response = api_client.get("/api/v1/events/nearest/", {"lon": 10.0, "lat": 53.5, "limit": 2})
+    assert response.status_code == 200
+    assert response.data["type"] == "FeatureCollection"
+
+    features = response.data["features"]
+    assert [f["properties"]["title"] for f in features] == ["Near", "Middle"]
+    # 0.001 degrees of longitude at 53.5N is about 66 m
+    assert 60 < features[0]["properties"]["distance"] < 72
+
+
+@pytest.mark.django_db
+def test_events_nearest_respects_filters(api_client, user, spread_events, campaign):
+    """Test that drafts and past events are excluded like in the list."""
+    CalendarEvent.objects.create(
+        campaign=campaign,
+        title="Draft Here",
+        start_datetime=timezone.now() + timedelta(days=1),
+        end_datetime=timezone.now() + timedelta(days=1, hours=1),
+        location=Point(10.0, 53.5, srid=4326),
+        organizer=user,
+        status=CalendarEvent.Status.DRAFT,
+    )
+    api_client.force_authenticate(user=user)
+    response = api_client.get("/api/v1/events/nearest/", {"lon": 10.0, "lat": 53.5})
+
+    titles = [f["properties"]["title"] for f in response.data["features"]]
+    assert titles == ["Near", "Middle", "Far"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params", [{"lon": 10.0}, {"lon": 200, "lat": 53.5}, {"lon": 10, "lat": 53.5, "limit": 0}]
+)
+def test_events_nearest_invalid_params(api_client, user, params):
+    """Test that missing or out-of-range parameters return 400."""
+    api_client.force_authenticate(user=user)
+    response = api_client.get("/api/v1/events/nearest/", params)
+    assert response.status_code == 400
+
+
+# =============================================================================
+# Histogram Tests
+# =============================================================================
+
+
+@pytest.fixture
+def october_events(user, campaign):
+    """Events around a DST change (Europe/Berlin switches on 2026-10-25)."""
+    utc_starts = [
+        ("2026-10-01T10:00:00+00:00", CalendarEvent.Status.PUBLISHED),
+        ("2026-10-01T22:30:00+00:00", CalendarEvent.Status.PUBLISHED),  # Oct 2 in Berlin
+        ("2026-10-03T12:00:00+00:00", CalendarEvent.Status.DRAFT),
+        ("2026-10-25T23:30:00+00:00", CalendarEvent.Status.PUBLISHED),  # Oct 26 in Berlin
+    ]
+    for i, (start, status) in enumerate(utc_starts):
+        start = datetime.fromisoformat(start)
+        CalendarEvent.objects.create(
+            campaign=campaign,
+            title=f"October {i}",
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+            organizer=user,
+            status=status,
+        )
+
+
+@pytest.mark.django_db
+def test_events_histogram_counts_per_local_day(api_client, user, october_events):
+    """Test day buckets in the requested zone, with empty days as zero."""
+    api_client.force_authenticate(user=user)
+    response = api_client.get(
+        "/api/v1/events/histogram/",
+        {"bucket": "day", "from": "2026-10-01", "to": "2026-11-01", "tz": "Europe/Berlin"},
+    )
+    assert response.status_code == 200
+
+    results = response.data["results"]
+    assert len(results) == 31
+    counts = {r["start"][:10]: r["count"] for r in results if r["count"]}
+    assert counts == {"2026-10-01": 1, "2026-10-02": 1, "2026-10-26": 1}
+    assert results[0]["start"] == "2026-10-01T00:00:00+02:00"
+    assert results[-1]["start"] == "2026-10-31T00:00:00+01:00"
+
+
+@pytest.mark.django_db
+def test_events_histogram_month_bucket_and_status(api_client, user, october_events):
+    """Test month buckets and that the status filter matches the list endpoint."""
+    api_client.force_authenticate(user=user)
+    params = {"bucket": "month", "from": "2026-09-01", "to": "2026-11-01"}
+    response = api_client.get("/api/v1/events/histogram/", params)
+    assert [r["count"] for r in response.data["results"]] == [0, 3]
+
+    response = api_client.get("/api/v1/events/histogram/", {**params, "status": "draft"})
+    assert [r["count"] for r in response.data["results"]] == [0, 1]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"from": "2026-10-01"},
+        {"from": "2026-10-02", "to": "2026-10-01"},
+        {"from": "2026-10-01", "to": "2026-11-01", "bucket": "hour"},
+        {"from": "2026-10-01", "to": "2026-11-01", "tz": "Nowhere/City"},
+        {"from": "2000-01-01", "to": "2026-11-01"},
+    ],
+)
+def test_events_histogram_invalid_params(api_client, user, params):
+    """Test that bad ranges, buckets and zones return 400."""
+    api_client.force_authenticate(user=user)
+    response = api_client.get("/api/v1/events/histogram/", params)
+    assert response.status_code == 400
+
+
 # =============================================================================
 # Create/Update/Delete Tests
 # =============================================================================
@@ -0,0 +1,268 @@
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.events.cache import (
+    CampaignResponseCache,
+    bucketed_now,
+    request_digest,
+    upcoming_page_cache,
+    within_result_cache,
+)
+from tosca_api.apps.events.models import CalendarEvent
+
+User = get_user_model()
+
+SQUARE = {
+    "type": "Polygon",
+    "coordinates": [[[9, 53], [11, 53], [11, 54], [9, 54], [9, 53]]],
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    settings.EVENTS_WITHIN_CACHE_SIZE = 16
+    settings.EVENTS_WITHIN_CACHE_TTL = 60
+    settings.EVENTS_UPCOMING_BUCKET_SECONDS = 60
+    within_result_cache.clear()
+    upcoming_page_cache.clear()
+    yield
+    within_result_cache.clear()
+    upcoming_page_cache.clear()
+
+
+def streamed_json(response):
+    return json.loads(b"".join(response.streaming_content))
+
+
+# =============================================================================
+# Digest and cache behaviour
+# =============================================================================
+
+
+def test_digest_ignores_key_order_and_number_spelling():
+    a = {"geometry": SQUARE, "include_past": True}
+    b = {
+        "include_past": True,
+        "geometry": {
+            "coordinates": [[[9.0, 53.0], [11.0, 53.0], [11.0, 54.0], [9.0, 54.0], [9.0, 53.0]]],
+            "type": "Polygon",
+        },
+    }
+    assert request_digest(a) == request_digest(b)
+    assert request_digest(a) != request_digest({**a, "include_past": False})
+
+
+def test_bucketed_now_floors_to_bucket(settings):
+    settings.EVENTS_UPCOMING_BUCKET_SECONDS = 300
+    now = bucketed_now()
+    assert now.timestamp() % 300 == 0
+    assert timezone.now() - now < timedelta(seconds=300)
+
+    settings.EVENTS_UPCOMING_BUCKET_SECONDS = 0
+    assert timezone.now() - bucketed_now() < timedelta(seconds=1)
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = CampaignResponseCache("EVENTS_WITHIN_CACHE", clock=clock)
+    cache.set("k", None, b"{}")
+    assert cache.get("k") == b"{}"
+
+    clock.now += 61
+    assert cache.get("k") is None
+
+
+def test_invalidation_drops_campaign_and_unfiltered_entries():
+    cache = CampaignResponseCache("EVENTS_WITHIN_CACHE")
+    cache.set("a", "campaign-a", b"a")
+    cache.set("b", "campaign-b", b"b")
+    cache.set("all", None, b"all")
+
+    cache.invalidate_campaign("campaign-a")
+
+    assert cache.get("a") is None
+    assert cache.get("all") is None
+    assert cache.get("b") == b"b"
+
+
+def test_tee_skips_store_after_concurrent_invalidation():
+    cache = CampaignResponseCache("EVENTS_WITHIN_CACHE")
+    stream = cache.tee("k", None, iter([b"{", b"}"]))
+    assert next(stream) == b"{"
+    cache.invalidate_campaign("campaign-a")
+    assert b"".join(stream) == b"}"
+
+    assert cache.get("k") is None
+
+
+def test_tee_skips_oversized_bodies(settings):
+    settings.EVENTS_WITHIN_CACHE_MAX_BYTES = 4
+    cache = CampaignResponseCache("EVENTS_WITHIN_CACHE")
+    assert b"".join(cache.tee("k", None, iter([b"abc", b"def"]))) == b"abcdef"
+    assert cache.get("k") is None
+
+
+# =============================================================================
+# /events/within/
+# =============================================================================
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="withincacheuser", password="password")
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def campaign(user):
+    return Campaign.objects.create(title="Cache Campaign", created_by=user)
+
+
+def make_event(campaign, user, title):
+    start = timezone.now() + timedelta(days=1)
+    return CalendarEvent.objects.create(
+        campaign=campaign,
+        title=title,
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=1),
+        location=Point(10.0, 53.5, srid=4326),
+        organizer=user,
+        status=CalendarEvent.Status.PUBLISHED,
+    )
+
+
+def post_within(client, **extra):
+    response = client.post("/api/v1/events/within/", {"geometry": SQUARE, **extra}, format="json")
+    assert response.status_code == 200
+    return [f["properties"]["title"] for f in streamed_json(response)["features"]]
+
+
+@pytest.mark.django_db
+def test_repeated_within_served_from_cache(api_client, user, campaign):
+    make_event(campaign, user, "First")
+
+    assert post_within(api_client) == ["First"]
+    assert post_within(api_client) == ["First"]
+    assert within_result_cache.stats()["hits"] == 1
+
+
+@pytest.mark.django_db
+def test_event_save_invalidates_cached_within(api_client, user, campaign):
+    make_event(campaign, user, "First")
+    assert post_within(api_client, campaign_id=str(campaign.id)) == ["First"]
+
+    make_event(campaign, user, "Second")
+    assert sorted(post_within(api_client, campaign_id=str(campaign.id))) == ["First", "Second"]
+
+
+@pytest.mark.django_db
+def test_other_campaign_keeps_cached_within(api_client, user, campaign):
+    make_event(campaign, user, "First")
+    post_within(api_client, campaign_id=str(campaign.id))
+
+    other = Campaign.objects.create(title="Other Campaign", created_by=user)
+    make_event(other, user, "Elsewhere")
+    assert post_within(api_client, campaign_id=str(campaign.id)) == ["First"]
+    assert within_result_cache.stats()["hits"] == 1
+
+
+@pytest.mark.django_db
+def test_moving_event_invalidates_previous_campaign(api_client, user, campaign):
+    make_event(campaign, user, "First")
+    assert post_within(api_client, campaign_id=str(campaign.id)) == ["First"]
+
+    event = CalendarEvent.objects.get()
+    event.campaign = Campaign.objects.create(title="Other Campaign", created_by=user)
+    event.save()
+    assert post_within(api_client, campaign_id=str(campaign.id)) == []
+
+
+@pytest.mark.django_db
+def test_event_delete_invalidates_cached_within(api_client, user, campaign):
+    event = make_event(campaign, user, "First")
+    post_within(api_client)
+
+    event.delete()
+    assert post_within(api_client) == []
+
+
+@pytest.mark.django_db
+def test_cached_within_expires_with_time_bucket(api_client, user, campaign):
+    make_event(campaign, user, "First")
+    post_within(api_client)
+
+    later = bucketed_now() + timedelta(days=2)
+    with patch("tosca_api.apps.events.views.bucketed_now", return_value=later):
+        # The event has started by then; upcoming-only results must not reuse the entry
+        assert post_within(api_client) == []
+
+
+# =============================================================================
+# Upcoming events list
+# =============================================================================
+
+
+def list_titles(client, **params):
+    response = client.get("/api/v1/events/", params)
+    assert response.status_code == 200
+    return [event["title"] for event in response.data["results"]]
+
+
+@pytest.mark.django_db
+def test_upcoming_list_served_from_cache(api_client, user, campaign):
+    make_event(campaign, user, "First")
+
+    assert list_titles(api_client) == ["First"]
+    assert list_titles(api_client) == ["First"]
+    assert list_titles(api_client, campaign_id=str(campaign.id)) == ["First"]
+    assert upcoming_page_cache.stats() == {"hits": 1, "misses": 2, "invalidations": 0, "size": 2}
+
+
+@pytest.mark.django_db
+def test_event_change_invalidates_upcoming_list(api_client, user, campaign):
+    event = make_event(campaign, user, "First")
+    assert list_titles(api_client, campaign_id=str(campaign.id)) == ["First"]
+
+    event.title = "Renamed"
+    event.save()
+    assert list_titles(api_client, campaign_id=str(campaign.id)) == ["Renamed"]
+
+
+@pytest.mark.django_db
+def test_filtered_list_not_cached(api_client, user, campaign):
+    make_event(campaign, user, "First")
+
+    list_titles(api_client, include_past="true")
+    list_titles(api_client, status="draft")
+    assert upcoming_page_cache.stats()["size"] == 0
+
+
+@pytest.mark.django_db
+def test_zero_bucket_disables_upcoming_cache(settings, api_client, user, campaign):
+    settings.EVENTS_UPCOMING_BUCKET_SECONDS = 0
+    make_event(campaign, user, "First")
+
+    list_titles(api_client)
+    assert upcoming_page_cache.stats()["size"] == 0
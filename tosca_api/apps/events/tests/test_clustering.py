@@ -0,0 +1,102 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.events.clustering import cluster_cell_size, should_cluster
+from tosca_api.apps.events.models import CalendarEvent
+
+User = get_user_model()
+
+GERMANY_BBOX = "5.0,47.0,15.0,55.0"
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="clusteruser", password="password")
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def events(user):
+    campaign = Campaign.objects.create(title="Cluster Campaign", created_by=user)
+    start = timezone.now() + timedelta(days=1)
+    points = [(10.0, 53.5), (10.01, 53.51), (10.02, 53.52), (13.4, 52.5)]
+    return [
+        CalendarEvent.objects.create(
+            campaign=campaign,
+            title=f"Event {i}",
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+            location=Point(lon, lat, srid=4326),
+            organizer=user,
+            status=CalendarEvent.Status.PUBLISHED,
+        )
+        for i, (lon, lat) in enumerate(points)
+    ]
+
+
+def streamed_json(response):
+    return json.loads(b"".join(response.streaming_content))
+
+
+def test_cell_size_halves_per_zoom_level(settings):
+    settings.EVENTS_CLUSTER_CELL_PX = 64
+    assert cluster_cell_size(0) == 90
+    assert cluster_cell_size(1) == 45
+
+
+def test_should_cluster_below_threshold(settings):
+    settings.EVENTS_CLUSTER_MAX_ZOOM = 14
+    assert should_cluster(13)
+    assert not should_cluster(14)
+    assert not should_cluster(None)
+
+
+@pytest.mark.django_db
+def test_low_zoom_returns_clusters(api_client, events):
+    response = api_client.get("/api/v1/events/", {"bbox": GERMANY_BBOX, "zoom": 5})
+    assert response.status_code == 200
+    features = streamed_json(response)["features"]
+
+    counts = sorted(f["properties"]["count"] for f in features)
+    assert counts == [1, 3]
+    hamburg = next(f for f in features if f["properties"]["count"] == 3)
+    assert hamburg["properties"]["cluster"] is True
+    assert hamburg["properties"]["extent"] == [10.0, 53.5, 10.02, 53.52]
+    assert hamburg["geometry"]["coordinates"] == pytest.approx([10.01, 53.51])
+
+
+@pytest.mark.django_db
+def test_high_zoom_returns_events(api_client, events):
+    response = api_client.get("/api/v1/events/", {"bbox": GERMANY_BBOX, "zoom": 16})
+    features = streamed_json(response)["features"]
+
+    assert len(features) == 4
+    assert all("title" in f["properties"] for f in features)
+
+
+@pytest.mark.django_db
+def test_clusters_respect_filters(api_client, events):
+    CalendarEvent.objects.filter(title="Event 3").update(status=CalendarEvent.Status.DRAFT)
+
+    response = api_client.get("/api/v1/events/", {"bbox": GERMANY_BBOX, "zoom": 5})
+    counts = [f["properties"]["count"] for f in streamed_json(response)["features"]]
+    assert counts == [3]
+
+
+@pytest.mark.django_db
+def test_invalid_zoom_rejected(api_client):
+    response = api_client.get("/api/v1/events/", {"bbox": GERMANY_BBOX, "zoom": 99})
+    assert response.status_code == 400
@@ -0,0 +1,98 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.events.geojson import event_features
+from tosca_api.apps.events.models import CalendarEvent
+from tosca_api.apps.events.serializers import CalendarEventGeoSerializer
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="geojsonuser", password="password")
+
+
+@pytest.fixture
+def events(user):
+    campaign = Campaign.objects.create(title="GeoJSON Campaign", created_by=user)
+    start = timezone.now() + timedelta(days=1)
+    return [
+        CalendarEvent.objects.create(
+            campaign=campaign,
+            title=f"Event {i}",
+            description="Walk & talk",
+            start_datetime=start + timedelta(hours=i),
+            # Whole seconds are written without a fraction
+            end_datetime=(start + timedelta(hours=i + 1)).replace(microsecond=0),
+            location=Point(10.0 + i / 100, 53.5, srid=4326),
+            organizer=user,
+            status=CalendarEvent.Status.PUBLISHED,
+        )
+        for i in range(3)
+    ]
+
+
+def streamed_json(response):
+    return json.loads(b"".join(response.streaming_content))
+
+
+@pytest.mark.django_db
+def test_db_features_match_serializer(events):
+    queryset = CalendarEvent.objects.order_by("start_datetime")
+    db = [json.loads(feature) for feature in event_features(queryset)]
+    expected = CalendarEventGeoSerializer(queryset, many=True).data["features"]
+
+    assert len(db) == len(expected)
+    for got, want in zip(db, expected):
+        assert got["type"] == "Feature"
+        assert got["id"] == want["id"]
+        assert got["geometry"] == json.loads(json.dumps(want["geometry"]))
+        props = want["properties"]
+        assert got["properties"]["title"] == props["title"]
+        assert got["properties"]["description"] == props["description"]
+        assert got["properties"]["campaign"] == str(props["campaign"])
+        assert got["properties"]["status"] == props["status"]
+        assert got["properties"]["visibility"] == props["visibility"]
+        for field in ("start_datetime", "end_datetime"):
+            assert got["properties"][field] == props[field]
+
+
+@pytest.mark.django_db
+def test_db_features_round_coordinates(user):
+    campaign = Campaign.objects.create(title="Precision Campaign", created_by=user)
+    start = timezone.now() + timedelta(days=1)
+    CalendarEvent.objects.create(
+        campaign=campaign,
+        title="Precise",
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=1),
+        location=Point(10.123456789, 53.987654321, srid=4326),
+        organizer=user,
+    )
+
+    (feature,) = event_features(CalendarEvent.objects.all(), precision=3)
+    assert json.loads(feature)["geometry"]["coordinates"] == [10.123, 53.988]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("db_geojson", [True, False])
+def test_bbox_response_same_for_both_paths(settings, user, events, db_geojson):
+    settings.EVENTS_DB_GEOJSON = db_geojson
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    data = streamed_json(client.get("/api/v1/events/?bbox=9.0,53.0,11.0,54.0"))
+    assert data["type"] == "FeatureCollection"
+    assert [f["properties"]["title"] for f in data["features"]] == [
+        "Event 0",
+        "Event 1",
+        "Event 2",
+    ]
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.events.ics import escape_text, fold
+from tosca_api.apps.events.models import CalendarEvent
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="icsuser", password="password")
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def campaign(user):
+    return Campaign.objects.create(
+        title="Stadtteil, Workshops",
+        created_by=user,
+        visibility=Campaign.Visibility.PUBLIC,
+    )
+
+
+@pytest.fixture
+def events(user, campaign):
+    start = datetime.fromisoformat("2026-11-02T17:00:00+01:00")
+    published = CalendarEvent.objects.create(
+        campaign=campaign,
+        title="Workshop; Altona",
+        description="Line one\nLine two",
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=2),
+        location=Point(9.935, 53.55, srid=4326),
+        organizer=user,
+        status=CalendarEvent.Status.PUBLISHED,
+    )
+    CalendarEvent.objects.create(
+        campaign=campaign,
+        title="Draft",
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=1),
+        organizer=user,
+        status=CalendarEvent.Status.DRAFT,
+    )
+    CalendarEvent.objects.create(
+        campaign=campaign,
+        title="Internal",
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=1),
+        organizer=user,
+        status=CalendarEvent.Status.PUBLISHED,
+        visibility=CalendarEvent.Visibility.PRIVATE,
+    )
+    return published
+
+
+def feed_url(campaign):
+    return f"/api/v1/events/feeds/{campaign.id}.ics"
+
+
+def test_escape_text():
+    assert escape_text("a,b;c\\d\ne") == "a\\,b\\;c\\\\d\\ne"
+
+
+def test_fold_long_lines_on_utf8_boundaries():
+    line = "SUMMARY:" + "ä" * 60
+    folded = fold(line)
+
+    physical = folded.split("\r\n")[:-1]
+    assert all(len(part.encode()) <= 75 for part in physical)
+    assert "".join(part.removeprefix(" ") for part in physical) == line
+
+
+@pytest.mark.django_db
+def test_ics_feed_contains_published_events(api_client, campaign, events):
+    response = api_client.get(feed_url(campaign))
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/calendar")
+    body = b"".join(response.streaming_content).decode()
+
+    assert body.startswith("BEGIN:VCALENDAR\r\n")
+    assert body.endswith("END:VCALENDAR\r\n")
+    assert "X-WR-CALNAME:Stadtteil\\, Workshops" in body
+    assert body.count("BEGIN:VEVENT") == 1
+    assert f"UID:{events.id}@tosca" in body
+    assert "SUMMARY:Workshop\\; Altona" in body
+    assert "DESCRIPTION:Line one\\nLine two" in body
+    assert "DTSTART:20261102T160000Z" in body
+    assert "GEO:53.550000;9.935000" in body
+
+
+@pytest.mark.django_db
+def test_ics_feed_not_modified(api_client, campaign, events):
+    response = api_client.get(feed_url(campaign))
+    etag = response["ETag"]
+
+    with CaptureQueriesContext(connection) as queries:
+        cached = api_client.get(feed_url(campaign), HTTP_IF_NONE_MATCH=etag)
+    assert cached.status_code == 304
+    assert cached["ETag"] == etag
+    # Campaign lookup and the aggregate; no event rows
+    assert len(queries) == 2
+
+
+@pytest.mark.django_db
+def test_ics_feed_ignores_if_modified_since_alone(api_client, campaign, events):
+    last_modified = api_client.get(feed_url(campaign))["Last-Modified"]
+
+    # Removing an event does not raise the newest updated_at of the others
+    events.delete()
+    response = api_client.get(feed_url(campaign), HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 200
+    assert "BEGIN:VEVENT" not in b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_ics_feed_etag_changes_on_delete(api_client, campaign, events):
+    etag = api_client.get(feed_url(campaign))["ETag"]
+
+    events.delete()
+    response = api_client.get(feed_url(campaign), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_ics_feed_unknown_campaign(api_client):
+    response = api_client.get(f"/api/v1/events/feeds/{uuid4()}.ics")
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_ics_feed_without_credentials(campaign, events):
+    response = APIClient().get(feed_url(campaign))
+    assert response.status_code == 200
+    assert "public" in response["Cache-Control"]
+    body = b"".join(response.streaming_content).decode()
+    assert body.count("BEGIN:VEVENT") == 1
+    assert "SUMMARY:Internal" not in body
+
+
+@pytest.mark.django_db
+def test_ics_feed_private_campaign(api_client, campaign, events):
+    campaign.visibility = Campaign.Visibility.PRIVATE
+    campaign.save()
+    assert api_client.get(feed_url(campaign)).status_code == 404
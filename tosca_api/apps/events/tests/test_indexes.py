@@ -0,0 +1,115 @@
+"""
+EXPLAIN-based regression tests for the CalendarEvent index suite.
+
+Seeds a dataset large enough for the planner to prefer indexes, then checks
+that the list, bbox and within queries built by CalendarEventViewSet are
+answered by index scans rather than a sequential scan of the events table.
+"""
+
+import random
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import GEOSGeometry, Point
+from django.db import connection
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.events.models import CalendarEvent
+from tosca_api.apps.events.views import CalendarEventViewSet
+
+User = get_user_model()
+
+EVENT_COUNT = 6000
+SEQ_SCAN = "Seq Scan on events_calendarevent"
+INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+
+@pytest.fixture
+def seeded(db):
+    user = User.objects.create_user(username="indexuser", password="password")
+    campaigns = [
+        Campaign.objects.create(title=f"Index Campaign {i}", created_by=user) for i in range(20)
+    ]
+    rng = random.Random(12)
+    now = timezone.now()
+    statuses = [choice for choice, _ in CalendarEvent.Status.choices]
+    events = []
+    for i in range(EVENT_COUNT):
+        start = now + timedelta(hours=rng.randint(-24 * 365, 24 * 365))
+        events.append(
+            CalendarEvent(
+                campaign=rng.choice(campaigns),
+                title=f"Indexed event {i}",
+                start_datetime=start,
+                end_datetime=start + timedelta(hours=2),
+                location=Point(rng.uniform(0, 20), rng.uniform(45, 55), srid=4326),
+                organizer=user,
+                status=rng.choice(statuses),
+            )
+        )
+    CalendarEvent.objects.bulk_create(events, batch_size=1000)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE events_calendarevent")
+    return campaigns
+
+
+def make_view(action, params=None):
+    request = Request(APIRequestFactory().get("/", params or {}))
+    return CalendarEventViewSet(action=action, request=request, format_kwarg=None)
+
+
+def assert_index_plan(queryset, expected_indexes):
+    plan = queryset.explain()
+    assert SEQ_SCAN not in plan, plan
+    assert any(scan in plan for scan in INDEX_SCANS), plan
+    assert any(name in plan for name in expected_indexes), plan
+
+
+@pytest.mark.django_db
+def test_list_query_uses_index(seeded):
+    queryset = make_view("list").get_queryset().order_by("start_datetime")[:21]
+    assert_index_plan(queryset, ["event_pub_start_idx", "event_status_camp_start_idx"])
+
+
+@pytest.mark.django_db
+def test_campaign_list_query_uses_index(seeded):
+    params = {"campaign_id": str(seeded[0].id)}
+    queryset = make_view("list", params).get_queryset().order_by("start_datetime")[:21]
+    assert_index_plan(queryset, ["event_pub_campaign_start_idx", "event_status_camp_start_idx"])
+
+
+@pytest.mark.django_db
+def test_bbox_query_uses_gist_index(seeded):
+    queryset = make_view("list", {"bbox": "9.9,53.4,10.1,53.6"}).get_queryset()
+    assert_index_plan(queryset, ["event_location_gist"])
+
+
+@pytest.mark.django_db
+def test_within_query_uses_gist_index(seeded):
+    geometry = GEOSGeometry(
+        '{"type": "Polygon", "coordinates": '
+        "[[[9.9, 53.4], [10.1, 53.4], [10.1, 53.6], [9.9, 53.6], [9.9, 53.4]]]}",
+        srid=4326,
+    )
+    queryset = make_view("within")._within_queryset({"geometry": geometry})
+    assert_index_plan(queryset, ["event_location_gist"])
+
+
+@pytest.mark.django_db
+def test_active_during_query_uses_range_index(seeded):
+    start = timezone.now() + timedelta(days=30)
+    params = {"active_during": f"{start.isoformat()},{(start + timedelta(hours=4)).isoformat()}"}
+    queryset = make_view("list", params).get_queryset()
+    assert_index_plan(queryset, ["event_active_range_gist"])
+
+
+@pytest.mark.django_db
+def test_nearest_query_uses_knn_index(seeded):
+    queryset = make_view("nearest")._nearest_queryset(Point(10.0, 53.5, srid=4326), 10)
+    plan = queryset.explain()
+    assert "event_location_gist" in plan, plan
+    assert "<->" in plan, plan
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.events.models import CalendarEvent
+from tosca_api.apps.events.tiles import tile_in_range
+
+User = get_user_model()
+
+# z=10 tile containing Hamburg (10.0, 53.5); Berlin lies in 550/335.
+HAMBURG_TILE = "/api/v1/events/tiles/10/540/331.mvt"
+BERLIN_TILE = "/api/v1/events/tiles/10/550/335.mvt"
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="tileuser", password="password")
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def campaign(user):
+    return Campaign.objects.create(title="Tile Campaign", created_by=user)
+
+
+def make_event(campaign, user, title, days=1, status=CalendarEvent.Status.PUBLISHED):
+    start = timezone.now() + timedelta(days=days)
+    return CalendarEvent.objects.create(
+        campaign=campaign,
+        title=title,
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=1),
+        location=Point(10.0, 53.5, srid=4326),
+        organizer=user,
+        status=status,
+    )
+
+
+def test_tile_in_range():
+    assert tile_in_range(0, 0, 0)
+    assert tile_in_range(10, 1023, 1023)
+    assert not tile_in_range(10, 1024, 0)
+    assert not tile_in_range(-1, 0, 0)
+
+
+@pytest.mark.django_db
+def test_tile_contains_events(api_client, campaign, user):
+    make_event(campaign, user, "Tiled Event")
+
+    response = api_client.get(HAMBURG_TILE)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/vnd.mapbox-vector-tile"
+    assert b"Tiled Event" in response.content
+    assert "max-age=" in response["Cache-Control"]
+    assert response["ETag"]
+
+
+@pytest.mark.django_db
+def test_tile_outside_events_is_empty(api_client, campaign, user):
+    make_event(campaign, user, "Tiled Event")
+
+    response = api_client.get(BERLIN_TILE)
+    assert response.status_code == 200
+    assert response.content == b""
+
+
+@pytest.mark.django_db
+def test_tile_applies_list_filters(api_client, campaign, user):
+    make_event(campaign, user, "Draft Event", status=CalendarEvent.Status.DRAFT)
+    make_event(campaign, user, "Past Event", days=-2)
+    other = Campaign.objects.create(title="Other", created_by=user)
+    make_event(other, user, "Other Campaign Event")
+
+    content = api_client.get(HAMBURG_TILE, {"campaign_id": str(campaign.id)}).content
+    assert b"Draft Event" not in content
+    assert b"Past Event" not in content
+    assert b"Other Campaign Event" not in content
+
+    content = api_client.get(HAMBURG_TILE, {"include_past": "true"}).content
+    assert b"Past Event" in content
+
+
+@pytest.mark.django_db
+def test_tile_not_modified(api_client, campaign, user):
+    make_event(campaign, user, "Tiled Event")
+    etag = api_client.get(HAMBURG_TILE)["ETag"]
+
+    response = api_client.get(HAMBURG_TILE, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_tile_out_of_range(api_client):
+    assert api_client.get("/api/v1/events/tiles/2/4/0.mvt").status_code == 404
+
+
+@pytest.mark.django_db
+def test_tile_requires_authentication():
+    response = APIClient().get(HAMBURG_TILE)
+    assert response.status_code in (401, 403)
@@ -0,0 +1,127 @@
+import math
+import random
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point, Polygon
+from django.utils import timezone
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.events.models import CalendarEvent
+from tosca_api.apps.events.serializers import GeometryFilterSerializer
+from tosca_api.apps.events.within import filter_within, use_subdivision
+
+User = get_user_model()
+
+
+def jagged_polygon(vertices, center=(10.0, 53.55), radius=0.1, seed=1):
+    """Star-shaped polygon with a noisy outline, like an administrative boundary."""
+    rng = random.Random(seed)
+    ring = []
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        r = radius * (1 + 0.15 * rng.uniform(-1, 1))
+        ring.append((center[0] + r * math.cos(angle), center[1] + r * math.sin(angle)))
+    ring.append(ring[0])
+    return Polygon(ring, srid=4326)
+
+
+def as_geojson(polygon):
+    return {"type": "Polygon", "coordinates": [[list(c) for c in polygon.coords[0]]]}
+
+
+# =============================================================================
+# Validation
+# =============================================================================
+
+
+def test_vertex_limit(settings):
+    settings.EVENTS_WITHIN_MAX_VERTICES = 500
+    serializer = GeometryFilterSerializer(data={"geometry": as_geojson(jagged_polygon(1000))})
+
+    assert not serializer.is_valid()
+    assert "maximum is 500" in str(serializer.errors["geometry"])
+
+
+def test_simplify_tolerance_reduces_vertices():
+    polygon = jagged_polygon(5000)
+    serializer = GeometryFilterSerializer(
+        data={"geometry": as_geojson(polygon), "simplify_tolerance": 0.001}
+    )
+
+    assert serializer.is_valid(), serializer.errors
+    geometry = serializer.validated_data["geometry"]
+    assert geometry.num_coords < polygon.num_coords
+    assert geometry.srid == 4326
+
+
+def test_small_polygons_skip_subdivision(settings):
+    settings.EVENTS_WITHIN_SUBDIVIDE_VERTICES = 256
+    assert not use_subdivision(jagged_polygon(100))
+    assert use_subdivision(jagged_polygon(1000))
+
+
+# =============================================================================
+# Subdivided matching
+# =============================================================================
+
+
+@pytest.fixture
+def scattered_events(db):
+    user = User.objects.create_user(username="withinuser", password="password")
+    campaign = Campaign.objects.create(title="Within Campaign", created_by=user)
+    rng = random.Random(7)
+    start = timezone.now() + timedelta(days=1)
+    points = [(rng.uniform(9.85, 10.15), rng.uniform(53.4, 53.7)) for _ in range(300)]
+    # Exactly on an axis through the centre (likely internal cut line) and on
+    # an outer vertex of the square used below.
+    points += [(10.0, 53.55), (9.95, 53.5)]
+    CalendarEvent.objects.bulk_create(
+        CalendarEvent(
+            campaign=campaign,
+            title=f"Scattered {i}",
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+            location=Point(lon, lat, srid=4326),
+            organizer=user,
+            status=CalendarEvent.Status.PUBLISHED,
+        )
+        for i, (lon, lat) in enumerate(points)
+    )
+
+
+def ids(queryset):
+    return set(queryset.values_list("id", flat=True))
+
+
+@pytest.mark.django_db
+def test_subdivided_matches_within(settings, scattered_events):
+    settings.EVENTS_WITHIN_SUBDIVIDE_VERTICES = 16
+    polygon = jagged_polygon(2000)
+
+    expected = ids(CalendarEvent.objects.filter(location__within=polygon))
+    assert use_subdivision(polygon)
+    assert ids(filter_within(CalendarEvent.objects.all(), polygon)) == expected
+    assert expected
+
+
+@pytest.mark.django_db
+def test_subdivided_excludes_boundary_points(settings, scattered_events):
+    settings.EVENTS_WITHIN_SUBDIVIDE_VERTICES = 8
+    # Dense square whose outline passes through (9.95, 53.5)
+    steps = 50
+    edge = [9.95 + 0.1 * i / steps for i in range(steps)]
+    ring = (
+        [(x, 53.5) for x in edge]
+        + [(10.05, 53.5 + 0.1 * i / steps) for i in range(steps)]
+        + [(10.05 - 0.1 * i / steps, 53.6) for i in range(steps)]
+        + [(9.95, 53.6 - 0.1 * i / steps) for i in range(steps)]
+    )
+    square = Polygon(ring + [ring[0]], srid=4326)
+
+    expected = ids(CalendarEvent.objects.filter(location__within=square))
+    got = ids(filter_within(CalendarEvent.objects.all(), square))
+    assert got == expected
+    boundary = Point(9.95, 53.5, srid=4326)
+    assert not CalendarEvent.objects.filter(id__in=got, location=boundary).exists()
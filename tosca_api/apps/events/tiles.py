@@ -0,0 +1,74 @@
+"""
+Mapbox Vector Tiles for calendar events.
+
+A tile is rendered in a single query: the already filtered CalendarEvent
+queryset is used as a subquery, restricted to the tile envelope (plus the
+render buffer) so the GiST index on ``location`` applies, and encoded with
+``ST_AsMVTGeom`` / ``ST_AsMVT``. Cost depends on the events inside the tile,
+not on the total number of events.
+"""
+
+from django.conf import settings
+from django.db import connection
+
+from tosca_api.apps.core.geojson import UTCTimestamp
+
+# Half the width of the Web Mercator world in metres.
+MERCATOR_HALF_WORLD = 20037508.342789244
+
+TILE_LAYER = "events"
+
+TILE_SQL = """
+WITH bounds AS (
+    SELECT ST_TileEnvelope(%s, %s, %s) AS geom
+),
+tile AS (
+    SELECT
+        ST_AsMVTGeom(ST_Transform(e.location, 3857), bounds.geom, %s, %s, true) AS geom,
+        e.id::text AS id,
+        e.title,
+        e.campaign_id::text AS campaign,
+        e.start_utc AS start_datetime,
+        e.end_utc AS end_datetime,
+        e.status,
+        e.visibility
+    FROM ({events}) AS e, bounds
+    WHERE e.location && ST_Transform(ST_Expand(bounds.geom, %s), 4326)
+)
+SELECT ST_AsMVT(tile.*, %s, %s, 'geom') FROM tile WHERE tile.geom IS NOT NULL
+"""
+
+
+def tile_in_range(z: int, x: int, y: int) -> bool:
+    max_zoom = getattr(settings, "EVENTS_TILE_MAX_ZOOM", 22)
+    return 0 <= z <= max_zoom and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def render_event_tile(queryset, z: int, x: int, y: int) -> bytes:
+    """Return the MVT bytes for tile z/x/y over the events in ``queryset``."""
+    extent = getattr(settings, "EVENTS_TILE_EXTENT", 4096)
+    buffer = getattr(settings, "EVENTS_TILE_BUFFER", 64)
+    # Include points just outside the tile that still render inside its buffer.
+    margin = (2 * MERCATOR_HALF_WORLD / 2**z) * buffer / extent
+
+    events = queryset.order_by().values(
+        "id",
+        "title",
+        "campaign_id",
+        "status",
+        "visibility",
+        "location",
+        # Same timestamp text as the GeoJSON endpoints
+        start_utc=UTCTimestamp("start_datetime"),
+        end_utc=UTCTimestamp("end_datetime"),
+    )
+    events_sql, events_params = events.query.sql_with_params()
+
+    sql = TILE_SQL.format(events=events_sql)
+    params = [z, x, y, extent, buffer, *events_params, margin, TILE_LAYER, extent]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] is not None else b""
+
@@ -1,4 +1,5 @@
 from django.urls import include, path
+from rest_framework import permissions
 from rest_framework.routers import DefaultRouter
 
 from .views import CalendarEventViewSet
@@ -7,5 +8,16 @@ router = DefaultRouter()
 router.register(r"events", CalendarEventViewSet, basename="event")
 
 urlpatterns = [
+    path(
+        "events/tiles/<int:z>/<int:x>/<int:y>.mvt",
+        CalendarEventViewSet.as_view({"get": "tiles"}),
+        name="event-tiles",
+    ),
+    path(
+        "events/feeds/<uuid:campaign_id>.ics",
+        # Calendar clients cannot send credentials; the view serves public events only.
+        CalendarEventViewSet.as_view({"get": "ics"}, permission_classes=[permissions.AllowAny]),
+        name="event-ics-feed",
+    ),
     path("", include(router.urls)),
 ]
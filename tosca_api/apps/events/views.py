@@ -1,18 +1,55 @@
-from django.utils import timezone
+import hashlib
+import uuid
+from functools import cached_property
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.contrib.gis.db.models.functions import Distance, GeometryDistance
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.core.streaming import (
+    feature_collection_response,
+    streaming_feature_collection,
+)
+
+from .cache import bucketed_now, request_digest, upcoming_page_cache, within_result_cache
+from .clustering import cluster_events, should_cluster
+from .geojson import event_features
+from .histogram import event_histogram
+from .ics import feed_version, iter_calendar
 from .models import CalendarEvent
 from .serializers import (
+    ActiveDuringSerializer,
     BBoxSerializer,
     CalendarEventWriteSerializer,
     CalendarEventDetailSerializer,
     CalendarEventGeoSerializer,
     CalendarEventListSerializer,
+    CalendarEventNearestSerializer,
     GeometryFilterSerializer,
+    HistogramQuerySerializer,
+    NearestQuerySerializer,
 )
+from .tiles import render_event_tile, tile_in_range
+from .within import filter_within
+
+
+# Query parameters under which the list is the shared "upcoming events"
+# view whose pages are cached (events/cache.py).
+UPCOMING_CACHE_PARAMS = frozenset({"campaign_id", "cursor"})
+
+# KNN candidates fetched per requested event before ranking by meters; the
+# planar <-> order on lon/lat can differ slightly from true distance.
+NEAREST_CANDIDATE_FACTOR = 4
 
 
 class EventCursorPagination(CursorPagination):
@@ -33,20 +70,30 @@ class CalendarEventViewSet(viewsets.ModelViewSet):
     GET /api/v1/events/
     ```
     Returns all events (with or without location) as JSON.
-    By default, only future events are returned.
+    By default, only future events are returned; "now" is floored to
+    `EVENTS_UPCOMING_BUCKET_SECONDS`, and pages requested with no filter
+    other than `campaign_id` are served from a cache invalidated on event
+    changes.
 
     **Query Parameters:**
     - `campaign_id`: Filter by campaign UUID
     - `include_past`: Set to `true` to include past events (default: false)
     - `start_after`: Filter events starting after this datetime
     - `start_before`: Filter events starting before this datetime
+    - `active_during`: `start,end` (ISO 8601); events whose time span overlaps
+      the window (replaces the default upcoming-only filter)
     - `status`: Filter by status (default: published)
 
     ### Map View (bbox)
     ```
     GET /api/v1/events/?bbox=min_lon,min_lat,max_lon,max_lat
     ```
-    Returns events WITH location inside bounding box as GeoJSON FeatureCollection.
+    Returns events WITH location inside bounding box as GeoJSON FeatureCollection,
+    streamed row by row (not paginated).
+
+    Add `zoom=N` (map zoom level) to get clusters below
+    `EVENTS_CLUSTER_MAX_ZOOM`: one Point feature per grid cell with
+    `cluster`, `count` and `extent` properties.
 
     ### Map View (polygon) - POST
     ```
@@ -58,6 +105,39 @@ class CalendarEventViewSet(viewsets.ModelViewSet):
     }
     ```
     Returns events WITH location inside geometry as GeoJSON FeatureCollection.
+    Identical requests are served from a short-lived cache (events/cache.py)
+    until an event in the filtered campaign changes.
+
+    ### Nearest events
+    ```
+    GET /api/v1/events/nearest/?lon=10.0&lat=53.55&limit=10
+    ```
+    Returns the closest events with location as GeoJSON FeatureCollection,
+    each with `distance` in meters. Same filters as the list endpoint.
+
+    ### Histogram
+    ```
+    GET /api/v1/events/histogram/?bucket=day&from=2026-10-01&to=2026-11-01&tz=Europe/Berlin
+    ```
+    Returns event counts per `day`, `week` or `month` of `start_datetime` in
+    `[from, to)`, including empty buckets. Same status and campaign filters
+    as the list endpoint.
+
+    ### Calendar feed
+    ```
+    GET /api/v1/events/feeds/{campaign_id}.ics
+    ```
+    Returns the public, published events of a public campaign as iCalendar.
+    Needs no credentials, so calendar clients can subscribe to it. Carries
+    `ETag` and `Last-Modified`; polls with an unchanged `If-None-Match` get
+    304.
+
+    ### Map View (vector tiles)
+    ```
+    GET /api/v1/events/tiles/{z}/{x}/{y}.mvt
+    ```
+    Returns a Mapbox Vector Tile (layer `events`) with the same status, campaign
+    and time filters as the list endpoint.
     """
 
     queryset = CalendarEvent.objects.all()
@@ -75,17 +155,30 @@ class CalendarEventViewSet(viewsets.ModelViewSet):
             return CalendarEventDetailSerializer
         if self.action == "within":
             return CalendarEventGeoSerializer
+        if self.action == "nearest":
+            return CalendarEventNearestSerializer
         return CalendarEventWriteSerializer
 
     def _is_spatial_request(self) -> bool:
         """Check if request has bbox parameter."""
         return bool(self.request.query_params.get("bbox"))
 
+    def _map_zoom(self):
+        """Return the validated ``zoom`` query parameter, or None."""
+        serializer = BBoxSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data.get("zoom")
+
+    @cached_property
+    def upcoming_since(self):
+        """Lower start bound of the upcoming-only filter, fixed per request."""
+        return bucketed_now()
+
     def get_queryset(self):
         """
         Filter queryset based on request parameters.
 
-        - Default: Only upcoming events (start_datetime >= now)
+        - Default: Only upcoming events (start_datetime >= bucketed now)
         - Spatial requests (bbox): Only events with location
         - Status filtering
         - Campaign filtering
@@ -93,7 +186,7 @@ class CalendarEventViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
 
         # Status filter (default: published for list)
-        if self.action in ("list", "within"):
+        if self.action in ("list", "within", "tiles", "nearest", "histogram"):
             status_param = self.request.query_params.get("status", "published")
             queryset = queryset.filter(status=status_param)
 
@@ -104,8 +197,10 @@ class CalendarEventViewSet(viewsets.ModelViewSet):
 
         # Time filters
         include_past = self.request.query_params.get("include_past", "").lower() == "true"
-        if not include_past and self.action == "list":
-            queryset = queryset.filter(start_datetime__gte=timezone.now())
+        # An explicit active_during window replaces the default upcoming-only filter
+        active_during = self.request.query_params.get("active_during")
+        if not include_past and not active_during and self.action in ("list", "tiles", "nearest"):
+            queryset = queryset.filter(start_datetime__gte=self.upcoming_since)
 
         start_after = self.request.query_params.get("start_after")
         if start_after:
@@ -115,6 +210,14 @@ class CalendarEventViewSet(viewsets.ModelViewSet):
         if start_before:
             queryset = queryset.filter(start_datetime__lte=start_before)
 
+        # Events overlapping a time window (GiST on active_range)
+        if active_during:
+            window_serializer = ActiveDuringSerializer(data=self.request.query_params)
+            window_serializer.is_valid(raise_exception=True)
+            queryset = queryset.filter(
+                active_range__overlap=window_serializer.validated_data["active_during"]
+            )
+
         # Spatial filter (bbox)
         if self._is_spatial_request():
             bbox_serializer = BBoxSerializer(data=self.request.query_params)
@@ -143,21 +246,55 @@ class CalendarEventViewSet(viewsets.ModelViewSet):
 
     def list(self, request, *args, **kwargs):
         """
-        Override list to return GeoJSON FeatureCollection for spatial requests.
+        Override list to stream a GeoJSON FeatureCollection for spatial requests.
         Non-spatial requests use standard paginated response.
         """
         if self._is_spatial_request():
             queryset = self.filter_queryset(self.get_queryset())
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
-        return super().list(request, *args, **kwargs)
+            zoom = self._map_zoom()
+            if should_cluster(zoom):
+                return streaming_feature_collection(cluster_events(queryset, zoom))
+            return self._map_response(queryset)
+
+        cache_key, campaign_id = self._upcoming_cache_key()
+        if cache_key is None:
+            return super().list(request, *args, **kwargs)
+        data = upcoming_page_cache.get(cache_key)
+        if data is None:
+            generation = upcoming_page_cache.generation
+            data = super().list(request, *args, **kwargs).data
+            # Plain containers: ReturnList would keep the serializer alive
+            data = {**data, "results": list(data["results"])}
+            upcoming_page_cache.set(cache_key, campaign_id, data, generation)
+        return Response(data)
+
+    def _upcoming_cache_key(self):
+        """
+        Return ``(key, campaign_id)`` when this list request is the default
+        upcoming-events view of one or all campaigns, else ``(None, None)``.
+
+        The key holds the absolute URL (pagination links embed it) and the
+        bucketed "now", so entries roll over with the bucket.
+        """
+        params = self.request.query_params
+        if getattr(settings, "EVENTS_UPCOMING_BUCKET_SECONDS", 60) <= 0:
+            return None, None
+        if not set(params) <= UPCOMING_CACHE_PARAMS:
+            return None, None
+        campaign_id = params.get("campaign_id")
+        if campaign_id:
+            try:
+                campaign_id = uuid.UUID(campaign_id)
+            except ValueError:
+                return None, None
+        return (self.request.build_absolute_uri(), self.upcoming_since), campaign_id
 
     @action(detail=False, methods=["post"], url_path="within")
     def within(self, request):
         """
         Filter events within a given geometry (Polygon/MultiPolygon).
 
-        Returns GeoJSON FeatureCollection of events with location inside the geometry.
+        Streams a GeoJSON FeatureCollection of events with location inside the geometry.
 
         Request body:
         {
@@ -166,28 +303,169 @@ class CalendarEventViewSet(viewsets.ModelViewSet):
             "include_past": false,
             "start_after": "datetime (optional)",
             "start_before": "datetime (optional)",
+            "active_during": "start,end (optional)",
+            "simplify_tolerance": "degrees (optional, approximate results)",
             "status": "published"
         }
         """
+        # Repeated polygons skip parsing and the spatial query entirely. The
+        # upcoming-only filter depends on "now", so the key carries its bucket.
+        cache_key = (request_digest(request.data), self.upcoming_since)
+        body = within_result_cache.get(cache_key)
+        if body is not None:
+            return StreamingHttpResponse((body,), content_type="application/json")
+
         # Validate input
         filter_serializer = GeometryFilterSerializer(data=request.data)
         filter_serializer.is_valid(raise_exception=True)
         data = filter_serializer.validated_data
 
-        # Build queryset
+        queryset = self._within_queryset(data)
+
+        # Stream as GeoJSON, keeping the rendered body for the next identical request
+        response = self._map_response(queryset)
+        response.streaming_content = within_result_cache.tee(
+            cache_key, data.get("campaign_id"), response.streaming_content
+        )
+        return response
+
+    @action(detail=False, methods=["get"], url_path="nearest")
+    def nearest(self, request):
+        """
+        Return the ``limit`` events closest to ``lon``/``lat`` as GeoJSON.
+
+        Candidates come from the GiST index via the ``<->`` KNN operator
+        (planar distance in degrees); they are then ranked by spherical
+        distance, returned in meters as the ``distance`` property. Status,
+        campaign and time filters match the list endpoint.
+        """
+        query_serializer = NearestQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        queryset = self._nearest_queryset(
+            query_serializer.validated_data["point"],
+            query_serializer.validated_data["limit"],
+        )
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["get"], url_path="histogram")
+    def histogram(self, request):
+        """
+        Count events per day/week/month for calendar widgets.
+
+        Computed in one query (events/histogram.py); bucket boundaries are
+        local midnights in ``tz``.
+        """
+        query_serializer = HistogramQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        params = query_serializer.validated_data
+        queryset = self.get_queryset().filter(
+            start_datetime__gte=params["from"], start_datetime__lt=params["to"]
+        )
+        tz = ZoneInfo(params["tz"])
+        rows = event_histogram(
+            queryset, params["bucket"], params["tz"], params["from"], params["to"]
+        )
+        return Response(
+            {
+                "bucket": params["bucket"],
+                "tz": params["tz"],
+                "from": params["from"].isoformat(),
+                "to": params["to"].isoformat(),
+                "results": [
+                    {"start": start.astimezone(tz).isoformat(), "count": count}
+                    for start, count in rows
+                ],
+            }
+        )
+
+    def _nearest_queryset(self, point, limit):
+        """KNN candidates from the filtered queryset, ranked by distance in meters."""
+        candidates = (
+            self.get_queryset()
+            .filter(location__isnull=False)
+            .order_by(GeometryDistance("location", point))
+            .values("pk")[: limit * NEAREST_CANDIDATE_FACTOR]
+        )
+        return (
+            CalendarEvent.objects.filter(pk__in=candidates)
+            .annotate(distance=Distance("location", point))
+            .order_by("distance")[:limit]
+        )
+
+    def tiles(self, request, z, x, y):
+        """
+        Render events in tile z/x/y as a Mapbox Vector Tile.
+
+        Routed explicitly in urls.py as /events/tiles/{z}/{x}/{y}.mvt. Tiles
+        carry Cache-Control and an ETag; a matching If-None-Match gets 304.
+        """
+        if not tile_in_range(z, x, y):
+            raise NotFound("Tile coordinates out of range.")
+
+        tile = render_event_tile(self.get_queryset(), z, x, y)
+        etag = quote_etag(hashlib.md5(tile, usedforsecurity=False).hexdigest())
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(tile, content_type="application/vnd.mapbox-vector-tile")
+        response["ETag"] = etag
+        # Tiles depend on the caller's credentials, so only private caches may keep them.
+        patch_cache_control(
+            response, private=True, max_age=getattr(settings, "EVENTS_TILE_MAX_AGE", 60)
+        )
+        patch_vary_headers(response, ["Authorization"])
+        return response
+
+    def ics(self, request, campaign_id):
+        """
+        Stream the public, published events of a public campaign as iCalendar.
+
+        Routed explicitly in urls.py as /events/feeds/{campaign_id}.ics with
+        AllowAny, since calendar clients subscribing to the feed cannot send
+        credentials; private campaigns answer 404 and private events are left
+        out. Validators are computed with one aggregate query (events/ics.py),
+        so polls of an unchanged feed get 304 without reading any event rows.
+        """
+        campaign = get_object_or_404(
+            Campaign, pk=campaign_id, visibility=Campaign.Visibility.PUBLIC
+        )
+        queryset = CalendarEvent.objects.filter(
+            campaign=campaign,
+            status=CalendarEvent.Status.PUBLISHED,
+            visibility=CalendarEvent.Visibility.PUBLIC,
+        )
+        version, last_modified = feed_version(queryset, campaign)
+        etag = quote_etag(version)
+        # Only the ETag covers removed events; If-Modified-Since alone gets a full feed.
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = StreamingHttpResponse(
+                iter_calendar(queryset, campaign), content_type="text/calendar; charset=utf-8"
+            )
+            response["Content-Disposition"] = f'inline; filename="{campaign.pk}.ics"'
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+        # The feed is the same for every caller, so shared caches may keep it.
+        patch_cache_control(
+            response, public=True, max_age=getattr(settings, "EVENTS_ICS_MAX_AGE", 300)
+        )
+        return response
+
+    def _within_queryset(self, data):
+        """Build the /within/ queryset from validated GeometryFilterSerializer data."""
         queryset = CalendarEvent.objects.filter(
-            location__isnull=False,
-            location__within=data["geometry"],
             status=data.get("status", CalendarEvent.Status.PUBLISHED),
         )
+        # Large polygons are matched piecewise (see events/within.py)
+        queryset = filter_within(queryset, data["geometry"])
 
         # Campaign filter
         if data.get("campaign_id"):
             queryset = queryset.filter(campaign_id=data["campaign_id"])
 
         # Time filters
-        if not data.get("include_past", False):
-            queryset = queryset.filter(start_datetime__gte=timezone.now())
+        if not data.get("include_past", False) and not data.get("active_during"):
+            queryset = queryset.filter(start_datetime__gte=self.upcoming_since)
 
         if data.get("start_after"):
             queryset = queryset.filter(start_datetime__gte=data["start_after"])
@@ -195,9 +473,22 @@ class CalendarEventViewSet(viewsets.ModelViewSet):
         if data.get("start_before"):
             queryset = queryset.filter(start_datetime__lte=data["start_before"])
 
+        if data.get("active_during"):
+            queryset = queryset.filter(active_range__overlap=data["active_during"])
+
         # Order by start_datetime
-        queryset = queryset.order_by("start_datetime").select_related("campaign")
+        return queryset.order_by("start_datetime").select_related("campaign")
 
-        # Serialize as GeoJSON
-        serializer = CalendarEventGeoSerializer(queryset, many=True)
-        return Response(serializer.data)
+    def _map_response(self, queryset):
+        """
+        Stream events as a GeoJSON FeatureCollection.
+
+        Features are built in PostGIS (events/geojson.py) unless
+        EVENTS_DB_GEOJSON is disabled, in which case CalendarEventGeoSerializer
+        is used.
+        """
+        if getattr(settings, "EVENTS_DB_GEOJSON", True):
+            return streaming_feature_collection(event_features(queryset))
+        return feature_collection_response(
+            queryset, CalendarEventGeoSerializer, self.get_serializer_context()
+        )
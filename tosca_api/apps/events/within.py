@@ -0,0 +1,57 @@
+"""
+Point-in-polygon matching for large /events/within/ geometries.
+
+``location__within`` against a polygon with tens of thousands of vertices is
+CPU-bound: the polygon's bounding box selects most candidate rows and each
+one is tested against every edge. For polygons above
+``EVENTS_WITHIN_SUBDIVIDE_VERTICES`` the polygon is split with
+``ST_Subdivide`` into pieces of at most that many vertices, so the GiST
+index on ``location`` filters against small, tight boxes.
+
+A point is inside a polygon's interior iff it intersects one of the pieces
+and does not lie on the polygon's boundary, which is excluded via a
+subdivided ``ST_Boundary``. The matched set is therefore identical to
+``location__within``.
+"""
+
+from django.conf import settings
+from django.db.models.expressions import RawSQL
+
+SUBDIVIDED_WITHIN_SQL = """
+WITH parts AS MATERIALIZED (
+    SELECT ST_Subdivide(%s::geometry, %s) AS geom
+),
+edges AS MATERIALIZED (
+    SELECT ST_Subdivide(ST_Boundary(%s::geometry), %s) AS geom
+)
+SELECT e.id
+FROM events_calendarevent AS e
+JOIN parts ON ST_Intersects(e.location, parts.geom)
+WHERE NOT EXISTS (
+    SELECT 1 FROM edges WHERE ST_Intersects(e.location, edges.geom)
+)
+"""
+
+
+def subdivide_threshold() -> int:
+    return getattr(settings, "EVENTS_WITHIN_SUBDIVIDE_VERTICES", 256)
+
+
+def use_subdivision(geometry) -> bool:
+    """True if ``geometry`` is large enough to benefit from ST_Subdivide."""
+    return geometry.num_coords > subdivide_threshold()
+
+
+def subdivided_within_ids(geometry) -> RawSQL:
+    """Subquery of event ids whose location lies within ``geometry``."""
+    ewkb = geometry.hexewkb.decode()
+    max_vertices = subdivide_threshold()
+    return RawSQL(SUBDIVIDED_WITHIN_SQL, (ewkb, max_vertices, ewkb, max_vertices))
+
+
+def filter_within(queryset, geometry):
+    """Restrict ``queryset`` to events located within ``geometry``."""
+    queryset = queryset.filter(location__isnull=False)
+    if use_subdivision(geometry):
+        return queryset.filter(id__in=subdivided_within_ids(geometry))
+    return queryset.filter(location__within=geometry)
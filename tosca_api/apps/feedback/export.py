@@ -0,0 +1,156 @@
+"""
+Streaming exports of a GeoFeedback's submissions as CSV, GeoJSON or NDJSON.
+
+Rows are read with ``.values().iterator()`` (a server-side cursor on
+PostgreSQL), so no model instances are built and memory does not grow with
+the number of submissions. Geometries are encoded by PostGIS (WKT for CSV,
+GeoJSON text otherwise) and passed through as text.
+
+Top-level ``form_data`` keys become ``form.<key>`` columns / properties. CSV
+needs every column up front, so its header comes from one extra query over
+the distinct keys; nested values are written as JSON. Text cells starting
+with a spreadsheet formula character are prefixed with ``'``, since the
+answers are citizen input.
+"""
+
+import csv
+from collections.abc import Iterator
+
+from django.contrib.gis.db.models.functions import AsGeoJSON, AsWKT
+from django.db import connection
+from rest_framework.utils.encoders import JSONEncoder
+
+from tosca_api.apps.core.streaming import STREAM_CHUNK_SIZE
+
+# format -> (content type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "geojson": ("application/geo+json", "geojson"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+EXPORT_COLUMNS = ["id", "created_at", "submitted_by", "rating", "is_anonymized"]
+FORM_PREFIX = "form."
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+FORM_KEYS_SQL = """
+SELECT DISTINCT jsonb_object_keys(s.form_data)
+FROM ({submissions}) AS s
+WHERE jsonb_typeof(s.form_data) = 'object'
+ORDER BY 1
+"""
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _rows(queryset, geometry_function, chunk_size: int) -> Iterator[dict]:
+    return (
+        queryset.order_by("created_at", "id")
+        .annotate(geometry_text=geometry_function("geometry"))
+        .values(
+            "id",
+            "created_at",
+            "submitted_by_id",
+            "rating",
+            "is_anonymized",
+            "form_data",
+            "geometry_text",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _properties(row: dict) -> dict:
+    properties = {
+        "id": row["id"],
+        "created_at": row["created_at"],
+        # PII has been stripped from anonymized submissions
+        "submitted_by": None if row["is_anonymized"] else row["submitted_by_id"],
+        "rating": row["rating"],
+        "is_anonymized": row["is_anonymized"],
+    }
+    if isinstance(row["form_data"], dict):
+        for key, value in row["form_data"].items():
+            properties[FORM_PREFIX + key] = value
+    return properties
+
+
+def form_keys(queryset) -> list[str]:
+    """Distinct top-level ``form_data`` keys of ``queryset``, sorted."""
+    submissions = queryset.order_by().values("form_data")
+    submissions_sql, submissions_params = submissions.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(FORM_KEYS_SQL.format(submissions=submissions_sql), submissions_params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+class _Echo:
+    """File-like object handing back what csv.writer writes."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, dict | list):
+        value = _encoder.encode(value)
+    elif isinstance(value, bool):
+        return "true" if value else "false"
+    elif not isinstance(value, str):
+        return value
+    if value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(queryset, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """Yield the submissions of ``queryset`` as CSV, ``chunk_size`` rows per fragment."""
+    columns = [*EXPORT_COLUMNS, "geometry", *(FORM_PREFIX + key for key in form_keys(queryset))]
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+
+    buffer = []
+    for count, row in enumerate(_rows(queryset, AsWKT, chunk_size), 1):
+        properties = _properties(row)
+        # Same timestamp format as the JSON exports
+        properties["created_at"] = _encoder.default(row["created_at"])
+        properties["geometry"] = row["geometry_text"]
+        buffer.append(writer.writerow([_csv_cell(properties.get(column)) for column in columns]))
+        if count % chunk_size == 0:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_ndjson(queryset, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """Yield one JSON object per line; ``geometry`` is a GeoJSON geometry or null."""
+    buffer = []
+    for count, row in enumerate(_rows(queryset, AsGeoJSON, chunk_size), 1):
+        properties = _encoder.encode(_properties(row))
+        geometry = row["geometry_text"] or "null"
+        # Splice the PostGIS GeoJSON text into the encoded object
+        buffer.append(f'{properties[:-1]},"geometry":{geometry}}}\n')
+        if count % chunk_size == 0:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def geojson_features(queryset, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """Yield GeoJSON Feature text per submission, for core.streaming."""
+    for row in _rows(queryset, AsGeoJSON, chunk_size):
+        properties = _properties(row)
+        feature_id = _encoder.encode(properties["id"])
+        geometry = row["geometry_text"] or "null"
+        yield (
+            f'{{"type":"Feature","id":{feature_id},"geometry":{geometry},'
+            f'"properties":{_encoder.encode(properties)}}}'
+        )
+
+
+def export_filename(feedback, export_format: str) -> str:
+    return f"feedback-{feedback.pk}-submissions.{EXPORT_FORMATS[export_format][1]}"
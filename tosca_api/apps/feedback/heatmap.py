@@ -0,0 +1,154 @@
+"""
+Hexagon / square grid heatmaps of feedback drawings.
+
+Submissions are binned by the centroid of their geometry into the cells of
+the ``ST_HexagonGrid`` / ``ST_SquareGrid`` tiling of Web Mercator (EPSG:3857)
+with the requested cell size, and every cell gets the number of submissions
+and their mean rating. Everything happens in one PostGIS query:
+
+- only submissions whose geometry overlaps the requested bounds, expanded by
+  one cell diameter, are read (GiST index on ``geometry``), so cells on the
+  edge still count all of their submissions and tiles agree with each other;
+- each centroid finds its own cell by calling the grid function on the point
+  itself, which is linear in the number of submissions instead of joining
+  every submission against every cell of the bounds;
+- occupied cells are grouped by their grid index and rebuilt with
+  ``ST_Hexagon`` / ``ST_Square``, then returned as GeoJSON feature text or
+  encoded as one Mapbox Vector Tile.
+
+Cell sizes are in Web Mercator units (metres at the equator; a cell at
+latitude 53° covers about 0.6 of that on the ground).
+"""
+
+import math
+
+from django.db import connection
+
+from tosca_api.apps.events.tiles import MERCATOR_HALF_WORLD
+
+# shape -> (grid function, single cell function)
+HEATMAP_SHAPES = {
+    "hexagon": ("ST_HexagonGrid", "ST_Hexagon"),
+    "square": ("ST_SquareGrid", "ST_Square"),
+}
+
+# Latitude where Web Mercator ends (the world is square)
+MERCATOR_MAX_LATITUDE = 85.0511287798066
+
+HEATMAP_GEOJSON_PRECISION = 6
+HEATMAP_TILE_LAYER = "heatmap"
+HEATMAP_TILE_EXTENT = 4096
+HEATMAP_TILE_BUFFER = 64
+
+HEATMAP_CELLS_SQL = """
+WITH bounds AS (
+    SELECT ST_MakeEnvelope(%s, %s, %s, %s, 3857) AS geom
+),
+points AS (
+    SELECT ST_Transform(ST_Centroid(s.geometry), 3857) AS geom, s.rating
+    FROM ({submissions}) AS s, bounds
+    WHERE s.geometry && ST_Transform(ST_Expand(bounds.geom, %s), 4326)
+),
+cells AS (
+    SELECT cell.i, cell.j, count(*) AS count, avg(points.rating) AS mean_rating
+    FROM points
+    CROSS JOIN LATERAL (
+        SELECT grid.i, grid.j
+        FROM {grid}(%s, points.geom) AS grid
+        WHERE ST_Intersects(grid.geom, points.geom)
+        ORDER BY grid.i, grid.j
+        LIMIT 1
+    ) AS cell
+    GROUP BY cell.i, cell.j
+),
+shapes AS (
+    SELECT shape.geom, cells.count, round(cells.mean_rating, 2)::float8 AS mean_rating
+    FROM cells
+    CROSS JOIN LATERAL (SELECT ST_SetSRID({cell}(%s, cells.i, cells.j), 3857) AS geom) AS shape
+    JOIN bounds ON shape.geom && bounds.geom
+)
+"""
+
+HEATMAP_GEOJSON_SQL = """
+SELECT json_build_object(
+    'type', 'Feature',
+    'geometry', ST_AsGeoJSON(ST_Transform(shapes.geom, 4326), %s)::json,
+    'properties', json_build_object('count', shapes.count, 'mean_rating', shapes.mean_rating)
+)::text
+FROM shapes
+"""
+
+HEATMAP_TILE_SQL = """
+SELECT ST_AsMVT(tile.*, %s, %s, 'geom')
+FROM (
+    SELECT
+        ST_AsMVTGeom(shapes.geom, bounds.geom, %s, %s, true) AS geom,
+        shapes.count,
+        shapes.mean_rating
+    FROM shapes, bounds
+) AS tile
+WHERE tile.geom IS NOT NULL
+"""
+
+
+def mercator_bounds(min_lon, min_lat, max_lon, max_lat) -> tuple[float, ...]:
+    """Project a WGS84 bbox to Web Mercator ``(xmin, ymin, xmax, ymax)``."""
+
+    def x(lon):
+        return MERCATOR_HALF_WORLD * lon / 180
+
+    def y(lat):
+        return MERCATOR_HALF_WORLD / math.pi * math.asinh(math.tan(math.radians(lat)))
+
+    return x(min_lon), y(min_lat), x(max_lon), y(max_lat)
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, ...]:
+    """Web Mercator bounds of tile z/x/y (same as ``ST_TileEnvelope``)."""
+    size = 2 * MERCATOR_HALF_WORLD / 2**z
+    xmin = -MERCATOR_HALF_WORLD + x * size
+    ymax = MERCATOR_HALF_WORLD - y * size
+    return xmin, ymax - size, xmin + size, ymax
+
+
+def estimated_cells(bounds, shape: str, cell_size: float) -> int:
+    """Approximate number of grid cells covering ``bounds``."""
+    xmin, ymin, xmax, ymax = bounds
+    if shape == "hexagon":
+        # Hexagons with edge length ``cell_size`` tile 1.5 by sqrt(3) edges.
+        cell_area = 1.5 * math.sqrt(3) * cell_size**2
+    else:
+        cell_area = cell_size**2
+    return math.ceil((xmax - xmin) * (ymax - ymin) / cell_area)
+
+
+def _cells_query(queryset, bounds, shape: str, cell_size: float):
+    grid, cell = HEATMAP_SHAPES[shape]
+    submissions = queryset.order_by().filter(geometry__isnull=False).values("geometry", "rating")
+    submissions_sql, submissions_params = submissions.query.sql_with_params()
+
+    sql = HEATMAP_CELLS_SQL.format(submissions=submissions_sql, grid=grid, cell=cell)
+    # A centroid can lie up to one cell diameter outside the bounds.
+    params = [*bounds, *submissions_params, 2 * cell_size, cell_size, cell_size]
+    return sql, params
+
+
+def heatmap_features(queryset, bounds, shape: str, cell_size: float) -> list[str]:
+    """
+    Return GeoJSON Feature text for each occupied cell intersecting
+    ``bounds`` (Web Mercator), over the submissions in ``queryset``.
+    """
+    sql, params = _cells_query(queryset, bounds, shape, cell_size)
+    with connection.cursor() as cursor:
+        cursor.execute(sql + HEATMAP_GEOJSON_SQL, [*params, HEATMAP_GEOJSON_PRECISION])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def render_heatmap_tile(queryset, z: int, x: int, y: int, shape: str, cell_size: float) -> bytes:
+    """Return the MVT bytes of the heatmap cells in tile z/x/y."""
+    sql, params = _cells_query(queryset, tile_bounds(z, x, y), shape, cell_size)
+    params += [HEATMAP_TILE_LAYER, HEATMAP_TILE_EXTENT, HEATMAP_TILE_EXTENT, HEATMAP_TILE_BUFFER]
+    with connection.cursor() as cursor:
+        cursor.execute(sql + HEATMAP_TILE_SQL, params)
+        row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] is not None else b""
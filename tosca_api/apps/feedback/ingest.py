@@ -0,0 +1,130 @@
+"""
+Fast path for citizen submissions (POST /feedback/{id}/submit/).
+
+The original action validated each submission three times: the serializer
+built a throwaway FeedbackSubmission and ran ``clean()``, the view called
+``full_clean()`` and ``save()`` called it again, with a query per foreign
+key each time. It also loaded the parent through the full viewset queryset.
+
+Here the parent is loaded with only its configuration columns,
+FeedbackSubmissionIngestSerializer validates the body once against that
+configuration (covering everything ``FeedbackSubmission.clean()`` checks),
+and the row is written with a single INSERT, together with the upsert of
+the feedback's rating summary (ratings.py) in one transaction.
+
+``ingest_batch`` applies the same steps to offline batches spanning several
+feedbacks: one query for all parents, one serializer for all items, one
+``bulk_create`` with ``ON CONFLICT DO NOTHING`` on the (feedback,
+idempotency_key) unique index, so replayed items are cheap no-ops.
+"""
+
+import uuid
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+
+from .models import FeedbackSubmission
+from .ratings import apply_rating_changes
+
+# GeoFeedback columns needed to validate a submission
+SUBMISSION_CONFIG_FIELDS = ("id", "rating_enabled", "form_enabled", "allow_drawings")
+
+
+def submission_target(queryset, pk):
+    """Return the GeoFeedback ``pk`` from ``queryset`` with only its configuration loaded."""
+    return get_object_or_404(queryset.only(*SUBMISSION_CONFIG_FIELDS), pk=pk)
+
+
+def insert_submission(feedback, user, data) -> FeedbackSubmission:
+    """
+    Insert a submission from validated FeedbackSubmissionIngestSerializer data.
+
+    ``bulk_create`` issues one INSERT and skips ``save()``'s ``full_clean()``,
+    which the serializer has already covered, and its rating counting, so
+    the rating summary is updated here.
+    """
+    submission = build_submission(feedback, user, data)
+    with transaction.atomic():
+        FeedbackSubmission.objects.bulk_create([submission])
+        apply_rating_changes([(feedback.pk, submission.rating, 1)])
+    return submission
+
+
+def build_submission(feedback, user, data) -> FeedbackSubmission:
+    return FeedbackSubmission(
+        feedback=feedback,
+        submitted_by=user,
+        rating=data.get("rating"),
+        form_data=data.get("form_data"),
+        geometry=data.get("geometry"),
+        is_anonymized=data.get("is_anonymized", False),
+        idempotency_key=data.get("idempotency_key"),
+    )
+
+
+def _feedback_id(item):
+    try:
+        return uuid.UUID(str(item["feedback"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def ingest_batch(queryset, items, user, serializer) -> list[dict]:
+    """
+    Validate and insert ``items``, returning one result per item in order.
+
+    ``serializer`` is an unbound FeedbackSubmissionBulkItemSerializer reused
+    for every item. Each result has ``status`` ``created``, ``duplicate``
+    (key already stored for that feedback; ``id`` is the stored row) or
+    ``invalid`` (with ``errors``). Invalid items do not block the rest.
+    """
+    feedback_ids = {_feedback_id(item) for item in items} - {None}
+    feedbacks = queryset.only(*SUBMISSION_CONFIG_FIELDS).in_bulk(feedback_ids)
+
+    results = []
+    pending = []
+    for item in items:
+        key = item.get("idempotency_key") if isinstance(item, dict) else None
+        feedback = feedbacks.get(_feedback_id(item))
+        if feedback is None:
+            errors = {"feedback": ["Not found."]}
+            results.append({"idempotency_key": key, "status": "invalid", "errors": errors})
+            continue
+        serializer.context["feedback"] = feedback
+        try:
+            data = serializer.run_validation(item)
+        except ValidationError as exc:
+            results.append({"idempotency_key": key, "status": "invalid", "errors": exc.detail})
+            continue
+        result = {"idempotency_key": data["idempotency_key"]}
+        results.append(result)
+        pending.append((result, build_submission(feedback, user, data)))
+
+    if pending:
+        with transaction.atomic():
+            _insert_pending(pending)
+    return results
+
+
+def _insert_pending(pending) -> None:
+    """Insert validated submissions and fill in each result's ``id`` and ``status``."""
+    submissions = [submission for _, submission in pending]
+    FeedbackSubmission.objects.bulk_create(submissions, ignore_conflicts=True)
+    # Rows that lost the conflict keep the id of the earlier submission.
+    stored = {
+        (feedback_id, key): pk
+        for feedback_id, key, pk in FeedbackSubmission.objects.filter(
+            feedback_id__in={s.feedback_id for s in submissions},
+            idempotency_key__in={s.idempotency_key for s in submissions},
+        ).values_list("feedback_id", "idempotency_key", "id")
+    }
+    created = []
+    for result, submission in pending:
+        pk = stored[(submission.feedback_id, submission.idempotency_key)]
+        result["id"] = pk
+        result["status"] = "created" if pk == submission.pk else "duplicate"
+        if pk == submission.pk:
+            created.append((submission.feedback_id, submission.rating, 1))
+    # Duplicates were counted when first stored.
+    apply_rating_changes(created)
@@ -0,0 +1,165 @@
+"""
+Load benchmark: direct vs buffered (write-behind) feedback submissions.
+
+Concurrent clients (threads, one database connection each) submit N
+rating + form + point submissions to one published GeoFeedback:
+
+- direct: lookup, validation, INSERT and rating summary upsert per request
+  (ingest.insert_submission), all contending on the same summary row
+- buffered: lookup, validation and a staging INSERT per request
+  (submission_queue.enqueue_submission) while one worker thread drains the
+  queue in batches (submission_queue.drain_submission_queue)
+
+Reports accepted submissions/sec for each mode and, for buffered mode, the
+sustained rate until every submission is stored. Unlike the other
+benchmarks the data must be committed to be visible to all threads; it is
+deleted at the end, together with the user created for the run.
+
+Usage:
+    python manage.py bench_feedback_queue --submissions 5000 --clients 16
+"""
+
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from formbuilder.models import CustomForm
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.feedback.ingest import insert_submission, submission_target
+from tosca_api.apps.feedback.models import FeedbackSubmission, GeoFeedback
+from tosca_api.apps.feedback.serializers import FeedbackSubmissionIngestSerializer
+from tosca_api.apps.feedback.submission_queue import drain_submission_queue, enqueue_submission
+
+PUBLIC_FEEDBACK = {
+    "status": GeoFeedback.Status.PUBLISHED,
+    "visibility": GeoFeedback.Visibility.PUBLIC,
+}
+
+
+class Command(BaseCommand):
+    help = "Compare submissions/sec of direct and buffered feedback submission under load."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--submissions", type=int, default=5000)
+        parser.add_argument("--clients", type=int, default=16)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        feedback = self._seed()
+        try:
+            rng = random.Random(25)
+            payloads = [
+                {
+                    "rating": rng.randint(1, 5),
+                    "form_data": {"comment": f"Submission {i}", "age_group": rng.choice("abc")},
+                    "geometry": {
+                        "type": "Point",
+                        "coordinates": [rng.uniform(9.7, 10.3), rng.uniform(53.4, 53.7)],
+                    },
+                }
+                for i in range(options["submissions"])
+            ]
+            clients = options["clients"]
+
+            elapsed = self._load(
+                lambda data: self._submit(feedback.pk, data, insert_submission), payloads, clients
+            )
+            self._report("direct", len(payloads), elapsed)
+
+            accepted, sustained = self._load_buffered(
+                feedback.pk, payloads, clients, options["batch_size"]
+            )
+            self._report("buffered", len(payloads), accepted)
+            self._report("  stored", len(payloads), sustained)
+
+            stored = FeedbackSubmission.objects.filter(feedback=feedback).count()
+            self.stdout.write(f"stored {stored} of {2 * len(payloads)} submissions")
+        finally:
+            self._cleanup(feedback)
+
+    def _seed(self):
+        # A fresh user, so cleanup never deletes an existing account
+        user = get_user_model().objects.create_user(
+            username=f"bench-feedback-queue-{uuid.uuid4().hex[:12]}"
+        )
+        campaign = Campaign.objects.create(title="Queue benchmark", created_by=user)
+        form = CustomForm.objects.create(
+            name="Queue benchmark",
+            slug=f"bench-feedback-queue-{campaign.pk}",
+            status=CustomForm.FormStatus.PUBLISHED,
+        )
+        return GeoFeedback.objects.create(
+            campaign=campaign,
+            title="Queue benchmark",
+            rating_enabled=True,
+            form_enabled=True,
+            custom_form=form,
+            allow_drawings=True,
+            created_by=user,
+            **PUBLIC_FEEDBACK,
+        )
+
+    def _cleanup(self, feedback):
+        # Submissions, queued rows and the summary cascade with the feedback.
+        form, campaign, user = feedback.custom_form, feedback.campaign, feedback.created_by
+        feedback.delete()
+        form.delete()
+        campaign.delete()
+        user.delete()
+
+    def _submit(self, pk, data, write):
+        feedback = submission_target(GeoFeedback.objects.filter(**PUBLIC_FEEDBACK), pk)
+        serializer = FeedbackSubmissionIngestSerializer(data=data, context={"feedback": feedback})
+        serializer.is_valid(raise_exception=True)
+        return write(feedback, None, serializer.validated_data)
+
+    def _load(self, submit, payloads, clients) -> float:
+        """Submit ``payloads`` from ``clients`` threads; returns the elapsed seconds."""
+
+        def client(chunk):
+            try:
+                for data in chunk:
+                    submit(data)
+            finally:
+                connection.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            list(pool.map(client, [payloads[i::clients] for i in range(clients)]))
+        return time.perf_counter() - start
+
+    def _load_buffered(self, pk, payloads, clients, batch_size) -> tuple[float, float]:
+        """Return seconds until all submissions were accepted and until all were stored."""
+        accepted = threading.Event()
+
+        def worker():
+            try:
+                while True:
+                    finished = accepted.is_set()
+                    if not drain_submission_queue(batch_size):
+                        if finished:
+                            return
+                        time.sleep(0.01)
+            finally:
+                connection.close()
+
+        start = time.perf_counter()
+        drainer = threading.Thread(target=worker)
+        drainer.start()
+        accept_time = self._load(
+            lambda data: self._submit(pk, data, enqueue_submission), payloads, clients
+        )
+        accepted.set()
+        drainer.join()
+        return accept_time, time.perf_counter() - start
+
+    def _report(self, label, count, elapsed):
+        self.stdout.write(
+            f"{label:<10} {count / elapsed:>10.0f} submissions/s {elapsed:>8.2f}s total"
+        )
@@ -0,0 +1,115 @@
+"""
+Benchmark: feedback submission throughput, original path vs ingest fast path.
+
+Creates a published GeoFeedback inside one transaction and submits N
+rating + form + point submissions through each path, reporting
+submissions/sec and queries per submission; everything is rolled back.
+
+- original: full viewset queryset lookup, FeedbackSubmissionSerializer
+  (throwaway instance + clean()), full_clean() and save() (full_clean again)
+- ingest: feedback/ingest.py, configuration-only lookup, one validation
+  pass, one INSERT (plus the rating summary upsert both paths share)
+
+Usage:
+    python manage.py bench_feedback_submit --submissions 2000
+"""
+
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from formbuilder.models import CustomForm
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.feedback.ingest import insert_submission, submission_target
+from tosca_api.apps.feedback.models import FeedbackSubmission, GeoFeedback
+from tosca_api.apps.feedback.serializers import (
+    FeedbackSubmissionIngestSerializer,
+    FeedbackSubmissionSerializer,
+)
+
+PUBLIC_FEEDBACK = {
+    "status": GeoFeedback.Status.PUBLISHED,
+    "visibility": GeoFeedback.Visibility.PUBLIC,
+}
+
+
+class Command(BaseCommand):
+    help = "Compare submissions/sec of the original and the fast feedback submit path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--submissions", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            feedback = self._seed()
+            rng = random.Random(20)
+            payloads = [
+                {
+                    "rating": rng.randint(1, 5),
+                    "form_data": {"comment": f"Submission {i}", "age_group": rng.choice("abc")},
+                    "geometry": {
+                        "type": "Point",
+                        "coordinates": [rng.uniform(9.7, 10.3), rng.uniform(53.4, 53.7)],
+                    },
+                }
+                for i in range(options["submissions"])
+            ]
+            self._measure("original", lambda data: self._original(feedback.pk, data), payloads)
+            self._measure("ingest", lambda data: self._ingest(feedback.pk, data), payloads)
+            transaction.set_rollback(True)
+
+    def _seed(self):
+        user = get_user_model().objects.create_user(username="bench-feedback-submit")
+        campaign = Campaign.objects.create(title="Submit benchmark", created_by=user)
+        form = CustomForm.objects.create(
+            name="Submit benchmark",
+            slug="bench-feedback-submit",
+            status=CustomForm.FormStatus.PUBLISHED,
+        )
+        return GeoFeedback.objects.create(
+            campaign=campaign,
+            title="Submit benchmark",
+            rating_enabled=True,
+            form_enabled=True,
+            custom_form=form,
+            allow_drawings=True,
+            created_by=user,
+            **PUBLIC_FEEDBACK,
+        )
+
+    def _original(self, pk, data):
+        feedback = GeoFeedback.objects.filter(**PUBLIC_FEEDBACK).get(pk=pk)
+        serializer = FeedbackSubmissionSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        validated = serializer.validated_data
+        submission = FeedbackSubmission(
+            feedback=feedback,
+            rating=validated.get("rating"),
+            form_data=validated.get("form_data"),
+            geometry=validated.get("geometry"),
+        )
+        submission.full_clean()
+        submission.save()
+        return submission
+
+    def _ingest(self, pk, data):
+        feedback = submission_target(GeoFeedback.objects.filter(**PUBLIC_FEEDBACK), pk)
+        serializer = FeedbackSubmissionIngestSerializer(data=data, context={"feedback": feedback})
+        serializer.is_valid(raise_exception=True)
+        return insert_submission(feedback, None, serializer.validated_data)
+
+    def _measure(self, label, submit, payloads):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for data in payloads:
+                submit(data)
+            elapsed = time.perf_counter() - start
+        count = len(payloads)
+        self.stdout.write(
+            f"{label:<10} {count / elapsed:>10.0f} submissions/s "
+            f"{elapsed / count * 1000:>8.2f}ms each {len(queries) / count:>5.1f} queries each"
+        )
@@ -0,0 +1,57 @@
+"""
+Worker for buffered submissions: moves QueuedSubmission rows into
+FeedbackSubmission in batches (see feedback/submission_queue.py).
+
+Runs until interrupted, draining full batches back to back and polling
+every FEEDBACK_QUEUE_POLL_SECONDS while the queue is empty. Several workers
+may run at once. Run it alongside the web process whenever
+FEEDBACK_SUBMIT_BUFFERED is enabled.
+
+Usage:
+    python manage.py process_submission_queue
+    python manage.py process_submission_queue --once   # drain, then exit
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tosca_api.apps.feedback.submission_queue import drain_submission_queue
+
+
+class Command(BaseCommand):
+    help = "Move queued feedback submissions into FeedbackSubmission in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "FEEDBACK_QUEUE_BATCH_SIZE", 1000),
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "FEEDBACK_QUEUE_POLL_SECONDS", 1.0),
+        )
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        total = 0
+        try:
+            while True:
+                taken = drain_submission_queue(batch_size)
+                total += taken
+                if taken and options["verbosity"] > 1:
+                    self.stdout.write(f"Moved {taken} submissions")
+                if taken < batch_size:
+                    if options["once"]:
+                        break
+                    # Recycle broken or expired connections between polls
+                    close_old_connections()
+                    time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Moved {total} queued submissions"))
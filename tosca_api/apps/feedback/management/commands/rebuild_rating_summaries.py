@@ -0,0 +1,22 @@
+"""
+Recompute every FeedbackRatingSummary from the stored submissions.
+
+The summaries are maintained incrementally (see feedback/ratings.py); run
+this after writes that bypass it, such as raw SQL, ``QuerySet.update()`` of
+ratings or restoring a database dump. Submission writes wait while it runs.
+
+Usage:
+    python manage.py rebuild_rating_summaries
+"""
+
+from django.core.management.base import BaseCommand
+
+from tosca_api.apps.feedback.ratings import rebuild_rating_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the rating summaries of all GeoFeedbacks from their submissions."
+
+    def handle(self, *args, **options):
+        count = rebuild_rating_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating summaries for {count} feedbacks"))
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.14 on 2026-10-16 22:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0002_feedbacksubmission'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedbacksubmission',
+            name='idempotency_key',
+            field=models.CharField(blank=True, help_text='Client-supplied key; replays with the same key are ignored.', max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='feedbacksubmission',
+            constraint=models.UniqueConstraint(condition=models.Q(('idempotency_key__isnull', False)), fields=('feedback', 'idempotency_key'), name='feedback_submission_idempotency_uniq'),
+        ),
+    ]
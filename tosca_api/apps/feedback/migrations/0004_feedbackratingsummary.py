@@ -0,0 +1,50 @@
+# Generated by Django 5.1.14 on 2026-10-16 23:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Summaries for submissions stored before the aggregates were maintained
+BACKFILL_SQL = """
+INSERT INTO feedback_feedbackratingsummary
+    (feedback_id, rating_count, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5)
+SELECT
+    feedback_id,
+    count(*),
+    sum(rating),
+    count(*) FILTER (WHERE rating = 1),
+    count(*) FILTER (WHERE rating = 2),
+    count(*) FILTER (WHERE rating = 3),
+    count(*) FILTER (WHERE rating = 4),
+    count(*) FILTER (WHERE rating = 5)
+FROM feedback_feedbacksubmission
+WHERE rating IS NOT NULL
+GROUP BY feedback_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0003_feedbacksubmission_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackRatingSummary',
+            fields=[
+                ('feedback', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to='feedback.geofeedback')),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('stars_1', models.PositiveIntegerField(default=0)),
+                ('stars_2', models.PositiveIntegerField(default=0)),
+                ('stars_3', models.PositiveIntegerField(default=0)),
+                ('stars_4', models.PositiveIntegerField(default=0)),
+                ('stars_5', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Feedback Rating Summary',
+                'verbose_name_plural': 'Feedback Rating Summaries',
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.14 on 2026-10-16 23:13
+
+import uuid
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0004_feedbackratingsummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedSubmission',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('submission_id', models.UUIDField(default=uuid.uuid4)),
+                ('rating', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('form_data', models.JSONField(blank=True, default=None, null=True)),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, spatial_index=False, srid=4326)),
+                ('is_anonymized', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('feedback', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='queued_submissions', to='feedback.geofeedback')),
+                ('submitted_by', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Queued Submission',
+                'verbose_name_plural': 'Queued Submissions',
+                'ordering': ['id'],
+            },
+        ),
+    ]
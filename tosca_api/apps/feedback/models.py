@@ -9,6 +9,12 @@ and can be linked to map layers for contextual display.
 FeedbackSubmission stores individual citizen responses to a GeoFeedback,
 including optional ratings, dynamic form answers (JSONB), and spatial
 drawings (GeometryField).
+
+FeedbackRatingSummary keeps per-feedback rating aggregates, maintained
+incrementally by ratings.py.
+
+QueuedSubmission is the staging table of the buffered submit mode, drained
+into FeedbackSubmission by submission_queue.py.
 """
 
 from __future__ import annotations
@@ -20,7 +26,8 @@ from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.gis.db import models as gis_models
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from tosca_api.apps.core.models import TimeStampedModel
 from tosca_api.apps.core.sanitization import sanitize_simple
@@ -214,6 +221,25 @@ class FeedbackLayer(models.Model):
         super().save(*args, **kwargs)
 
 
+class FeedbackSubmissionQuerySet(models.QuerySet):
+    def delete(self):
+        """Delete the submissions and take their ratings out of the summaries."""
+        from .ratings import apply_rating_changes
+
+        with transaction.atomic(using=self.db):
+            # One grouped read; a count works as the sign of n removals
+            changes = [
+                (feedback_id, rating, -count)
+                for feedback_id, rating, count in self.exclude(rating=None)
+                .order_by()
+                .values_list("feedback_id", "rating")
+                .annotate(count=models.Count("pk"))
+            ]
+            deleted = super().delete()
+            apply_rating_changes(changes)
+        return deleted
+
+
 class FeedbackSubmission(TimeStampedModel):
     """
     An individual citizen response to a GeoFeedback campaign.
@@ -226,6 +252,7 @@ class FeedbackSubmission(TimeStampedModel):
         form_data: JSONB storing dynamic form answers (nullable)
         geometry: Mixed geometry for drawings (Point/Line/Polygon, nullable)
         is_anonymized: Whether PII has been stripped from this submission
+        idempotency_key: Optional client key, unique per feedback
     """
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -270,6 +297,15 @@ class FeedbackSubmission(TimeStampedModel):
         help_text="Whether personally identifiable information has been removed.",
     )
 
+    idempotency_key = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text="Client-supplied key; replays with the same key are ignored.",
+    )
+
+    objects = FeedbackSubmissionQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Feedback Submission"
@@ -278,6 +314,14 @@ class FeedbackSubmission(TimeStampedModel):
             models.Index(fields=["feedback"]),
             models.Index(fields=["submitted_by"]),
         ]
+        constraints = [
+            # Enforces idempotent offline sync (see ingest.ingest_batch)
+            models.UniqueConstraint(
+                fields=["feedback", "idempotency_key"],
+                condition=models.Q(idempotency_key__isnull=False),
+                name="feedback_submission_idempotency_uniq",
+            ),
+        ]
 
     def __str__(self) -> str:
         user_label = self.submitted_by or "Anonymous"
@@ -309,6 +353,123 @@ class FeedbackSubmission(TimeStampedModel):
         super().clean()
 
     def save(self, *args, **kwargs) -> None:
-        """Override save to validate."""
+        """Override save to validate and count the rating in the same transaction."""
+        from .ratings import apply_rating_changes
+
         self.full_clean()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            changes = [(self.feedback_id, self.rating, 1)]
+            if not self._state.adding:
+                # An edited rating (or feedback) must be taken out of the old counters.
+                previous = (
+                    FeedbackSubmission.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("feedback_id", "rating")
+                    .first()
+                )
+                if previous is not None:
+                    changes.append((*previous, -1))
+            super().save(*args, **kwargs)
+            apply_rating_changes(changes)
+
+    def delete(self, *args, **kwargs):
+        """Override delete to take the rating out of the summary in the same transaction."""
+        from .ratings import apply_rating_changes
+
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+            apply_rating_changes([(self.feedback_id, self.rating, -1)])
+        return deleted
+
+
+class FeedbackRatingSummary(models.Model):
+    """
+    Denormalized rating aggregates of a GeoFeedback's submissions.
+
+    Maintained incrementally on submission insert/update/delete (see
+    ratings.py); rebuild with ``manage.py rebuild_rating_summaries``.
+
+    Attributes:
+        feedback: The GeoFeedback (primary key)
+        rating_count: Number of submissions with a rating
+        rating_sum: Sum of those ratings
+        stars_1 .. stars_5: Number of submissions per star value
+    """
+
+    feedback = models.OneToOneField(
+        GeoFeedback,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_summary",
+    )
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Feedback Rating Summary"
+        verbose_name_plural = "Feedback Rating Summaries"
+
+    def __str__(self) -> str:
+        return f"Ratings of {self.feedback_id} ({self.rating_count})"
+
+    @property
+    def average(self) -> float | None:
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @property
+    def histogram(self) -> dict[str, int]:
+        return {str(star): getattr(self, f"stars_{star}") for star in range(1, 6)}
+
+
+class QueuedSubmission(models.Model):
+    """
+    A validated submission waiting to be written to FeedbackSubmission.
+
+    Written by the submit endpoint when FEEDBACK_SUBMIT_BUFFERED is on and
+    moved in batches by ``manage.py process_submission_queue`` (see
+    submission_queue.py). Rows are deleted once drained.
+
+    Attributes:
+        submission_id: Id the FeedbackSubmission will get (returned with 202)
+        created_at: Time the submission was accepted; kept on the submission
+        feedback, submitted_by, rating, form_data, geometry, is_anonymized:
+            As on FeedbackSubmission
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    submission_id = models.UUIDField(default=uuid.uuid4)
+    # No secondary indexes: the table is append-then-drain, so inserts stay cheap.
+    feedback = models.ForeignKey(
+        GeoFeedback,
+        on_delete=models.CASCADE,
+        related_name="queued_submissions",
+        db_index=False,
+    )
+    submitted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_index=False,
+    )
+    rating = models.PositiveSmallIntegerField(null=True, blank=True)
+    form_data = models.JSONField(null=True, blank=True, default=None)
+    geometry = gis_models.GeometryField(srid=4326, null=True, blank=True, spatial_index=False)
+    is_anonymized = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["id"]
+        verbose_name = "Queued Submission"
+        verbose_name_plural = "Queued Submissions"
+
+    def __str__(self) -> str:
+        return f"Queued submission {self.submission_id} to {self.feedback_id}"
@@ -0,0 +1,108 @@
+"""
+Incremental maintenance of FeedbackRatingSummary.
+
+Every path that writes submissions reports rating changes here as
+``(feedback_id, rating, sign)`` triples, in the same transaction as the
+write: the ingest fast path and bulk sync (bulk_create skips ``save()``)
+call ``apply_rating_changes`` directly, ``FeedbackSubmission.save()`` /
+``delete()`` and its QuerySet's ``delete()`` do so in models.py. No signal
+receivers are registered, so deleting a GeoFeedback still fast-deletes its
+submissions; the summary cascades with it. Changes are folded into one
+delta row per feedback and applied as relative updates:
+
+- additions are one multi-row upsert with ``rating_count = rating_count +
+  EXCLUDED.rating_count`` etc., so concurrent writers never lose an
+  increment and the first rating creates the row;
+- deltas with a negative counter (deletes, changed ratings) are a plain
+  UPDATE clamped at zero, so a drifted summary (see
+  ``rebuild_rating_summaries``) never makes a delete fail its CHECK
+  constraints and never re-creates a summary.
+
+Rows are written in feedback id order to keep lock order consistent.
+"""
+
+from collections import defaultdict
+
+from django.db import connection, transaction
+
+from .models import FeedbackRatingSummary, FeedbackSubmission
+
+STAR_COLUMNS = [f"stars_{star}" for star in range(1, 6)]
+COUNTER_COLUMNS = ["rating_count", "rating_sum", *STAR_COLUMNS]
+
+REBUILD_SQL = """
+INSERT INTO {summary} (feedback_id, rating_count, rating_sum, {stars})
+SELECT
+    feedback_id,
+    count(*),
+    sum(rating),
+    {star_counts}
+FROM {submission}
+WHERE rating IS NOT NULL
+GROUP BY feedback_id
+"""
+
+
+def _table(model) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def rating_deltas(changes) -> dict:
+    """Fold ``(feedback_id, rating, sign)`` into per-feedback counter deltas."""
+    deltas = defaultdict(lambda: dict.fromkeys(COUNTER_COLUMNS, 0))
+    for feedback_id, rating, sign in changes:
+        if rating is None:
+            continue
+        delta = deltas[feedback_id]
+        delta["rating_count"] += sign
+        delta["rating_sum"] += sign * rating
+        delta[f"stars_{rating}"] += sign
+    return {key: value for key, value in deltas.items() if any(value.values())}
+
+
+def apply_rating_changes(changes) -> None:
+    """Apply rating additions (sign 1) and removals (sign -1) to the summaries."""
+    deltas = rating_deltas(changes)
+    additions = []
+    removals = []
+    for feedback_id in sorted(deltas, key=str):
+        delta = deltas[feedback_id]
+        row = [feedback_id, *(delta[column] for column in COUNTER_COLUMNS)]
+        # Upserting a negative counter could create an invalid row
+        (additions if min(delta.values()) >= 0 else removals).append(row)
+
+    table = _table(FeedbackRatingSummary)
+    assignments = ", ".join(f"{c} = s.{c} + EXCLUDED.{c}" for c in COUNTER_COLUMNS)
+    with connection.cursor() as cursor:
+        if additions:
+            values = ", ".join(["(%s" + ", %s" * len(COUNTER_COLUMNS) + ")"] * len(additions))
+            cursor.execute(
+                f"INSERT INTO {table} AS s (feedback_id, {', '.join(COUNTER_COLUMNS)}) "
+                f"VALUES {values} ON CONFLICT (feedback_id) DO UPDATE SET {assignments}",
+                [value for row in additions for value in row],
+            )
+        for feedback_id, *counters in removals:
+            cursor.execute(
+                f"UPDATE {table} SET "
+                + ", ".join(f"{c} = GREATEST({c} + %s, 0)" for c in COUNTER_COLUMNS)
+                + " WHERE feedback_id = %s",
+                [*counters, feedback_id],
+            )
+
+
+def rebuild_rating_summaries() -> int:
+    """Recompute every summary from the submissions; returns the rows written."""
+    sql = REBUILD_SQL.format(
+        summary=_table(FeedbackRatingSummary),
+        submission=_table(FeedbackSubmission),
+        stars=", ".join(STAR_COLUMNS),
+        star_counts=", ".join(
+            f"count(*) FILTER (WHERE rating = {star})" for star in range(1, 6)
+        ),
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Block concurrent submission writes so no delta is lost mid-rebuild.
+        cursor.execute(f"LOCK TABLE {_table(FeedbackSubmission)} IN SHARE MODE")
+        cursor.execute(f"DELETE FROM {_table(FeedbackRatingSummary)}")
+        cursor.execute(sql)
+        return cursor.rowcount
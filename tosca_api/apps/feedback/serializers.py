@@ -1,8 +1,10 @@
+from django.conf import settings
 from rest_framework import serializers
 from rest_framework_gis.fields import GeometryField
 from tosca_api.apps.geocontext.models import GeoContext
 
-from .models import FeedbackLayer, FeedbackSubmission, GeoFeedback
+from .heatmap import HEATMAP_SHAPES, MERCATOR_MAX_LATITUDE, estimated_cells, mercator_bounds
+from .models import FeedbackLayer, FeedbackRatingSummary, FeedbackSubmission, GeoFeedback
 
 
 class FeedbackGeoContextSerializer(serializers.ModelSerializer):
@@ -26,9 +28,24 @@ class FeedbackLayerSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+def rating_summary_data(feedback) -> dict:
+    """Rating count, average and per-star histogram from FeedbackRatingSummary."""
+    try:
+        summary = feedback.rating_summary
+    except FeedbackRatingSummary.DoesNotExist:
+        summary = FeedbackRatingSummary(feedback=feedback)
+    return {
+        "count": summary.rating_count,
+        "average": summary.average,
+        "histogram": summary.histogram,
+    }
+
+
 class GeoFeedbackListSerializer(serializers.ModelSerializer):
     """Slim serializer for listing feedback campaigns."""
 
+    rating_summary = serializers.SerializerMethodField()
+
     class Meta:
         model = GeoFeedback
         fields = [
@@ -41,10 +58,14 @@ class GeoFeedbackListSerializer(serializers.ModelSerializer):
             "rating_enabled",
             "form_enabled",
             "allow_drawings",
+            "rating_summary",
             "created_at",
         ]
         read_only_fields = fields
 
+    def get_rating_summary(self, obj) -> dict:
+        return rating_summary_data(obj)
+
 
 class GeoFeedbackDetailSerializer(serializers.ModelSerializer):
     """
@@ -54,6 +75,7 @@ class GeoFeedbackDetailSerializer(serializers.ModelSerializer):
 
     context = FeedbackGeoContextSerializer(read_only=True)
     layers = serializers.SerializerMethodField()
+    rating_summary = serializers.SerializerMethodField()
     custom_form_slug = serializers.CharField(
         source="custom_form.slug", read_only=True, allow_null=True
     )
@@ -75,11 +97,15 @@ class GeoFeedbackDetailSerializer(serializers.ModelSerializer):
             "visibility",
             "created_by",
             "layers",
+            "rating_summary",
             "created_at",
             "updated_at",
         ]
         read_only_fields = fields
 
+    def get_rating_summary(self, obj) -> dict:
+        return rating_summary_data(obj)
+
     def get_layers(self, obj) -> list:
         """Return layers ordered by display_order."""
         through_qs = FeedbackLayer.objects.filter(feedback=obj).select_related("layer")
@@ -150,3 +176,84 @@ class FeedbackSubmissionSerializer(serializers.ModelSerializer):
             
         instance.clean()
         return attrs
+
+
+class FeedbackSubmissionIngestSerializer(serializers.Serializer):
+    """
+    Validates a submission once against its GeoFeedback configuration.
+
+    Expects ``feedback`` in the context (see ingest.submission_target). Covers
+    the checks of ``FeedbackSubmission.clean()``, so the validated data can
+    be inserted without ``full_clean()``.
+    """
+
+    rating = serializers.IntegerField(required=False, allow_null=True, min_value=1, max_value=5)
+    form_data = serializers.JSONField(required=False, allow_null=True)
+    geometry = GeometryField(required=False, allow_null=True)
+    is_anonymized = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        """Check the submission against the feedback's configuration."""
+        feedback = self.context["feedback"]
+        errors = {}
+        if feedback.rating_enabled and attrs.get("rating") is None:
+            errors["rating"] = "Rating is required for this feedback campaign."
+
+        if feedback.form_enabled and not attrs.get("form_data"):
+            errors["form_data"] = "Form data is required for this feedback campaign."
+
+        if attrs.get("geometry") and not feedback.allow_drawings:
+            errors["geometry"] = "Drawings are not allowed for this feedback campaign."
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+class FeedbackSubmissionBulkItemSerializer(FeedbackSubmissionIngestSerializer):
+    """One item of POST /feedback/submissions/bulk/ (see ingest.ingest_batch)."""
+
+    feedback = serializers.UUIDField()
+    idempotency_key = serializers.CharField(max_length=64)
+
+
+class HeatmapQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of the submission heatmap (see heatmap.py).
+
+    ``bbox`` is required unless the view passes tile ``bounds`` in the
+    context. The validated data carries the Web Mercator ``bounds``.
+    """
+
+    bbox = serializers.CharField(required=False)
+    cell_size = serializers.FloatField(min_value=1)
+    shape = serializers.ChoiceField(choices=list(HEATMAP_SHAPES), default="hexagon")
+
+    def validate_bbox(self, value):
+        """Parse min_lon,min_lat,max_lon,max_lat into Web Mercator bounds."""
+        try:
+            min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(","))
+        except ValueError:
+            raise serializers.ValidationError(
+                "Invalid bbox format. Expected: min_lon,min_lat,max_lon,max_lat."
+            )
+        if not (-180 <= min_lon < max_lon <= 180):
+            raise serializers.ValidationError("Longitudes must be ordered and within -180..180.")
+        if not (-MERCATOR_MAX_LATITUDE <= min_lat < max_lat <= MERCATOR_MAX_LATITUDE):
+            raise serializers.ValidationError(
+                f"Latitudes must be ordered and within ±{MERCATOR_MAX_LATITUDE:.4f}."
+            )
+        return mercator_bounds(min_lon, min_lat, max_lon, max_lat)
+
+    def validate(self, attrs):
+        bounds = attrs.pop("bbox", None) or self.context.get("bounds")
+        if bounds is None:
+            raise serializers.ValidationError({"bbox": "This field is required."})
+
+        max_cells = getattr(settings, "FEEDBACK_HEATMAP_MAX_CELLS", 10000)
+        if estimated_cells(bounds, attrs["shape"], attrs["cell_size"]) > max_cells:
+            raise serializers.ValidationError(
+                {"cell_size": f"Too small for this area (more than {max_cells} cells)."}
+            )
+        attrs["bounds"] = bounds
+        return attrs
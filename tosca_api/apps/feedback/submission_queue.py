@@ -0,0 +1,112 @@
+"""
+Write-behind mode for citizen submissions (FEEDBACK_SUBMIT_BUFFERED).
+
+Under a burst of submissions every request of the direct path holds a
+connection for the submission INSERT plus the rating summary upsert, both
+contending on the same summary row. In buffered mode the endpoint still
+validates the body (ingest.py) but only appends the row to the
+QueuedSubmission staging table (one INSERT into a table without
+secondary indexes) and answers 202 with the submission's future id.
+
+``manage.py process_submission_queue`` drains the table. Each batch is one
+statement: the oldest rows are deleted with ``FOR UPDATE SKIP LOCKED`` (so
+several workers can run side by side) and inserted into FeedbackSubmission
+with a multi-row ``INSERT ... SELECT``, keeping their acceptance time as
+``created_at``; the rating summaries are then updated once per batch in the
+same transaction. A crash before commit leaves the batch queued. Only a
+reused submission id can conflict on insert; such rows are dropped and
+their ids logged.
+
+Queued submissions are not visible until drained, and rating summaries lag
+by the same delay.
+"""
+
+import logging
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .ingest import build_submission
+from .models import FeedbackSubmission, QueuedSubmission
+from .ratings import apply_rating_changes
+
+logger = logging.getLogger(__name__)
+
+DRAIN_SQL = """
+WITH batch AS (
+    DELETE FROM {queue}
+    WHERE id IN (
+        SELECT id FROM {queue} ORDER BY id LIMIT %s FOR UPDATE SKIP LOCKED
+    )
+    RETURNING submission_id, feedback_id, submitted_by_id, rating, form_data, geometry,
+        is_anonymized, created_at
+),
+inserted AS (
+    INSERT INTO {submission} (
+        id, feedback_id, submitted_by_id, rating, form_data, geometry,
+        is_anonymized, created_at, updated_at
+    )
+    SELECT
+        submission_id, feedback_id, submitted_by_id, rating, form_data, geometry,
+        is_anonymized, created_at, created_at
+    FROM batch
+    ON CONFLICT (id) DO NOTHING
+    RETURNING id, feedback_id, rating
+)
+SELECT NULL, NULL, count(*), NULL::uuid FROM batch
+UNION ALL
+SELECT feedback_id, rating, count(*), NULL::uuid FROM inserted GROUP BY feedback_id, rating
+UNION ALL
+SELECT NULL, NULL, NULL, submission_id FROM batch
+WHERE submission_id NOT IN (SELECT id FROM inserted)
+"""
+
+
+def enqueue_submission(feedback, user, data) -> FeedbackSubmission:
+    """
+    Queue a submission from validated FeedbackSubmissionIngestSerializer data.
+
+    Returns the unsaved FeedbackSubmission it will become, with its final id
+    and acceptance time.
+    """
+    submission = build_submission(feedback, user, data)
+    submission.created_at = submission.updated_at = timezone.now()
+    QueuedSubmission.objects.bulk_create(
+        [
+            QueuedSubmission(
+                submission_id=submission.id,
+                feedback=feedback,
+                submitted_by=user,
+                rating=submission.rating,
+                form_data=submission.form_data,
+                geometry=submission.geometry,
+                is_anonymized=submission.is_anonymized,
+                created_at=submission.created_at,
+            )
+        ]
+    )
+    return submission
+
+
+def drain_submission_queue(batch_size: int) -> int:
+    """Move up to ``batch_size`` queued submissions; returns how many were taken."""
+    quote = connection.ops.quote_name
+    sql = DRAIN_SQL.format(
+        queue=quote(QueuedSubmission._meta.db_table),
+        submission=quote(FeedbackSubmission._meta.db_table),
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, [batch_size])
+        rows = cursor.fetchall()
+        # Rows are the batch size, inserts per rating, or the id of a dropped row.
+        taken = next(row[2] for row in rows if row[0] is None and row[3] is None)
+        # A count works as the sign: n additions of the same rating
+        apply_rating_changes([row[:3] for row in rows if row[0] is not None])
+    dropped = [str(row[3]) for row in rows if row[3] is not None]
+    if dropped:
+        # Only a reused submission id can conflict; the stored row is kept.
+        logger.warning("Dropped queued submissions with existing ids", extra={
+            "count": len(dropped),
+            "submission_ids": dropped,
+        })
+    return taken
@@ -1,11 +1,13 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from formbuilder.models import CustomForm
 from tosca_api.apps.campaigns.models import Campaign
-from tosca_api.apps.feedback.models import GeoFeedback
+from tosca_api.apps.feedback.models import FeedbackSubmission, GeoFeedback
 
 User = get_user_model()
 
@@ -238,3 +240,93 @@ class TestFeedbackSubmissionAPI:
         )
         assert resp.status_code == status.HTTP_400_BAD_REQUEST
         assert "geometry" in resp.data
+
+    def test_submit_rejects_out_of_range_rating(self, api_client, feedback):
+        """Rating bounds are checked without reaching the model."""
+        url = f"/api/v1/feedback/{feedback.id}/submit/"
+        resp = api_client.post(url, {"rating": 6, "form_data": {"q": "a"}}, format="json")
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        assert "rating" in resp.data
+
+    def test_submit_to_unpublished_feedback_not_found(self, api_client, feedback_draft_private):
+        """Anonymous users cannot submit to draft/private feedback."""
+        url = f"/api/v1/feedback/{feedback_draft_private.id}/submit/"
+        resp = api_client.post(url, {"rating": 3}, format="json")
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_submit_is_one_lookup_and_one_insert(self, api_client, feedback):
+        """The fast path loads the feedback configuration and inserts once."""
+        url = f"/api/v1/feedback/{feedback.id}/submit/"
+        with CaptureQueriesContext(connection) as queries:
+            resp = api_client.post(url, {"rating": 2, "form_data": {"q": "a"}}, format="json")
+        assert resp.status_code == status.HTTP_201_CREATED
+
+        sql = [q["sql"] for q in queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        assert len(sql) == 3, sql
+        assert sql[1].startswith('INSERT INTO "feedback_feedbacksubmission"')
+        # Rating summary upsert in the same transaction
+        assert sql[2].startswith('INSERT INTO "feedback_feedbackratingsummary"')
+        assert FeedbackSubmission.objects.get(id=resp.data["id"]).rating == 2
+
+
+def bulk_item(feedback, key, **fields):
+    item = {"feedback": str(feedback.id), **fields}
+    if key is not None:
+        item["idempotency_key"] = key
+    return item
+
+
+@pytest.mark.django_db
+class TestBulkSubmissionAPI:
+    """Test POST /api/v1/feedback/submissions/bulk/."""
+
+    url = "/api/v1/feedback/submissions/bulk/"
+
+    def test_bulk_submit_across_feedbacks(self, api_client, feedback, feedback_no_drawings):
+        """Valid items for several feedbacks are created in one request."""
+        items = [
+            bulk_item(feedback, "a-1", rating=5, form_data={"q": "a"}),
+            bulk_item(feedback_no_drawings, "a-2", rating=3),
+        ]
+        resp = api_client.post(self.url, items, format="json")
+        assert resp.status_code == status.HTTP_200_OK
+        assert [r["status"] for r in resp.data["results"]] == ["created", "created"]
+        assert FeedbackSubmission.objects.filter(feedback=feedback_no_drawings, rating=3).exists()
+
+    def test_bulk_replay_is_noop(self, api_client, feedback):
+        """Replayed idempotency keys report the stored submission."""
+        items = [bulk_item(feedback, "k-1", rating=4, form_data={"q": "a"})]
+        first = api_client.post(self.url, items, format="json").data["results"][0]
+        replay = api_client.post(self.url, items * 2, format="json").data["results"]
+
+        assert [r["status"] for r in replay] == ["duplicate", "duplicate"]
+        assert {r["id"] for r in replay} == {first["id"]}
+        assert FeedbackSubmission.objects.filter(feedback=feedback).count() == 1
+
+    def test_bulk_invalid_items_do_not_block_batch(
+        self, api_client, feedback, feedback_no_drawings, feedback_draft_private
+    ):
+        """Each invalid item reports its errors; the rest are stored."""
+        point = {"type": "Point", "coordinates": [10.0, 53.5]}
+        items = [
+            bulk_item(feedback_no_drawings, "x-1", rating=2, geometry=point),
+            bulk_item(feedback_draft_private, "x-2", rating=2),
+            bulk_item(feedback, None, rating=2, form_data={"q": "a"}),
+            bulk_item(feedback, "x-4", rating=2, form_data={"q": "a"}),
+        ]
+        results = api_client.post(self.url, items, format="json").data["results"]
+
+        assert [r["status"] for r in results] == ["invalid", "invalid", "invalid", "created"]
+        assert "geometry" in results[0]["errors"]
+        assert "feedback" in results[1]["errors"]
+        assert "idempotency_key" in results[2]["errors"]
+
+    def test_bulk_requires_list(self, api_client, feedback):
+        resp = api_client.post(self.url, {"feedback": str(feedback.id)}, format="json")
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_rejects_oversized_batches(self, settings, api_client, feedback):
+        settings.FEEDBACK_BULK_MAX_ITEMS = 1
+        items = [bulk_item(feedback, str(i), rating=1) for i in range(2)]
+        resp = api_client.post(self.url, items, format="json")
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
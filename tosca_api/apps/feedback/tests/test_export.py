@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from rest_framework.test import APIClient
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.feedback.export import _csv_cell, iter_csv
+from tosca_api.apps.feedback.models import FeedbackSubmission, GeoFeedback
+
+User = get_user_model()
+
+
+def test_csv_cell_neutralizes_formulas():
+    assert _csv_cell("=HYPERLINK(\"x\")") == "'=HYPERLINK(\"x\")"
+    assert _csv_cell("plain") == "plain"
+    assert _csv_cell(None) == ""
+    assert _csv_cell(True) == "true"
+    assert _csv_cell(3) == 3
+    assert _csv_cell({"a": [1, 2]}) == '{"a":[1,2]}'
+
+
+@pytest.fixture
+def admin_user():
+    return User.objects.create_superuser(username="exportadmin", password="password")
+
+
+@pytest.fixture
+def admin_client(admin_user):
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+    return client
+
+
+@pytest.fixture
+def feedback(admin_user):
+    campaign = Campaign.objects.create(title="Export Campaign", created_by=admin_user)
+    feedback = GeoFeedback.objects.create(
+        campaign=campaign,
+        title="Export Feedback",
+        created_by=admin_user,
+        rating_enabled=True,
+        allow_drawings=True,
+        status=GeoFeedback.Status.PUBLISHED,
+        visibility=GeoFeedback.Visibility.PUBLIC,
+    )
+    FeedbackSubmission.objects.create(
+        feedback=feedback,
+        submitted_by=admin_user,
+        rating=4,
+        form_data={"comment": "More trees", "topics": ["green", "traffic"]},
+        geometry=Point(10.0, 53.5, srid=4326),
+    )
+    FeedbackSubmission.objects.create(
+        feedback=feedback,
+        submitted_by=admin_user,
+        rating=2,
+        form_data={"age_group": "18-30"},
+        is_anonymized=True,
+    )
+    return feedback
+
+
+def export_url(feedback, export_format):
+    return f"/api/v1/feedback/{feedback.id}/submissions.{export_format}"
+
+
+def streamed_text(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_csv_export_flattens_form_data(admin_client, admin_user, feedback):
+    response = admin_client.get(export_url(feedback, "csv"))
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    assert response["Content-Disposition"].startswith("attachment;")
+
+    rows = list(csv.DictReader(io.StringIO(streamed_text(response))))
+    assert list(rows[0]) == [
+        "id",
+        "created_at",
+        "submitted_by",
+        "rating",
+        "is_anonymized",
+        "geometry",
+        "form.age_group",
+        "form.comment",
+        "form.topics",
+    ]
+    first, second = rows
+    assert first["form.comment"] == "More trees"
+    assert first["form.topics"] == '["green","traffic"]'
+    assert first["form.age_group"] == ""
+    assert first["geometry"] == "POINT(10 53.5)"
+    assert first["submitted_by"] == str(admin_user.pk)
+    # Anonymized submissions do not reveal the submitter
+    assert second["submitted_by"] == ""
+    assert second["form.age_group"] == "18-30"
+
+
+@pytest.mark.django_db
+def test_ndjson_export(admin_client, feedback):
+    response = admin_client.get(export_url(feedback, "ndjson"))
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in streamed_text(response).splitlines()]
+    assert [line["rating"] for line in lines] == [4, 2]
+    assert lines[0]["geometry"] == {"type": "Point", "coordinates": [10, 53.5]}
+    assert lines[0]["form.topics"] == ["green", "traffic"]
+    assert lines[1]["geometry"] is None
+
+
+@pytest.mark.django_db
+def test_geojson_export(admin_client, feedback):
+    response = admin_client.get(export_url(feedback, "geojson"))
+    assert response["Content-Type"] == "application/geo+json"
+
+    collection = json.loads(streamed_text(response))
+    assert collection["type"] == "FeatureCollection"
+    assert len(collection["features"]) == 2
+    assert collection["features"][0]["properties"]["form.comment"] == "More trees"
+
+
+@pytest.mark.django_db
+def test_csv_export_streams_in_chunks(feedback):
+    chunks = list(iter_csv(FeedbackSubmission.objects.filter(feedback=feedback), chunk_size=1))
+    # Header, then one fragment per row
+    assert len(chunks) == 3
+
+
+@pytest.mark.django_db
+def test_export_unknown_format(admin_client, feedback):
+    assert admin_client.get(export_url(feedback, "xlsx")).status_code == 404
+
+
+@pytest.mark.django_db
+def test_export_is_staff_only(feedback):
+    response = APIClient().get(export_url(feedback, "csv"))
+    assert response.status_code in (401, 403)
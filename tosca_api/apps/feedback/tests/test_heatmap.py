@@ -0,0 +1,153 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import LineString, Point
+from rest_framework.test import APIClient
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.feedback.heatmap import estimated_cells, mercator_bounds, tile_bounds
+from tosca_api.apps.feedback.models import FeedbackSubmission, GeoFeedback
+from tosca_api.apps.feedback.serializers import HeatmapQuerySerializer
+
+User = get_user_model()
+
+HAMBURG_BBOX = "9.9,53.5,10.1,53.6"
+
+
+# =============================================================================
+# Grid helpers and query validation
+# =============================================================================
+
+
+def test_tile_bounds_match_mercator_projection():
+    world = tile_bounds(0, 0, 0)
+    assert mercator_bounds(-180, -85.0511287798066, 180, 85.0511287798066) == pytest.approx(world)
+
+    xmin, ymin, xmax, ymax = tile_bounds(1, 1, 0)
+    assert (xmin, ymin) == (0, 0)
+    assert xmax == ymax == pytest.approx(world[2])
+
+
+def test_estimated_cells():
+    bounds = (0, 0, 1000, 1000)
+    assert estimated_cells(bounds, "square", 100) == 100
+    # A hexagon with edge 100 covers about 26 000 square units
+    assert estimated_cells(bounds, "hexagon", 100) == 39
+
+
+def test_query_requires_bbox_without_tile_bounds():
+    query = HeatmapQuerySerializer(data={"cell_size": 500})
+    assert not query.is_valid()
+    assert "bbox" in query.errors
+
+    query = HeatmapQuerySerializer(data={"cell_size": 500}, context={"bounds": (0, 0, 1, 1)})
+    assert query.is_valid(), query.errors
+    assert query.validated_data["shape"] == "hexagon"
+
+
+def test_query_rejects_latitudes_outside_mercator():
+    query = HeatmapQuerySerializer(data={"bbox": "0,-90,10,10", "cell_size": 500})
+    assert not query.is_valid()
+    assert "bbox" in query.errors
+
+
+def test_query_limits_cell_count(settings):
+    settings.FEEDBACK_HEATMAP_MAX_CELLS = 100
+    query = HeatmapQuerySerializer(data={"bbox": HAMBURG_BBOX, "cell_size": 100})
+    assert not query.is_valid()
+    assert "cell_size" in query.errors
+
+
+# =============================================================================
+# Heatmap endpoints
+# =============================================================================
+
+
+@pytest.fixture
+def admin_user():
+    return User.objects.create_superuser(username="heatmapadmin", password="password")
+
+
+@pytest.fixture
+def admin_client(admin_user):
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+    return client
+
+
+@pytest.fixture
+def feedback(admin_user):
+    campaign = Campaign.objects.create(title="Heatmap Campaign", created_by=admin_user)
+    feedback = GeoFeedback.objects.create(
+        campaign=campaign,
+        title="Heatmap Feedback",
+        created_by=admin_user,
+        rating_enabled=True,
+        allow_drawings=True,
+        status=GeoFeedback.Status.PUBLISHED,
+        visibility=GeoFeedback.Visibility.PUBLIC,
+    )
+    drawings = [
+        (Point(10.0, 53.55, srid=4326), 4),
+        (Point(10.00001, 53.55001, srid=4326), 5),
+        # Centroid of the line lies next to the points above
+        (LineString((9.99999, 53.55), (10.00001, 53.55), srid=4326), None),
+        (Point(10.05, 53.58, srid=4326), 1),
+        # Outside the bbox
+        (Point(12.0, 48.0, srid=4326), 3),
+    ]
+    for geometry, rating in drawings:
+        FeedbackSubmission.objects.create(feedback=feedback, geometry=geometry, rating=rating)
+    FeedbackSubmission.objects.create(feedback=feedback, rating=2)
+    return feedback
+
+
+def heatmap_url(feedback):
+    return f"/api/v1/feedback/{feedback.id}/heatmap/"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("shape", ["hexagon", "square"])
+def test_heatmap_counts_and_mean_rating(admin_client, feedback, shape):
+    response = admin_client.get(
+        heatmap_url(feedback), {"bbox": HAMBURG_BBOX, "cell_size": 1000, "shape": shape}
+    )
+    assert response.status_code == 200
+    features = json.loads(b"".join(response.streaming_content))["features"]
+
+    cells = sorted((f["properties"]["count"], f["properties"]["mean_rating"]) for f in features)
+    assert cells == [(1, 1.0), (3, 4.5)]
+    assert all(f["geometry"]["type"] == "Polygon" for f in features)
+    corners = len(features[0]["geometry"]["coordinates"][0])
+    assert corners == (7 if shape == "hexagon" else 5)
+
+
+@pytest.mark.django_db
+def test_heatmap_tile(admin_client, feedback):
+    # z12 tile containing Hamburg's city centre
+    response = admin_client.get(
+        f"/api/v1/feedback/{feedback.id}/heatmap/12/2161/1323.mvt", {"cell_size": 1000}
+    )
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/vnd.mapbox-vector-tile"
+    assert response.content
+    assert b"heatmap" in response.content
+
+
+@pytest.mark.django_db
+def test_heatmap_tile_out_of_range(admin_client, feedback):
+    response = admin_client.get(
+        f"/api/v1/feedback/{feedback.id}/heatmap/1/5/0.mvt", {"cell_size": 1000}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_heatmap_is_staff_only(feedback):
+    client = APIClient()
+    params = {"bbox": HAMBURG_BBOX, "cell_size": 1000}
+    assert client.get(heatmap_url(feedback), params).status_code in (401, 403)
+
+    tile_url = f"/api/v1/feedback/{feedback.id}/heatmap/12/2161/1323.mvt"
+    assert client.get(tile_url, {"cell_size": 1000}).status_code in (401, 403)
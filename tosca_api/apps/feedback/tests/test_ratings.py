@@ -0,0 +1,171 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.feedback.models import FeedbackRatingSummary, FeedbackSubmission, GeoFeedback
+from tosca_api.apps.feedback.ratings import rating_deltas
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="ratinguser", password="password")
+
+
+@pytest.fixture
+def feedback(user):
+    campaign = Campaign.objects.create(title="Rating Campaign", created_by=user)
+    return GeoFeedback.objects.create(
+        campaign=campaign,
+        title="Rated Feedback",
+        created_by=user,
+        rating_enabled=True,
+        status=GeoFeedback.Status.PUBLISHED,
+        visibility=GeoFeedback.Visibility.PUBLIC,
+    )
+
+
+def summary_of(feedback):
+    summary = FeedbackRatingSummary.objects.get(feedback=feedback)
+    return summary.rating_count, summary.rating_sum, summary.histogram
+
+
+# =============================================================================
+# Delta folding
+# =============================================================================
+
+
+def test_rating_deltas_fold_per_feedback():
+    deltas = rating_deltas([("a", 5, 1), ("a", 3, 1), ("a", 5, -1), ("b", None, 1), ("c", 2, 1)])
+
+    assert deltas["a"]["rating_count"] == 1
+    assert deltas["a"]["rating_sum"] == 3
+    assert deltas["a"]["stars_3"] == 1
+    assert deltas["a"]["stars_5"] == 0
+    assert "b" not in deltas
+    assert deltas["c"]["stars_2"] == 1
+
+
+def test_rating_deltas_drop_cancelled_changes():
+    assert rating_deltas([("a", 4, 1), ("a", 4, -1)]) == {}
+
+
+# =============================================================================
+# Incremental maintenance
+# =============================================================================
+
+
+@pytest.mark.django_db
+def test_submit_updates_summary(feedback):
+    client = APIClient()
+    url = f"/api/v1/feedback/{feedback.id}/submit/"
+    for rating in (5, 4, 5):
+        assert client.post(url, {"rating": rating}, format="json").status_code == 201
+
+    assert summary_of(feedback) == (3, 14, {"1": 0, "2": 0, "3": 0, "4": 1, "5": 2})
+
+
+@pytest.mark.django_db
+def test_bulk_submit_counts_created_items_only(feedback):
+    client = APIClient()
+    url = "/api/v1/feedback/submissions/bulk/"
+    items = [
+        {"feedback": str(feedback.id), "idempotency_key": "k-1", "rating": 2},
+        {"feedback": str(feedback.id), "idempotency_key": "k-2", "rating": 3},
+    ]
+    client.post(url, items, format="json")
+    client.post(url, items, format="json")
+
+    assert summary_of(feedback)[:2] == (2, 5)
+
+
+@pytest.mark.django_db
+def test_save_and_delete_update_summary(feedback):
+    submission = FeedbackSubmission.objects.create(feedback=feedback, rating=1)
+    FeedbackSubmission.objects.create(feedback=feedback, rating=4)
+
+    submission.rating = 3
+    submission.save()
+    assert summary_of(feedback) == (2, 7, {"1": 0, "2": 0, "3": 1, "4": 1, "5": 0})
+
+    submission.delete()
+    assert summary_of(feedback) == (1, 4, {"1": 0, "2": 0, "3": 0, "4": 1, "5": 0})
+
+
+@pytest.mark.django_db
+def test_queryset_delete_updates_summary(feedback):
+    for rating in (1, 4, 4, None):
+        FeedbackSubmission.objects.create(feedback=feedback, rating=rating)
+
+    feedback.submissions.filter(rating__gte=2).delete()
+    assert summary_of(feedback) == (1, 1, {"1": 1, "2": 0, "3": 0, "4": 0, "5": 0})
+
+
+@pytest.mark.django_db
+def test_deleting_feedback_removes_summary(feedback):
+    for rating in (2, 4, 5):
+        FeedbackSubmission.objects.create(feedback=feedback, rating=rating)
+    table = FeedbackSubmission._meta.db_table
+
+    with CaptureQueriesContext(connection) as queries:
+        feedback.delete()
+    assert not FeedbackRatingSummary.objects.exists()
+    # Submissions are fast-deleted: never loaded, no per-row summary updates
+    assert not [q for q in queries if q["sql"].startswith("SELECT") and table in q["sql"]]
+    assert not [q for q in queries if q["sql"].startswith("UPDATE")]
+
+
+@pytest.mark.django_db
+def test_delete_with_drifted_summary(feedback):
+    submission = FeedbackSubmission.objects.create(feedback=feedback, rating=3)
+    FeedbackRatingSummary.objects.filter(feedback=feedback).update(rating_count=0, stars_3=0)
+
+    submission.delete()
+    assert summary_of(feedback) == (0, 0, {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0})
+
+
+@pytest.mark.django_db
+def test_unrated_feedback_serializes_empty_summary(feedback):
+    response = APIClient().get(f"/api/v1/feedback/{feedback.id}/")
+
+    assert response.data["rating_summary"] == {
+        "count": 0,
+        "average": None,
+        "histogram": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0},
+    }
+
+
+@pytest.mark.django_db
+def test_list_includes_rating_summary(feedback):
+    FeedbackSubmission.objects.create(feedback=feedback, rating=4)
+    FeedbackSubmission.objects.create(feedback=feedback, rating=5)
+
+    response = APIClient().get("/api/v1/feedback/")
+    summary = response.data["results"][0]["rating_summary"]
+    assert summary["count"] == 2
+    assert summary["average"] == 4.5
+
+
+# =============================================================================
+# Rebuild
+# =============================================================================
+
+
+@pytest.mark.django_db
+def test_rebuild_recomputes_drifted_summaries(feedback):
+    FeedbackSubmission.objects.create(feedback=feedback, rating=2)
+    FeedbackSubmission.objects.create(feedback=feedback, rating=5)
+    # QuerySet.update() bypasses the rating counting
+    FeedbackSubmission.objects.filter(rating=2).update(rating=1)
+    FeedbackRatingSummary.objects.filter(feedback=feedback).update(rating_count=99)
+
+    call_command("rebuild_rating_summaries", stdout=StringIO())
+
+    assert summary_of(feedback) == (2, 6, {"1": 1, "2": 0, "3": 0, "4": 0, "5": 1})
@@ -0,0 +1,103 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tosca_api.apps.campaigns.models import Campaign
+from tosca_api.apps.feedback.models import (
+    FeedbackRatingSummary,
+    FeedbackSubmission,
+    GeoFeedback,
+    QueuedSubmission,
+)
+from tosca_api.apps.feedback.submission_queue import drain_submission_queue
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def buffered(settings):
+    settings.FEEDBACK_SUBMIT_BUFFERED = True
+
+
+@pytest.fixture
+def feedback():
+    user = User.objects.create_user(username="queueuser", password="password")
+    campaign = Campaign.objects.create(title="Queue Campaign", created_by=user)
+    return GeoFeedback.objects.create(
+        campaign=campaign,
+        title="Queued Feedback",
+        created_by=user,
+        rating_enabled=True,
+        allow_drawings=True,
+        status=GeoFeedback.Status.PUBLISHED,
+        visibility=GeoFeedback.Visibility.PUBLIC,
+    )
+
+
+def submit(feedback, **body):
+    return APIClient().post(f"/api/v1/feedback/{feedback.id}/submit/", body, format="json")
+
+
+@pytest.mark.django_db
+def test_buffered_submit_queues_and_accepts(feedback):
+    resp = submit(feedback, rating=4, geometry={"type": "Point", "coordinates": [10.0, 53.5]})
+    assert resp.status_code == status.HTTP_202_ACCEPTED
+    assert resp.data["rating"] == 4
+
+    queued = QueuedSubmission.objects.get()
+    assert str(queued.submission_id) == resp.data["id"]
+    assert parse_datetime(resp.data["created_at"]) == queued.created_at
+    assert not FeedbackSubmission.objects.exists()
+
+
+@pytest.mark.django_db
+def test_buffered_submit_still_validates(feedback):
+    resp = submit(feedback, form_data={"q": "a"})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert not QueuedSubmission.objects.exists()
+
+
+@pytest.mark.django_db
+def test_drain_moves_batches(feedback):
+    ids = [submit(feedback, rating=rating).data["id"] for rating in (5, 3, 5)]
+    accepted_at = QueuedSubmission.objects.get(submission_id=ids[0]).created_at
+
+    assert drain_submission_queue(batch_size=2) == 2
+    assert drain_submission_queue(batch_size=2) == 1
+    assert drain_submission_queue(batch_size=2) == 0
+
+    assert not QueuedSubmission.objects.exists()
+    stored = FeedbackSubmission.objects.values_list("id", flat=True)
+    assert sorted(str(pk) for pk in stored) == sorted(ids)
+    assert FeedbackSubmission.objects.get(id=ids[0]).created_at == accepted_at
+
+    summary = FeedbackRatingSummary.objects.get(feedback=feedback)
+    assert (summary.rating_count, summary.rating_sum, summary.stars_5) == (3, 13, 2)
+
+
+@pytest.mark.django_db
+def test_drain_logs_conflicting_ids(feedback, caplog):
+    stored = FeedbackSubmission.objects.create(feedback=feedback, rating=1)
+    QueuedSubmission.objects.create(submission_id=stored.id, feedback=feedback, rating=5)
+
+    assert drain_submission_queue(batch_size=10) == 1
+
+    assert FeedbackSubmission.objects.get().rating == 1
+    assert FeedbackRatingSummary.objects.get(feedback=feedback).rating_count == 1
+    assert caplog.records[-1].submission_ids == [str(stored.id)]
+
+
+@pytest.mark.django_db
+def test_process_queue_command_once(feedback):
+    submit(feedback, rating=2)
+    out = StringIO()
+
+    call_command("process_submission_queue", "--once", stdout=out)
+
+    assert FeedbackSubmission.objects.filter(feedback=feedback, rating=2).exists()
+    assert "Moved 1 queued submissions" in out.getvalue()
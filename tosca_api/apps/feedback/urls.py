@@ -1,3 +1,5 @@
+from django.urls import include, path
+from rest_framework import permissions
 from rest_framework.routers import DefaultRouter
 
 from .views import GeoFeedbackViewSet
@@ -5,4 +7,18 @@ from .views import GeoFeedbackViewSet
 router = DefaultRouter()
 router.register(r"feedback", GeoFeedbackViewSet, basename="feedback")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path(
+        "feedback/<uuid:pk>/heatmap/<int:z>/<int:x>/<int:y>.mvt",
+        GeoFeedbackViewSet.as_view(
+            {"get": "heatmap_tile"}, permission_classes=[permissions.IsAdminUser]
+        ),
+        name="feedback-heatmap-tile",
+    ),
+    path(
+        "feedback/<uuid:pk>/submissions.<str:export_format>",
+        GeoFeedbackViewSet.as_view({"get": "export"}, permission_classes=[permissions.IsAdminUser]),
+        name="feedback-export",
+    ),
+    path("", include(router.urls)),
+]
@@ -1,17 +1,29 @@
-from django.core.exceptions import ValidationError as DjangoValidationError
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 
+from tosca_api.apps.core.streaming import iter_feature_collection, streaming_feature_collection
+from tosca_api.apps.events.tiles import tile_in_range
+
+from .export import EXPORT_FORMATS, export_filename, geojson_features, iter_csv, iter_ndjson
+from .heatmap import heatmap_features, render_heatmap_tile, tile_bounds
+from .ingest import ingest_batch, insert_submission, submission_target
 from .models import FeedbackSubmission, GeoFeedback
 from .serializers import (
+    FeedbackSubmissionBulkItemSerializer,
+    FeedbackSubmissionIngestSerializer,
     FeedbackSubmissionSerializer,
     GeoFeedbackWriteSerializer,
     GeoFeedbackDetailSerializer,
     GeoFeedbackListSerializer,
+    HeatmapQuerySerializer,
 )
+from .submission_queue import enqueue_submission
 
 
 class FeedbackCursorPagination(CursorPagination):
@@ -45,6 +57,14 @@ class GeoFeedbackViewSet(viewsets.ModelViewSet):
     
     Submissions:
     - POST /api/v1/feedback/{id}/submit/ : Submit citizen feedback
+    - POST /api/v1/feedback/submissions/bulk/ : Sync a batch of offline submissions
+
+    Heatmaps of submission drawings (staff only):
+    - GET /api/v1/feedback/{id}/heatmap/ : GeoJSON grid cells in a bbox
+    - GET /api/v1/feedback/{id}/heatmap/{z}/{x}/{y}.mvt : Grid cells as vector tiles
+
+    Exports (staff only):
+    - GET /api/v1/feedback/{id}/submissions.{csv,geojson,ndjson} : All submissions
     """
 
     queryset = GeoFeedback.objects.all()
@@ -59,7 +79,9 @@ class GeoFeedbackViewSet(viewsets.ModelViewSet):
         if self.action == "retrieve":
             return GeoFeedbackDetailSerializer
         if self.action == "submit":
-            return FeedbackSubmissionSerializer
+            return FeedbackSubmissionIngestSerializer
+        if self.action == "bulk_submit":
+            return FeedbackSubmissionBulkItemSerializer
         return GeoFeedbackWriteSerializer
 
     def get_queryset(self):
@@ -71,8 +93,12 @@ class GeoFeedbackViewSet(viewsets.ModelViewSet):
         """
         qs = super().get_queryset()
 
+        if self.action == "list":
+            qs = qs.select_related("rating_summary")
         if self.action == "retrieve":
-            qs = qs.select_related("context", "campaign", "created_by", "custom_form")
+            qs = qs.select_related(
+                "context", "campaign", "created_by", "custom_form", "rating_summary"
+            )
             qs = qs.prefetch_related("feedbacklayer_set__layer")
 
         user = self.request.user
@@ -104,51 +130,144 @@ class GeoFeedbackViewSet(viewsets.ModelViewSet):
             "form_data": {...}, (optional/required based on config)
             "geometry": {... GeoJSON ...} (optional/allowed based on config)
         }
+
+        Validated once and inserted with a single INSERT (see ingest.py).
+        With FEEDBACK_SUBMIT_BUFFERED the submission is queued instead and
+        the response is 202 with its future id (see submission_queue.py).
         """
-        feedback = self.get_object()
+        feedback = submission_target(self.get_queryset(), pk)
 
-        # Parse request data
-        serializer = self.get_serializer(data=request.data)
+        serializer = FeedbackSubmissionIngestSerializer(
+            data=request.data, context={"feedback": feedback}
+        )
         serializer.is_valid(raise_exception=True)
 
-        data = serializer.validated_data
-        rating = data.get("rating")
-        form_data = data.get("form_data")
-        geometry = data.get("geometry")
+        user = request.user if request.user.is_authenticated else None
+        if getattr(settings, "FEEDBACK_SUBMIT_BUFFERED", False):
+            submission = enqueue_submission(feedback, user, serializer.validated_data)
+            return Response(
+                FeedbackSubmissionSerializer(submission).data,
+                status=status.HTTP_202_ACCEPTED,
+            )
+        submission = insert_submission(feedback, user, serializer.validated_data)
+        return Response(
+            FeedbackSubmissionSerializer(submission).data,
+            status=status.HTTP_201_CREATED,
+        )
 
-        # Config Validation
-        errors = {}
-        if feedback.rating_enabled and rating is None:
-            errors["rating"] = "Rating is required for this feedback campaign."
-        
-        if feedback.form_enabled and not form_data:
-            errors["form_data"] = "Form data is required for this feedback campaign."
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="submissions/bulk",
+        permission_classes=[permissions.AllowAny],
+    )
+    def bulk_submit(self, request):
+        """
+        Submit a batch of offline submissions, possibly for several feedbacks.
 
-        if geometry and not feedback.allow_drawings:
-            errors["geometry"] = "Drawings are not allowed for this feedback campaign."
+        JSON body: a list of submit bodies, each with "feedback" (id) and a
+        client-generated "idempotency_key" (unique per feedback):
+        [
+            {"feedback": "uuid", "idempotency_key": "...", "rating": 5, ...},
+            ...
+        ]
 
-        if errors:
-            raise ValidationError(errors)
+        Returns one result per item, in order: status "created",
+        "duplicate" (already synced; "id" is the stored submission) or
+        "invalid" with "errors". Retrying a batch is safe.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of submissions."]})
+        max_items = getattr(settings, "FEEDBACK_BULK_MAX_ITEMS", 500)
+        if len(items) > max_items:
+            raise ValidationError(
+                {"non_field_errors": [f"At most {max_items} submissions per request."]}
+            )
 
-        # Create submission
         user = request.user if request.user.is_authenticated else None
-        
-        try:
-            submission = FeedbackSubmission(
-                feedback=feedback,
-                submitted_by=user,
-                rating=rating,
-                form_data=form_data,
-                geometry=geometry,
-                # Simple logic for anonymization parameter if provided, otherwise default False
-                is_anonymized=request.data.get("is_anonymized", False)
-            )
-            submission.full_clean()  # Model-level bounds checking
-            submission.save()
-            return Response(
-                FeedbackSubmissionSerializer(submission).data,
-                status=status.HTTP_201_CREATED,
-            )
-        except DjangoValidationError as e:
-            # Catch model-level ValidationError (e.g., rating out of bounds)
-            raise ValidationError(e.message_dict)
+        results = ingest_batch(
+            self.get_queryset(), items, user, FeedbackSubmissionBulkItemSerializer()
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAdminUser])
+    def heatmap(self, request, pk=None):
+        """
+        Submission density on a hexagon or square grid, as GeoJSON.
+
+        Query params: bbox=min_lon,min_lat,max_lon,max_lat (required),
+        cell_size (Web Mercator units, required), shape=hexagon|square.
+        Each feature is an occupied cell with "count" and "mean_rating"
+        (null if none of its submissions is rated). Aggregated in PostGIS
+        (see heatmap.py).
+        """
+        feedback = self.get_object()
+        query = HeatmapQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        features = heatmap_features(
+            FeedbackSubmission.objects.filter(feedback=feedback),
+            params["bounds"],
+            params["shape"],
+            params["cell_size"],
+        )
+        return streaming_feature_collection(features)
+
+    def heatmap_tile(self, request, pk, z, x, y):
+        """
+        The heatmap cells of tile z/x/y as a Mapbox Vector Tile (layer "heatmap").
+
+        Routed explicitly in urls.py as /feedback/{id}/heatmap/{z}/{x}/{y}.mvt
+        with staff-only permissions. Takes cell_size and shape like heatmap.
+        """
+        if not tile_in_range(z, x, y):
+            raise NotFound("Tile coordinates out of range.")
+
+        feedback = self.get_object()
+        query = HeatmapQuerySerializer(
+            data=request.query_params, context={"bounds": tile_bounds(z, x, y)}
+        )
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        tile = render_heatmap_tile(
+            FeedbackSubmission.objects.filter(feedback=feedback),
+            z,
+            x,
+            y,
+            params["shape"],
+            params["cell_size"],
+        )
+        response = HttpResponse(tile, content_type="application/vnd.mapbox-vector-tile")
+        patch_cache_control(
+            response, private=True, max_age=getattr(settings, "FEEDBACK_HEATMAP_MAX_AGE", 60)
+        )
+        patch_vary_headers(response, ["Authorization"])
+        return response
+
+    def export(self, request, pk, export_format):
+        """
+        Stream all submissions of this feedback as CSV, GeoJSON or NDJSON.
+
+        Routed explicitly in urls.py as /feedback/{id}/submissions.{format}
+        with staff-only permissions. Rows are read through a server-side
+        cursor without building model instances (see export.py).
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise NotFound("Unknown export format.")
+
+        feedback = self.get_object()
+        submissions = FeedbackSubmission.objects.filter(feedback=feedback)
+        if export_format == "csv":
+            content = iter_csv(submissions)
+        elif export_format == "ndjson":
+            content = iter_ndjson(submissions)
+        else:
+            content = iter_feature_collection(geojson_features(submissions))
+
+        content_type = EXPORT_FORMATS[export_format][0]
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="{export_filename(feedback, export_format)}"'
+        )
+        return response
@@ -51,6 +51,7 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "django.contrib.sites",
     "django.contrib.gis",  # GeoDjango for PostGIS support
+    "django.contrib.postgres",  # Range fields and GiST/GIN indexes
     # Local apps that override third-party templates
     "tosca_api.apps.authentication",  # Override allauth templates
     # Third-party
@@ -91,6 +92,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    "tosca_api.apps.authentication.middleware.ServerTimingMiddleware",
 ]
 
 ROOT_URLCONF = "tosca_api.urls"
@@ -228,6 +230,35 @@ KEYCLOAK_CLIENT_ID = env("KEYCLOAK_CLIENT_ID", default="django-dev")
 KEYCLOAK_JWKS_URL = env("KEYCLOAK_JWKS_URL", default=f"{KEYCLOAK_SERVER_URL}realms/{KEYCLOAK_REALM}/protocol/openid-connect/certs")
 KEYCLOAK_ISSUER = env("KEYCLOAK_ISSUER", default=f"{KEYCLOAK_SERVER_URL}realms/{KEYCLOAK_REALM}")
 
+# Signing key cache (see core/jwt_utils.py): seconds before cached keys are
+# revalidated in the background, minimum seconds between forced refreshes on
+# an unknown kid, and HTTP timeout for the JWKS request.
+KEYCLOAK_JWKS_CACHE_TTL = env.int("KEYCLOAK_JWKS_CACHE_TTL", default=300)
+KEYCLOAK_JWKS_MIN_REFRESH_INTERVAL = env.int("KEYCLOAK_JWKS_MIN_REFRESH_INTERVAL", default=10)
+KEYCLOAK_JWKS_TIMEOUT = env.int("KEYCLOAK_JWKS_TIMEOUT", default=5)
+
+# Verified-token cache (see authentication/token_cache.py): max number of
+# decoded tokens kept (0 disables) and an upper bound on how long an entry
+# may live regardless of the token's exp.
+KEYCLOAK_TOKEN_CACHE_SIZE = env.int("KEYCLOAK_TOKEN_CACHE_SIZE", default=1024)
+KEYCLOAK_TOKEN_CACHE_MAX_TTL = env.int("KEYCLOAK_TOKEN_CACHE_MAX_TTL", default=300)
+
+# User-resolution cache (see authentication/user_cache.py): users resolved
+# from token claims, invalidated on User save/delete in this process and
+# expired after the TTL so other worker processes converge.
+KEYCLOAK_USER_CACHE_SIZE = env.int("KEYCLOAK_USER_CACHE_SIZE", default=1024)
+KEYCLOAK_USER_CACHE_TTL = env.int("KEYCLOAK_USER_CACHE_TTL", default=60)
+# Django group names per user for IsEditor/IsViewer (see authentication/permissions.py),
+# holding at most KEYCLOAK_USER_CACHE_SIZE users
+KEYCLOAK_GROUP_CACHE_TTL = env.int("KEYCLOAK_GROUP_CACHE_TTL", default=60)
+
+# Authentication stage timings (see authentication/metrics.py): optional
+# dotted path to a hook called with (request, timings_ms), e.g.
+# "tosca_api.apps.authentication.metrics.log_auth_timings", and whether
+# staff responses carry a Server-Timing header.
+AUTH_TIMING_HOOK = env("AUTH_TIMING_HOOK", default=None)
+AUTH_SERVER_TIMING = env.bool("AUTH_SERVER_TIMING", default=False)
+
 # Allow tokens from multiple clients (geoserver, tosca-web, mobile-app)
 ALLOWED_TOKEN_AUDIENCES = ["django-dev", "geoserver", "account"]
 ALLOWED_TOKEN_CLIENTS = ["django-dev", "geoserver", "tosca-web"]
@@ -248,6 +279,72 @@ SOCIALACCOUNT_PROVIDERS = {
     }
 }
 
+# -------------------------------------------------
+# Events map endpoints
+# -------------------------------------------------
+# Build bbox/within GeoJSON in PostGIS instead of CalendarEventGeoSerializer
+# (see events/geojson.py), and the coordinate decimals kept (6 ~ 0.1 m).
+EVENTS_DB_GEOJSON = env.bool("EVENTS_DB_GEOJSON", default=True)
+EVENTS_GEOJSON_PRECISION = env.int("EVENTS_GEOJSON_PRECISION", default=6)
+
+# Vector tiles (see events/tiles.py): MVT extent and buffer in tile units,
+# highest zoom served and Cache-Control max-age in seconds.
+EVENTS_TILE_EXTENT = env.int("EVENTS_TILE_EXTENT", default=4096)
+EVENTS_TILE_BUFFER = env.int("EVENTS_TILE_BUFFER", default=64)
+EVENTS_TILE_MAX_ZOOM = env.int("EVENTS_TILE_MAX_ZOOM", default=22)
+EVENTS_TILE_MAX_AGE = env.int("EVENTS_TILE_MAX_AGE", default=60)
+
+# Clustered bbox responses (see events/clustering.py): below this zoom
+# ?bbox=...&zoom=N returns grid clusters, at or above it individual events;
+# cell size in screen pixels.
+EVENTS_CLUSTER_MAX_ZOOM = env.int("EVENTS_CLUSTER_MAX_ZOOM", default=14)
+EVENTS_CLUSTER_CELL_PX = env.int("EVENTS_CLUSTER_CELL_PX", default=64)
+
+# /events/within/ polygons (see events/within.py): reject inputs above the
+# vertex limit; match polygons above the subdivide size piecewise.
+EVENTS_WITHIN_MAX_VERTICES = env.int("EVENTS_WITHIN_MAX_VERTICES", default=100_000)
+EVENTS_WITHIN_SUBDIVIDE_VERTICES = env.int("EVENTS_WITHIN_SUBDIVIDE_VERTICES", default=256)
+
+# /events/within/ response cache (see events/cache.py): entries kept (0
+# disables), seconds before expiry and the largest body stored. Entries are
+# invalidated on CalendarEvent save/delete in this process.
+EVENTS_WITHIN_CACHE_SIZE = env.int("EVENTS_WITHIN_CACHE_SIZE", default=256)
+EVENTS_WITHIN_CACHE_TTL = env.int("EVENTS_WITHIN_CACHE_TTL", default=60)
+EVENTS_WITHIN_CACHE_MAX_BYTES = env.int("EVENTS_WITHIN_CACHE_MAX_BYTES", default=5_000_000)
+
+# Upcoming-events list (see events/cache.py): "now" is floored to this many
+# seconds (0 = exact time, no page cache), and pages of the unfiltered or
+# per-campaign list are cached for up to the TTL.
+EVENTS_UPCOMING_BUCKET_SECONDS = env.int("EVENTS_UPCOMING_BUCKET_SECONDS", default=60)
+EVENTS_UPCOMING_CACHE_SIZE = env.int("EVENTS_UPCOMING_CACHE_SIZE", default=256)
+EVENTS_UPCOMING_CACHE_TTL = env.int("EVENTS_UPCOMING_CACHE_TTL", default=60)
+
+# /events/histogram/ (see events/histogram.py): most buckets per request
+EVENTS_HISTOGRAM_MAX_BUCKETS = env.int("EVENTS_HISTOGRAM_MAX_BUCKETS", default=1000)
+
+# Campaign iCalendar feeds (see events/ics.py): Cache-Control max-age in
+# seconds; clients revalidate with ETag/Last-Modified afterwards.
+EVENTS_ICS_MAX_AGE = env.int("EVENTS_ICS_MAX_AGE", default=300)
+
+# -------------------------------------------------
+# Feedback submissions
+# -------------------------------------------------
+# Largest batch accepted by /feedback/submissions/bulk/ (see feedback/ingest.py)
+FEEDBACK_BULK_MAX_ITEMS = env.int("FEEDBACK_BULK_MAX_ITEMS", default=500)
+
+# Submission heatmaps (see feedback/heatmap.py): largest grid (in cells) a
+# bbox or tile may cover at the requested cell size, and tile max-age.
+FEEDBACK_HEATMAP_MAX_CELLS = env.int("FEEDBACK_HEATMAP_MAX_CELLS", default=10000)
+FEEDBACK_HEATMAP_MAX_AGE = env.int("FEEDBACK_HEATMAP_MAX_AGE", default=60)
+
+# Buffered submit (see feedback/submission_queue.py): /feedback/{id}/submit/
+# queues validated submissions and answers 202; `manage.py
+# process_submission_queue` moves them in batches of this size, polling the
+# empty queue every FEEDBACK_QUEUE_POLL_SECONDS.
+FEEDBACK_SUBMIT_BUFFERED = env.bool("FEEDBACK_SUBMIT_BUFFERED", default=False)
+FEEDBACK_QUEUE_BATCH_SIZE = env.int("FEEDBACK_QUEUE_BATCH_SIZE", default=1000)
+FEEDBACK_QUEUE_POLL_SECONDS = env.float("FEEDBACK_QUEUE_POLL_SECONDS", default=1.0)
+
 # -------------------------------------------------
 # Logging Configuration
 # -------------------------------------------------